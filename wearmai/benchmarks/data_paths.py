@@ -0,0 +1,67 @@
+"""
+Data hot paths on fixed-seed synthetic runners: bulk ingest, `ExerciseSummaryService.run`,
+`RunDetailSerializer` and `UserProfileForLLM` serialization, with their query counts.
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.data_paths [--users N] [--repeat N]
+"""
+import argparse
+
+from benchmarks.harness import DEFAULT_SEED, benchmark_database, best_of, seed_users
+
+
+def bench_data_paths(users: int = 2, repeat: int = 5, seed: int = DEFAULT_SEED) -> dict:
+    """Needs a (throwaway) database: see `benchmarks.harness.benchmark_database`."""
+    from common.utils.db_queries import track_queries
+    from core.models import ExerciseUnit, Run
+    from core.serializers import RunDetailSerializer, UserProfileForLLM
+    from services.exercise_summarisation.exercise_summary_service import ExerciseSummaryService
+
+    profiles, ingest = seed_users(users, seed)
+    user = profiles[0]
+    units = list(ExerciseUnit.objects.filter(run__user=user).order_by("id"))
+    runs = Run.objects.filter(user=user).order_by("date")
+
+    def summarise():
+        ExerciseSummaryService(units).run(aggregate=True)
+
+    def serialize_runs():
+        RunDetailSerializer(RunDetailSerializer.setup_eager_loading(runs), many=True).data
+
+    def serialize_profile():
+        UserProfileForLLM(user).data
+
+    results = {"ingest": {"rows": ingest["rows"], "rows_per_s": round(ingest["rows"] / ingest["seconds"])}}
+    for name, fn, count in (
+        ("exercise_summary", summarise, len(units)),
+        ("run_detail_serializer", serialize_runs, runs.count()),
+        ("user_profile_serializer", serialize_profile, 1),
+    ):
+        with track_queries(name) as queries:
+            fn()
+        timing = best_of(fn, repeat)
+        results[name] = {
+            "items": count,
+            "queries": queries.count,
+            "best_s": round(timing["best_s"], 4),
+            "median_s": round(timing["median_s"], 4),
+            "items_per_s": round(count / timing["best_s"], 1),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        results = bench_data_paths(args.users, args.repeat)
+    for name, result in results.items():
+        print(f"{name:>24}: " + ", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Shared helpers for the benchmarks: a throwaway Django database seeded with fixed-seed synthetic
+data, timing, and comparing results against a stored baseline.
+"""
+import math
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+DEFAULT_SEED = 0
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wearmai.settings")
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """A freshly migrated test database (in memory for SQLite) for the duration of the block."""
+    setup_django()
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_users(users: int = 2, seed: int = DEFAULT_SEED, **config) -> tuple[list, dict]:
+    """
+    Writes `users` synthetic runners (a quarter-year of runs each by default) and returns them
+    with the ingest stats.
+    """
+    from core.synthetic import SyntheticDataConfig, SyntheticDataGenerator
+
+    config = {"years": 0.25, "sessions_per_week": 2, "exercises": ("run",), **config}
+    generator = SyntheticDataGenerator(config=SyntheticDataConfig(**config), seed=seed)
+    start = time.perf_counter()
+    profiles = generator.generate(users, name_prefix="Benchmark User")
+    elapsed = time.perf_counter() - start
+    return profiles, {"rows": generator.rows_written, "seconds": elapsed}
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> dict:
+    """Best and median wall time of `repeat` calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"best_s": min(timings), "median_s": statistics.median(timings)}
+
+
+# One-off costs (e.g. downloading and loading a model) that say nothing about the code's speed, and
+# medians, which swing with machine load; timings are gated on the best of the repeats instead
+INFORMATIONAL_METRICS = {"warmup_s", "median_s", "median_ms"}
+# Deterministic counts: any increase is a regression, whatever the tolerance
+COUNT_METRICS = {"queries"}
+
+
+def metric_direction(name: str) -> int:
+    """1 if higher is better (throughputs), -1 if lower is better (times, query counts), 0 if informational."""
+    if name in INFORMATIONAL_METRICS:
+        return 0
+    if name.endswith(("_per_s", "qps")):
+        return 1
+    if name.endswith(("_s", "_ms")) or name in COUNT_METRICS:
+        return -1
+    return 0
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> list[dict]:
+    """
+    Every metric present in both, with its change relative to the baseline. A throughput that
+    dropped, or a time that grew, by more than `tolerance` is flagged as a regression, as is any
+    increase in a count (e.g. queries). Failed benchmarks are left out: see `broken_benchmarks`.
+    """
+    rows = []
+    for benchmark, metrics in results.items():
+        base_metrics = baseline.get(benchmark) or {}
+        if "error" in metrics or "error" in base_metrics:
+            continue
+        for name, value in metrics.items():
+            base = base_metrics.get(name)
+            direction = metric_direction(name)
+            if not direction or not isinstance(value, (int, float)) or not isinstance(base, (int, float)):
+                continue
+            if name in COUNT_METRICS:
+                change = (value - base) / base if base else (math.inf if value > base else 0.0)
+                regression = value > base
+            elif base == 0:
+                continue
+            else:
+                change = (value - base) / base
+                regression = change * direction < -tolerance
+            rows.append({
+                "benchmark": benchmark,
+                "metric": name,
+                "baseline": base,
+                "value": value,
+                "change": change,
+                "regression": regression,
+            })
+    return rows
+
+
+def broken_benchmarks(results: dict, baseline: dict) -> list[str]:
+    """Benchmarks that failed this time but have a baseline (theirs or their sub-benchmarks')."""
+    return [
+        benchmark for benchmark, metrics in results.items()
+        if "error" in metrics and any(
+            (name == benchmark or name.startswith(f"{benchmark}.")) and "error" not in base_metrics
+            for name, base_metrics in baseline.items()
+        )
+    ]
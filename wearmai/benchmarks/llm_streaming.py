@@ -0,0 +1,83 @@
+"""
+Rendering overhead of a streamed answer: per-token `sleep` + full re-render (the previous client
+loop) versus batched rendering through a `StreamlitSink`.
+
+The provider is simulated: `--tokens` deltas arrive `--token-interval` seconds apart. The
+placeholder serialises the text it is given on every `markdown` call, like Streamlit does.
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.llm_streaming [--tokens N] [--token-interval S]
+"""
+import argparse
+import json
+import time
+from typing import Iterator
+
+from infrastructure.llm_clients.sinks import StreamlitSink, consume
+
+
+class FakePlaceholder:
+    def __init__(self) -> None:
+        self.renders = 0
+        self.bytes_sent = 0
+        self.first_render: float | None = None
+
+    def markdown(self, text: str) -> None:
+        if self.first_render is None:
+            self.first_render = time.perf_counter()
+        self.renders += 1
+        self.bytes_sent += len(json.dumps({"body": text}).encode())
+
+
+def fake_stream(tokens: int, token_interval: float) -> Iterator[str]:
+    next_at = time.perf_counter()
+    for i in range(tokens):
+        next_at += token_interval
+        while time.perf_counter() < next_at:
+            pass
+        yield f"word{i % 50} "
+
+
+def legacy_render(deltas: Iterator[str], placeholder: FakePlaceholder) -> str:
+    final_response = ""
+    for delta in deltas:
+        final_response += delta
+        time.sleep(0.002)
+        placeholder.markdown(final_response + "▌")
+    placeholder.markdown(final_response)
+    return final_response
+
+
+def bench_llm_streaming(tokens: int = 3000, token_interval: float = 0.0005) -> dict:
+    results = {}
+    for name, render in (
+        ("legacy", legacy_render),
+        ("sink", lambda deltas, placeholder: consume(deltas, StreamlitSink(placeholder))),
+    ):
+        placeholder = FakePlaceholder()
+        start = time.perf_counter()
+        text = render(fake_stream(tokens, token_interval), placeholder)
+        total = time.perf_counter() - start
+        results[name] = {
+            "ttft_ms": round((placeholder.first_render - start) * 1000, 2),
+            "total_s": round(total, 3),
+            "renders": placeholder.renders,
+            "mb_rendered": round(placeholder.bytes_sent / 1e6, 2),
+            "chars": len(text),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=3000)
+    parser.add_argument("--token-interval", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    for name, result in bench_llm_streaming(args.tokens, args.token_interval).items():
+        print(f"{name:>7}: " + ", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
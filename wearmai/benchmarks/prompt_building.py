@@ -0,0 +1,72 @@
+"""
+Prompt build time: `LLMPrompts.get_prompt` for the router and coach prompts of a fully loaded turn
+(a fixed-seed synthetic runner's profile and raw run data, knowledge-base chunks, grounding results).
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.prompt_building [--repeat N]
+"""
+import argparse
+import json
+import random
+
+from benchmarks.harness import DEFAULT_SEED, benchmark_database, best_of, seed_users
+
+
+def bench_prompt_building(repeat: int = 20, seed: int = DEFAULT_SEED) -> dict:
+    """Needs a (throwaway) database: see `benchmarks.harness.benchmark_database`."""
+    from core.serializers import RunDetailSerializer, UserProfileForLLM
+    from infrastructure.vectorstore.base import VectorEntry
+    from services.prompts.llm_prompts import LLMPrompts, PromptType
+
+    profiles, _ = seed_users(1, seed)
+    user = profiles[0]
+    user_profile = UserProfileForLLM(user).data
+    runs = RunDetailSerializer.setup_eager_loading(user.runs.order_by("-date")[:2])
+    raw_run_data = json.dumps(RunDetailSerializer(runs, many=True).data, indent=4)
+
+    rng = random.Random(seed)
+    words = ["cadence", "stride", "knee", "hip", "load", "tendon", "recovery", "impact", "flexion", "ground", "contact", "fatigue"]
+    text = lambda n: " ".join(rng.choice(words) for _ in range(n))
+    chat_history = [(f"User: {text(20)}", f"Coach: {text(200)}") for _ in range(4)]
+    chunks = [VectorEntry(id=str(i), content=text(300)) for i in range(5)]
+    grounding = {"answer": text(100), "results": [{"type": "text", "name": text(6), "url": f"https://example.org/{i}", "content": text(250)} for i in range(5)]}
+
+    prompts = {
+        "router": (PromptType.FUNCTION_DETERMINANT_PROMPT, {"user_query": text(20), "user_profile": user_profile, "chat_history": chat_history}),
+        "coach": (PromptType.COACH_PROMPT, {
+            "query": text(20),
+            "user_profile": user_profile,
+            "chat_history": chat_history,
+            "run_summary_data": text(300),
+            "raw_run_data": raw_run_data,
+            "book_content": chunks,
+            "fact_checking_data": grounding,
+        }),
+    }
+    results = {}
+    for name, (prompt_type, data) in prompts.items():
+        prompt = LLMPrompts.get_prompt(prompt_type, data)
+        timing = best_of(lambda: LLMPrompts.get_prompt(prompt_type, data), repeat)
+        results[name] = {
+            "prompt_chars": len(prompt),
+            "best_ms": round(timing["best_s"] * 1000, 3),
+            "median_ms": round(timing["median_s"] * 1000, 3),
+            "prompts_per_s": round(1 / timing["best_s"], 1),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        results = bench_prompt_building(args.repeat)
+    for name, result in results.items():
+        print(f"{name:>7}: " + ", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Segmentation throughput (chunks/s and MB/s) of the knowledge-base segmenter on a cleaned book.
+Needs the segmenter's embedding model (downloaded on first use).
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.segmentation [--opt SDPMChunker] [--max-chars N] [--path FILE]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from common.utils.text_cleaning import clean_knowledge_base
+from services.segmentation.base import SegmentationOpts
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "development" / "books" / "Sports Rehab Injury Prevention.md"
+
+
+def bench_segmentation(path: Path = DEFAULT_PATH, opt: SegmentationOpts = SegmentationOpts.SDPM, max_chars: int = 200_000) -> dict:
+    from services.segmentation.segmentation_service import SegmentationService
+
+    text = clean_knowledge_base(path.read_text())[:max_chars]
+    service = SegmentationService()
+
+    # The first call loads the embedding model; time it separately from segmentation
+    start = time.perf_counter()
+    service.segment_text(text[:2000], opt)
+    warmup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = service.segment_text(text, opt)
+    elapsed = time.perf_counter() - start
+    return {
+        "segmenter": str(opt),
+        "input_mb": round(len(text.encode()) / 1e6, 3),
+        "chunks": len(chunks),
+        "warmup_s": round(warmup, 3),
+        "best_s": round(elapsed, 3),
+        "chunks_per_s": round(len(chunks) / elapsed, 1),
+        "mb_per_s": round(len(text.encode()) / 1e6 / elapsed, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--opt", type=SegmentationOpts, default=SegmentationOpts.SDPM, choices=list(SegmentationOpts))
+    parser.add_argument("--max-chars", type=int, default=200_000)
+    args = parser.parse_args()
+
+    result = bench_segmentation(args.path, args.opt, args.max_chars)
+    print(", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
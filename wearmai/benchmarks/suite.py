@@ -0,0 +1,164 @@
+"""
+The benchmark suite: every hot-path benchmark on fixed-seed data, written as JSON and compared
+against a stored baseline.
+
+    ingest rows/s, ExerciseSummaryService.run, RunDetailSerializer, UserProfileForLLM  (data_paths)
+    LLMPrompts.get_prompt build time                                                  (prompt_building)
+    clean_knowledge_base MB/s                                                          (text_cleaning)
+    segmentation chunks/s                                                              (segmentation)
+    local hybrid vector search QPS                                                     (vector_search)
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.suite [--only NAME,...] [--output results.json]
+    python -m benchmarks.suite --save-baseline      # store these results as the baseline
+    python -m benchmarks.suite --tolerance 0.2      # exit 1 if a metric regressed by more than 20%
+
+Query counts are compared exactly: any increase is a regression. A benchmark that fails (e.g. the
+segmenter's embedding model can't be downloaded) is recorded with its error; if it has a
+baseline, the run exits 1 too.
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import traceback
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.harness import DEFAULT_SEED, benchmark_database, broken_benchmarks, compare
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _data_paths(seed: int) -> dict:
+    from benchmarks.data_paths import bench_data_paths
+    return bench_data_paths(seed=seed)
+
+
+def _prompt_building(seed: int) -> dict:
+    from benchmarks.prompt_building import bench_prompt_building
+    return bench_prompt_building(seed=seed)
+
+
+def _text_cleaning(seed: int) -> dict:
+    from benchmarks.text_cleaning import bench_text_cleaning
+    return bench_text_cleaning(repeat=3)
+
+
+def _segmentation(seed: int) -> dict:
+    from benchmarks.segmentation import bench_segmentation
+    return bench_segmentation()
+
+
+def _vector_search(seed: int) -> dict:
+    from benchmarks.vector_search import bench_vector_search
+    return bench_vector_search(seed=seed)
+
+
+# name -> (benchmark, needs a database)
+BENCHMARKS: dict[str, tuple[Callable[[int], dict], bool]] = {
+    "data_paths": (_data_paths, True),
+    "prompt_building": (_prompt_building, True),
+    "text_cleaning": (_text_cleaning, False),
+    "segmentation": (_segmentation, False),
+    "vector_search": (_vector_search, False),
+}
+
+
+def _flatten(name: str, result: dict) -> dict[str, dict]:
+    # Benchmarks returning one result per sub-benchmark become "<benchmark>.<sub-benchmark>"
+    if result and all(isinstance(value, dict) for value in result.values()):
+        return {f"{name}.{sub}": metrics for sub, metrics in result.items()}
+    return {name: result}
+
+
+def run_suite(names: list[str], seed: int = DEFAULT_SEED) -> dict[str, dict]:
+    results = {}
+    for name in names:
+        benchmark, needs_db = BENCHMARKS[name]
+        print(f"running {name}...", file=sys.stderr)
+        try:
+            if needs_db:
+                with benchmark_database():
+                    result = benchmark(seed)
+            else:
+                result = benchmark(seed)
+        except Exception as e:
+            traceback.print_exc(limit=3, file=sys.stderr)
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        results.update(_flatten(name, result))
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help=f"Comma-separated benchmarks to run (of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", type=Path, help="Write the results (JSON) here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": run_suite(names, args.seed),
+    }
+
+    for name, metrics in report["results"].items():
+        print(f"{name:>40}: " + ", ".join(f"{key}={value}" for key, value in metrics.items()))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"meta": {}, "results": {}}
+        # Benchmarks not run this time (or failing) keep their stored baseline
+        baseline["results"].update({name: metrics for name, metrics in report["results"].items() if "error" not in metrics})
+        baseline["meta"] = report["meta"]
+        args.baseline.write_text(json.dumps(baseline, indent=2))
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to store one")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    rows = compare(report["results"], baseline["results"], args.tolerance)
+    print(f"\nCompared with the baseline from {baseline['meta'].get('timestamp')} (revision {baseline['meta'].get('git_revision')}):")
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['benchmark'] + ' ' + row['metric']:>56}: {row['baseline']:>12} -> {row['value']:>12} ({row['change']:+.1%}) {flag}")
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%} (or, for counts, grew)")
+    broken = broken_benchmarks(report["results"], baseline["results"])
+    if broken:
+        print(f"\n{len(broken)} benchmark(s) with a baseline failed: {', '.join(broken)}")
+    if regressions or broken:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Throughput benchmark for the knowledge-base text cleaner.
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.text_cleaning [--repeat N] [--path FILE]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from common.utils.text_cleaning import knowledge_base_cleaner
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "development" / "books" / "Sports Rehab Injury Prevention.md"
+
+
+def bench_text_cleaning(path: Path = DEFAULT_PATH, repeat: int = 5) -> dict:
+    text = path.read_text()
+    size_mb = len(text.encode()) / 1e6
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        knowledge_base_cleaner.clean(text)
+        timings.append(time.perf_counter() - start)
+
+    # Streaming the file line by line must give the same throughput without holding the book in memory
+    start = time.perf_counter()
+    with open(path) as f:
+        for _ in knowledge_base_cleaner.iter_clean(f):
+            pass
+    streaming = time.perf_counter() - start
+
+    best = min(timings)
+    return {
+        "input_mb": round(size_mb, 3),
+        "best_s": round(best, 4),
+        "mb_per_s": round(size_mb / best, 2),
+        "streaming_mb_per_s": round(size_mb / streaming, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = bench_text_cleaning(args.path, args.repeat)
+    print(
+        f"{args.path.name}: {result['input_mb']} MB, best {result['best_s']}s -> "
+        f"{result['mb_per_s']} MB/s (streaming: {result['streaming_mb_per_s']} MB/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Local hybrid (BM25 + vector) search over a fixed-seed synthetic abstracts index: build rate and
+query throughput.
+
+Run from the `wearmai/` directory:
+
+    python -m benchmarks.vector_search [--records N] [--queries N]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.harness import DEFAULT_SEED
+from services.grounding.abstract_index import AbstractIndex
+
+VOCABULARY = (
+    "running gait cadence stride knee hip ankle pelvis flexion adduction rotation tendon achilles patellar "
+    "injury prevention load training recovery fatigue impact ground contact force muscle soleus gastrocnemius "
+    "tibialis runners marathon endurance strength plyometric eccentric biomechanics kinematics kinetics "
+    "randomized trial cohort systematic review meta analysis risk factor incidence rehabilitation footwear"
+).split()
+
+
+def synthetic_abstracts(records: int, seed: int = DEFAULT_SEED) -> list[dict]:
+    rng = random.Random(seed)
+    words = lambda n: " ".join(rng.choice(VOCABULARY) for _ in range(n))
+    return [
+        {"title": words(8).capitalize(), "abstract": words(rng.randint(120, 250)), "url": f"https://pubmed.ncbi.nlm.nih.gov/{i}/", "year": rng.randint(2000, 2025)}
+        for i in range(records)
+    ]
+
+
+def bench_vector_search(records: int = 5000, queries: int = 200, seed: int = DEFAULT_SEED) -> dict:
+    corpus = synthetic_abstracts(records, seed)
+    rng = random.Random(seed + 1)
+    query_texts = [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(3, 8))) for _ in range(queries)]
+
+    start = time.perf_counter()
+    index = AbstractIndex(corpus)
+    build = time.perf_counter() - start
+
+    index.search(query_texts[0])
+    start = time.perf_counter()
+    for query in query_texts:
+        index.search(query, n_results=5)
+    elapsed = time.perf_counter() - start
+    return {
+        "records": records,
+        "build_s": round(build, 3),
+        "records_per_s": round(records / build),
+        "query_ms": round(elapsed / queries * 1000, 3),
+        "qps": round(queries / elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    result = bench_vector_search(args.records, args.queries)
+    print(", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
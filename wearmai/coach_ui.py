@@ -10,7 +10,7 @@ django.setup()
 import streamlit as st
 from services.llm_coach.coach_service import CoachService
 from user_profile.loader import load_profile
-from infrastructure.llm_clients.base import LLModels
+from infrastructure.llm_clients.sinks import StreamlitSink
 
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -57,13 +57,11 @@ if question:
                 status_update_callback("Generating response...")
 
                 # 2. Stream the final answer using the retrieved context
-                # Pass the final_answer_container to the streaming function
+                # Deltas are rendered into the final_answer_container in batches
                 final_answer_text = st.session_state.coach_svc.stream_answer(
                     query=question,
-                    model=LLModels.GEMINI_25_FLASH,
-                    stream_box=final_answer_container,
+                    sink=StreamlitSink(final_answer_container),
                     temperature=0.7,
-                    thinking_budget=0
                 )
 
                 # 3. Update status upon completion
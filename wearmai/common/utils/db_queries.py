@@ -0,0 +1,76 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+from django.db import connections
+from infrastructure.tracing import current_span
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+@dataclass
+class QueryStats:
+    operation: str
+    queries: list[tuple[str, float]] = field(default_factory=list)  # (sql, seconds)
+
+    def __call__(self, execute, sql, params, many, context):
+        # `connection.execute_wrapper` hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(seconds for _, seconds in self.queries)
+
+    def duplicates(self, limit: int = 5) -> dict[str, int]:
+        """SQL statements (parameters aside) run more than once, most repeated first: the N+1 suspects."""
+        counts = Counter(sql for sql, _ in self.queries)
+        return {sql: n for sql, n in counts.most_common(limit) if n > 1}
+
+
+@contextmanager
+def track_queries(operation: str, using: str = "default") -> Iterator[QueryStats]:
+    """
+    Records the queries run on this thread's `using` connection inside the block and logs their
+    count, total DB time and repeated statements (also added to the current trace span, if any).
+    Works as a decorator too.
+    """
+    stats = QueryStats(operation)
+    try:
+        with connections[using].execute_wrapper(stats):
+            yield stats
+    finally:
+        duplicates = stats.duplicates()
+        log.info(
+            "db_queries",
+            operation=operation,
+            count=stats.count,
+            db_time_ms=round(stats.total_time * 1000, 2),
+            duplicated={sql[:200]: n for sql, n in duplicates.items()},
+        )
+        span = current_span()
+        if span:
+            span.add("db.queries", stats.count)
+            span.add("db.time_ms", round(stats.total_time * 1000, 2))
+
+
+@contextmanager
+def max_queries(limit: int, operation: str = "block", using: str = "default") -> Iterator[QueryStats]:
+    """
+    Test helper: fails if the block runs more than `limit` queries, listing the repeated ones.
+    Unlike `assertNumQueries` it sets a budget rather than an exact count.
+    """
+    with track_queries(operation, using) as stats:
+        yield stats
+    if stats.count > limit:
+        repeated = "\n".join(f"  {n}x {sql[:300]}" for sql, n in stats.duplicates(limit=10).items())
+        raise AssertionError(f"{operation} ran {stats.count} queries, over its budget of {limit}. Repeated:\n{repeated}")
@@ -0,0 +1,33 @@
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    A point in time work must finish by, passed down through the stages of a request so each
+    one can bound its own waits by what's left of the overall budget.
+    """
+
+    def __init__(self, budget: float) -> None:
+        self.budget = budget
+        self.start = time.monotonic()
+        self.expires_at = self.start + budget
+
+    def remaining(self, reserve: float = 0.0) -> float:
+        """Seconds left, keeping `reserve` seconds back for later stages."""
+        return max(0.0, self.expires_at - reserve - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def allows(self, seconds: float, reserve: float = 0.0) -> bool:
+        return self.remaining(reserve) >= seconds
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def cap(self, seconds: Optional[float], reserve: float = 0.0) -> float:
+        """`seconds`, or less if the deadline comes first."""
+        remaining = self.remaining(reserve)
+        return remaining if seconds is None else min(seconds, remaining)
@@ -0,0 +1,62 @@
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def prefetch(iterable: Iterable[T], maxsize: int = 256) -> Iterator[T]:
+    """
+    Drain `iterable` in a background thread into a bounded queue, so the producer keeps working
+    while the consumer is busy, but never runs more than `maxsize` items ahead of it.
+
+    Exceptions raised by the producer are re-raised in the consumer. If the consumer stops early,
+    the producer is stopped (and closed, for generators) at its next item.
+    """
+    items: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_ProducerError(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+
+    producer = threading.Thread(target=produce, name="prefetch-producer", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
@@ -1,44 +1,175 @@
 import re
+from collections import defaultdict
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+# A line rule maps one line (without its newline) to its cleaned form. Returning an empty
+# string blanks the line; runs of blank lines are collapsed into a single paragraph break.
+LineRule = Callable[[str], str]
+
+CSS_BLOCK_PATTERN = re.compile(r'\{[^}]*\}')
+
+CSS_SELECTORS = [
+    'body', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'p', 'div', 'span', 'figure', 'figcaption',
+    'section', 'article', 'header', 'footer',
+    'nav', 'aside', 'table', 'th', 'tr', 'td',
+    'ul', 'ol', 'li', 'a', 'img', 'button',
+    'input', 'textarea', 'form', 'label'
+]
+
+
+def _selector_pattern(selectors: Sequence[str]) -> re.Pattern:
+    # Group the alternation by first letter (longest first) so each position is rejected quickly
+    groups = defaultdict(list)
+    for selector in sorted(selectors, key=len, reverse=True):
+        groups[selector[0]].append(re.escape(selector[1:]))
+    alternation = '|'.join(f"{first}(?:{'|'.join(rest)})" for first, rest in sorted(groups.items()))
+    return re.compile(r'\b(?:' + alternation + r')\b')
+
+
+def substitute(pattern: str | re.Pattern, replacement: str = '') -> LineRule:
+    """Rule replacing every match of a (precompiled) pattern within a line."""
+    compiled = re.compile(pattern)
+    return lambda line: compiled.sub(replacement, line)
+
+
+def delete_chars(chars: str) -> LineRule:
+    """Rule deleting every occurrence of the given characters."""
+    def rule(line: str) -> str:
+        for char in chars:
+            line = line.replace(char, '')
+        return line
+    return rule
+
+
+def drop_lines(pattern: str) -> LineRule:
+    """Rule blanking lines that start with a match of the pattern."""
+    compiled = re.compile(pattern)
+    return lambda line: '' if compiled.match(line) else line
+
+
+_MULTIPLE_SPACES = re.compile('  +')
+
+def normalize_spaces(line: str) -> str:
+    # Same result as substituting r'[ \t]+' with ' ', but only touches actual runs
+    if '\t' in line:
+        line = line.replace('\t', ' ')
+    return _MULTIPLE_SPACES.sub(' ', line)
+
+
+remove_css_selectors = substitute(_selector_pattern(CSS_SELECTORS))
+remove_sentence_punctuation = delete_chars('.,')
+remove_figure_lines = drop_lines(r'Figure\s+\d+:\s+\w+')
 
-def remove_css_styles(input_string: str) -> str:
-    # Step 1: Remove CSS blocks (content inside { })
-    cleaned_string = re.sub(r'\{[^}]*\}', '', input_string)
 
-    # Step 2: Define a list of common CSS selectors to remove
-    selectors = [
-        'body', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-        'p', 'div', 'span', 'figure', 'figcaption',
-        'section', 'article', 'header', 'footer',
-        'nav', 'aside', 'table', 'th', 'tr', 'td',
-        'ul', 'ol', 'li', 'a', 'img', 'button',
-        'input', 'textarea', 'form', 'label'
-    ]
+class TextCleaner:
+    """
+    Cleans text in a single streaming pass. CSS blocks (which may span lines) are stripped from
+    the incoming text, then every line flows through each stage in turn: a stage applies its line
+    rules in order, collapses runs of blank lines and strips the text it produces. Input can be a
+    whole string or any iterable of pieces (e.g. a file object); cleaned lines are yielded as soon
+    as they are complete, so adding a rule never costs another pass over the text.
+    """
 
-    # Step 3: Build a regular expression to match and remove these selectors
-    selector_pattern = r'\b(?:' + '|'.join(selectors) + r')\b'
-    cleaned_string = re.sub(selector_pattern, '', cleaned_string)
+    def __init__(self, stages: Iterable[Iterable[LineRule]] = ((),), strip_css_blocks: bool = True) -> None:
+        self.stages: List[List[LineRule]] = [list(rules) for rules in stages]
+        self.strip_css_blocks = strip_css_blocks
 
-    # Step 4: Clean up extra spaces but preserve line breaks
-    cleaned_string = re.sub(r'[ \t]+', ' ', cleaned_string)  # Normalize spaces
-    cleaned_string = re.sub(r'\n\s*\n', '\n\n', cleaned_string)  # Preserve paragraph breaks
+    def add_rule(self, rule: LineRule) -> "TextCleaner":
+        """Append a rule to the last stage."""
+        self.stages[-1].append(rule)
+        return self
 
-    return cleaned_string.strip()
+    def add_stage(self, rules: Iterable[LineRule]) -> "TextCleaner":
+        """Append a stage, whose rules see the stripped and collapsed output of the previous one."""
+        self.stages.append(list(rules))
+        return self
+
+    def clean(self, text: str) -> str:
+        return '\n'.join(self.iter_clean([text]))
+
+    def iter_clean(self, pieces: Iterable[str]) -> Iterator[str]:
+        if self.strip_css_blocks:
+            pieces = self._strip_css_blocks(pieces)
+
+        lines = self._iter_lines(pieces)
+        for rules in self.stages:
+            lines = self._apply_stage(lines, rules)
+        return lines
+
+    @staticmethod
+    def _apply_stage(lines: Iterable[str], rules: List[LineRule]) -> Iterator[str]:
+        previous = None
+        blank_run = False
+        for line in lines:
+            for rule in rules:
+                line = rule(line)
+
+            if not line or line.isspace():
+                blank_run = True
+                continue
+
+            if previous is None:
+                previous = line.lstrip()
+            else:
+                yield previous
+                if blank_run:
+                    yield ''
+                previous = line
+            blank_run = False
+
+        if previous is not None:
+            yield previous.rstrip()
+
+    @staticmethod
+    def _strip_css_blocks(pieces: Iterable[str]) -> Iterator[str]:
+        # A '{' left after substitution has no closing '}' in the text seen so far, so everything
+        # from it onwards is held back until a '}' arrives (or emitted as-is at the end).
+        pending: List[str] = []
+        for piece in pieces:
+            if pending:
+                close = piece.find('}')
+                if close == -1:
+                    pending.append(piece)
+                    continue
+                pending = []
+                piece = piece[close + 1:]
+
+            cleaned = CSS_BLOCK_PATTERN.sub('', piece)
+            open_idx = cleaned.find('{')
+            if open_idx == -1:
+                yield cleaned
+            else:
+                yield cleaned[:open_idx]
+                pending = [cleaned[open_idx:]]
+
+        if pending:
+            yield ''.join(pending)
+
+    @staticmethod
+    def _iter_lines(pieces: Iterable[str]) -> Iterator[str]:
+        partial = ''
+        for piece in pieces:
+            lines = (partial + piece).split('\n')
+            partial = lines.pop()
+            yield from lines
+        yield partial
+
+
+css_cleaner = TextCleaner([[remove_css_selectors, normalize_spaces]])
+figure_reference_cleaner = TextCleaner([[remove_figure_lines]], strip_css_blocks=False)
+knowledge_base_cleaner = TextCleaner([
+    [remove_css_selectors, normalize_spaces],
+    [remove_sentence_punctuation, remove_figure_lines],
+])
+
+
+def remove_css_styles(input_string: str) -> str:
+    return css_cleaner.clean(input_string)
 
 def remove_figure_references(input_string: str) -> str:
-    # Regex to match lines that start with 'Figure', followed by a number, a colon, and any word after it
-    figure_pattern = r'^Figure\s+\d+:\s+\w+.*$'
-    
-    # Remove matching lines
-    cleaned_string = re.sub(figure_pattern, '', input_string, flags=re.MULTILINE)
-    
-    # Clean up any extra newlines left behind
-    cleaned_string = re.sub(r'\n\s*\n', '\n\n', cleaned_string).strip()
-    
-    return cleaned_string
+    return figure_reference_cleaner.clean(input_string)
 
 
 def clean_knowledge_base(input_book: str) -> str:
-    clean_book = remove_css_styles(input_book).replace(".", "").replace(",", "")
-    clean_book = remove_figure_references(clean_book)
-
-    return clean_book
\ No newline at end of file
+    return knowledge_base_cleaner.clean(input_book)
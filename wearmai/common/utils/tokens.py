@@ -0,0 +1,11 @@
+import math
+
+# Average characters per token for English prose across the OpenAI/Gemini/Claude tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap, provider-independent token estimate, for budgeting and reporting (not for billing).
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
@@ -0,0 +1,46 @@
+from services.grounding.abstract_index import AbstractIndex
+from services.grounding.abstracts_retriever import LocalAbstractsGroundingRetriever
+from services.prompts.llm_prompts import FACT_CHECKING_DOMAINS
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import structlog
+
+log = structlog.get_logger(__name__)
+
+class Command(BaseCommand):
+    help = "Build the compressed local index of paper abstracts used for offline grounding"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode"
+        )
+        parser.add_argument(
+            "source",
+            help="JSONL file (optionally .gz) of records with title, abstract, url and optional doi/authors/journal/year"
+        )
+        parser.add_argument(
+            "--output",
+            default=settings.GROUNDING_ABSTRACTS_INDEX,
+            help="Where to write the compressed .npz index"
+        )
+        parser.add_argument(
+            "--all-domains",
+            action="store_true",
+            help="Keep records from sources outside the fact-checking domain list"
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.debug = options.get('debug', False)
+        if(self.debug):
+            log.info("abstract_index_debug_mode")
+
+        allowed_domains = None if options["all_domains"] else FACT_CHECKING_DOMAINS
+        index = AbstractIndex.from_jsonl(options["source"], allowed_domains=allowed_domains)
+        index.save(options["output"])
+        log.info("abstract_index_saved", path=options["output"], records=len(index))
+
+        # test the search
+        retriever = LocalAbstractsGroundingRetriever(index, n_results=3, allowed_domains=allowed_domains)
+        log.info(retriever.retrieve_grounding_data("Does eccentric loading help Achilles tendinopathy in runners?"))
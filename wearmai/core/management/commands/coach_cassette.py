@@ -0,0 +1,93 @@
+import time
+from infrastructure.cassette import open_cassette
+from services.llm_coach.cassettes import build_cassette_coach
+from user_profile.loader import load_profile
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import structlog
+
+log = structlog.get_logger(__name__)
+
+DEFAULT_QUERIES = [
+    "How did my last runs look?",
+    "I am planning to join the Amsterdam marathon in 4 months. Could you generate my personal training plan?",
+]
+
+
+class Command(BaseCommand):
+    help = "Record coach turns against the live backends to a cassette, or replay them offline to benchmark our own overhead"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode"
+        )
+        parser.add_argument(
+            "mode",
+            choices=["record", "replay"],
+        )
+        parser.add_argument(
+            "--cassette",
+            default=str(settings.BASE_DIR / "development" / "cassettes" / "coach.jsonl"),
+            help="Cassette file (JSON lines)"
+        )
+        parser.add_argument(
+            "--latency",
+            default="recorded",
+            help="Replay latency: recorded, zero, or a scale factor for the recorded latencies"
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="A user turn (repeat for a conversation); defaults to a run-analysis and a training-plan turn"
+        )
+        parser.add_argument(
+            "--profile",
+            default="Test User 2 - Full Data Load",
+            help="Name of the user profile to coach"
+        )
+        parser.add_argument(
+            "--vs-name",
+            default="BookChunks_voyage",
+            help="Knowledge-base collection"
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.debug = options.get('debug', False)
+        if(self.debug):
+            log.info("coach_cassette_debug_mode")
+
+        cassette = open_cassette(options["cassette"], options["mode"], options["latency"])
+        user_profile = load_profile(name=options["profile"])
+        coach = build_cassette_coach(cassette, options["vs_name"], user_profile["llm_user_profile"])
+
+        try:
+            for index, query in enumerate(options["queries"] or DEFAULT_QUERIES):
+                provider_time = cassette.stats["provider_time"]
+                start = time.perf_counter()
+                first_token = None
+                chars = 0
+                for delta in coach.iter_answer(query, temperature=0.7):
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    chars += len(delta)
+                elapsed = time.perf_counter() - start
+
+                result = {"turn": index, "elapsed_s": round(elapsed, 3), "first_token_s": round(first_token or elapsed, 3), "answer_chars": chars}
+                if not cassette.recording:
+                    # Summed over calls, so concurrent context stages count more than once
+                    result["provider_s"] = round(cassette.stats["provider_time"] - provider_time, 3)
+                    if cassette.latency_scale == 0:
+                        # No provider time is replayed: all of the turn is our own overhead
+                        result["overhead_s"] = round(elapsed, 3)
+                log.info("coach_cassette_turn", mode=options["mode"], **result)
+                self.stdout.write(" ".join(f"{key}={value}" for key, value in result.items()))
+        finally:
+            coach.close()
+
+        if cassette.recording:
+            self.stdout.write(f"Recorded {cassette.stats['recorded']} interactions to {options['cassette']}")
+        else:
+            self.stdout.write(f"Replayed {cassette.stats['replayed']} interactions ({cassette.remaining()} left unused)")
@@ -0,0 +1,159 @@
+import json
+from core.models import UserProfile
+from core.synthetic import create_synthetic_user
+from services.llm_coach.loadtest import CoachLoadTest, FakeBackendConfig, LatencyDistribution, LevelResult
+from django.core.management.base import BaseCommand, CommandError
+import structlog
+
+log = structlog.get_logger(__name__)
+
+LATENCY_OPTIONS = {
+    "router_latency": "Router (function determinant) call",
+    "summary_latency": "Run and history summary calls",
+    "first_token_latency": "Time to the answer's first token",
+    "token_interval": "Time between answer tokens",
+    "vector_latency": "Knowledge-base vector search",
+    "grounding_latency": "Grounding (literature) search",
+}
+
+
+class Command(BaseCommand):
+    help = "Load-test the coach pipeline: simulated users hold scripted conversations against fake LLM, vector and grounding backends at ramping concurrency"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode"
+        )
+        parser.add_argument(
+            "--levels",
+            default="1,4,16",
+            help="Comma-separated concurrency levels to ramp through"
+        )
+        parser.add_argument(
+            "--conversations",
+            type=int,
+            default=1,
+            help="Scripted conversations each simulated user holds per level"
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=8,
+            help="Synthetic profiles to spread the sessions over (created if missing)"
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=10,
+            help="Runs per synthetic profile, when creating them"
+        )
+        parser.add_argument(
+            "--profile",
+            action="append",
+            dest="profiles",
+            help="Use this existing profile instead of synthetic ones (repeatable)"
+        )
+        defaults = FakeBackendConfig()
+        for option, description in LATENCY_OPTIONS.items():
+            distribution = getattr(defaults, option)
+            parser.add_argument(
+                f"--{option.replace('_', '-')}",
+                type=LatencyDistribution.parse,
+                default=distribution,
+                help=f"{description}, seconds (default {distribution.kind}:{','.join(str(p) for p in distribution.params)})"
+            )
+        parser.add_argument(
+            "--answer-tokens",
+            type=int,
+            default=defaults.answer_tokens,
+            help="Tokens per streamed answer"
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=defaults.error_rate,
+            help="Chance that any backend call fails"
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="async_path",
+            help="Drive the async coach path (all sessions on one event loop) instead of one thread per session"
+        )
+        parser.add_argument(
+            "--no-memory",
+            action="store_true",
+            help="Don't trace memory (tracemalloc slows the run down)"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+        )
+        parser.add_argument(
+            "--json",
+            help="Also write the per-level results to this file"
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.debug = options.get('debug', False)
+        if(self.debug):
+            log.info("coach_loadtest_debug_mode")
+
+        try:
+            levels = [int(level) for level in options["levels"].split(",")]
+        except ValueError:
+            raise CommandError(f"Invalid --levels {options['levels']!r}; expected e.g. 1,4,16")
+
+        profile_names = options["profiles"] or self._synthetic_profiles(options["users"], options["runs"], options["seed"])
+        config = FakeBackendConfig(
+            answer_tokens=options["answer_tokens"],
+            error_rate=options["error_rate"],
+            **{option: options[option] for option in LATENCY_OPTIONS},
+        )
+        loadtest = CoachLoadTest(
+            profile_names,
+            config,
+            conversations=options["conversations"],
+            measure_memory=not options["no_memory"],
+            seed=options["seed"],
+            async_path=options["async_path"],
+        )
+
+        self.stdout.write(f"{'sessions':>8}{'turns':>7}{'errors':>8}{'turns/s':>9}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'ttft p50':>10}{'ttft p95':>10}{'KB/sess':>9}")
+        results = loadtest.ramp(levels, on_level=self._write_level)
+
+        self.stdout.write("\nPer-stage latency (p50 / p95 s) by concurrency")
+        stages = sorted({name for result in results for name in result.stages})
+        self.stdout.write(f"{'span':<32}" + "".join(f"{result.concurrency:>16}" for result in results))
+        for name in stages:
+            cells = [result.stages.get(name) for result in results]
+            self.stdout.write(f"{name:<32}" + "".join(
+                f"{cell['p50']:>8.3f}{cell['p95']:>8.3f}" if cell else f"{'-':>16}" for cell in cells
+            ))
+
+        if options["json"]:
+            with open(options["json"], "w", encoding="utf-8") as f:
+                json.dump({"config": repr(config), "levels": [result.summary() for result in results]}, f, indent=2)
+            self.stdout.write(f"\nResults written to {options['json']}")
+
+    def _synthetic_profiles(self, users: int, runs: int, seed: int) -> list[str]:
+        names = [f"Load Test User {i}" for i in range(users)]
+        existing = set(UserProfile.objects.filter(name__in=names).values_list("name", flat=True))
+        for i, name in enumerate(names):
+            if name not in existing:
+                create_synthetic_user(name=name, runs=runs, seed=seed + i)
+                log.info("loadtest_profile_created", name=name, runs=runs)
+        return names
+
+    def _write_level(self, result: LevelResult) -> None:
+        summary = result.summary()
+        turn, ttft = summary["turn_latency"] or {}, summary["first_token_latency"] or {}
+        memory = summary["peak_memory_per_session_kb"]
+        self.stdout.write(
+            f"{result.sessions:>8}{result.turns:>7}{summary['error_rate']:>8.1%}{summary['throughput_turns_per_s']:>9.2f}"
+            f"{turn.get('p50', 0):>8.2f}{turn.get('p95', 0):>8.2f}{turn.get('p99', 0):>8.2f}"
+            f"{ttft.get('p50', 0):>10.2f}{ttft.get('p95', 0):>10.2f}{memory if memory is not None else '-':>9}"
+        )
@@ -0,0 +1,122 @@
+import datetime
+from core.models import UserProfile
+from core.synthetic import DEFAULT_REFERENCE_DIR, EXERCISE_MODELS, SyntheticDataConfig, SyntheticDataGenerator
+from django.core.management.base import BaseCommand, CommandError
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users with years of sessions derived from User1's recorded gait curves, for scale testing"
+
+    def add_arguments(self, parser) -> None:
+        defaults = SyntheticDataConfig()
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode"
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=10,
+            help="Number of users to create"
+        )
+        parser.add_argument(
+            "--years",
+            type=float,
+            default=defaults.years,
+            help="Years of sessions per user"
+        )
+        parser.add_argument(
+            "--sessions-per-week",
+            type=float,
+            default=defaults.sessions_per_week,
+        )
+        parser.add_argument(
+            "--exercises",
+            default=",".join(defaults.exercises),
+            help=f"Exercises in every session (any of {', '.join(EXERCISE_MODELS)})"
+        )
+        parser.add_argument(
+            "--phases",
+            type=int,
+            help="Gait phases per trial, resampled from the recorded 100 (fewer rows per session)"
+        )
+        parser.add_argument(
+            "--noise",
+            type=float,
+            default=defaults.noise,
+            help="Per-session noise, as a fraction of each curve's recorded std"
+        )
+        parser.add_argument(
+            "--drift",
+            type=float,
+            default=defaults.drift,
+            help="Peak drift over the groundTruth.txt cycle (0.05 = 5%%)"
+        )
+        parser.add_argument(
+            "--trend",
+            type=float,
+            default=defaults.trend,
+            help="Progressive change per year (0.02 = 2%%)"
+        )
+        parser.add_argument(
+            "--end-date",
+            type=datetime.date.fromisoformat,
+            default=defaults.end_date,
+            help="Date of the last sessions (YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--reference",
+            default=DEFAULT_REFERENCE_DIR,
+            help="Reference user folder (with day_1/ trials and groundTruth.txt)"
+        )
+        parser.add_argument(
+            "--name-prefix",
+            default="Synthetic User",
+            help="Users are named '<prefix> <n>'"
+        )
+        parser.add_argument(
+            "--batch-trials",
+            type=int,
+            default=50,
+            help="Trials written per bulk insert transaction"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.debug = options.get('debug', False)
+        if(self.debug):
+            log.info("generate_synthetic_data_debug_mode")
+
+        exercises = tuple(exercise.strip() for exercise in options["exercises"].split(",") if exercise.strip())
+        unknown = set(exercises) - set(EXERCISE_MODELS)
+        if unknown:
+            raise CommandError(f"Unknown exercises: {', '.join(sorted(unknown))}")
+        if UserProfile.objects.filter(name__startswith=f"{options['name_prefix']} ").exists():
+            raise CommandError(f"Users named '{options['name_prefix']} <n>' already exist; pass another --name-prefix")
+
+        config = SyntheticDataConfig(
+            years=options["years"],
+            sessions_per_week=options["sessions_per_week"],
+            exercises=exercises,
+            noise=options["noise"],
+            drift=options["drift"],
+            trend=options["trend"],
+            end_date=options["end_date"],
+            phases=options["phases"],
+        )
+        generator = SyntheticDataGenerator(options["reference"], config, seed=options["seed"], batch_trials=options["batch_trials"])
+        self.stdout.write(f"Generating {options['users']} users with {generator.sessions_per_user()} sessions each ({', '.join(generator.trials)})")
+
+        def progress(users_done: int, elapsed: float) -> None:
+            log.info("synthetic_user_generated", users=users_done, rows=generator.rows_written, rows_per_s=round(generator.rows_written / elapsed))
+            self.stdout.write(f"{users_done}/{options['users']} users, {generator.rows_written} rows, {generator.rows_written / elapsed:,.0f} rows/s")
+
+        generator.generate(options["users"], name_prefix=options["name_prefix"], progress=progress)
@@ -1,7 +1,11 @@
-from services.segmentation.segmentation_service import SegmentationService, SegmentationOpts
+from services.segmentation.base import SegmentationOpts
 from infrastructure.vectorstore.weaviate_vectorstore import WeaviateVecStore
-from common.utils.text_cleaning import clean_knowledge_base
+from infrastructure.vectorstore.batch_writer import BatchWriterConfig
+from services.knowledge_base.indexing_service import KnowledgeBaseIndexingService
+from services.knowledge_base.corpus import CorpusSegmenter, resolve_corpus
+from common.utils.streaming import prefetch
 from django.core.management.base import BaseCommand
+from django.conf import settings
 import structlog
 
 log = structlog.get_logger(__name__)
@@ -16,35 +20,77 @@ class Command(BaseCommand):
             action="store_true", 
             help="Enable debug mode"
         )
+        parser.add_argument(
+            "--corpus",
+            default=settings.KNOWLEDGE_BASE_CORPUS,
+            help="Directory of markdown books, or a glob pattern matching them"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of segmentation worker processes (defaults to the number of cores)"
+        )
+        parser.add_argument(
+            "--prefetch",
+            type=int,
+            default=512,
+            help="Maximum number of segmented chunks buffered ahead of the inserter"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BatchWriterConfig.batch_size,
+            help="Number of chunks sent per insert request"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=BatchWriterConfig.concurrency,
+            help="Number of insert requests in flight"
+        )
+        parser.add_argument(
+            "--max-retries",
+            type=int,
+            default=BatchWriterConfig.max_retries,
+            help="Retries for failed objects before giving up on them"
+        )
+        parser.add_argument(
+            "--no-prune",
+            action="store_true",
+            help="Keep chunks in the collection that the corpus no longer produces"
+        )
 
     def handle(self, *args, **options) -> None:
         self.debug = options.get('debug', False)
         if(self.debug):
             log.info("kb_indexing_debug_mode")
 
-        segmentation_svc = SegmentationService()
-        weaviate_vecstore = WeaviateVecStore("BookChunks_voyage")
-
-        # # Load book md files
-        with open('wearmai/development/books/Sports Rehab Injury Prevention_clean.md') as f:
-            raw = f.read()
-
-        # # clean book
-        clean_book = clean_knowledge_base(raw)
-
-        # # save new cleaned book
-        with open('wearmai/development/books/Sports Rehab Injury Prevention_clean.md', 'w') as f:
-            f.write(clean_book)
+        documents = resolve_corpus(options["corpus"])
+        log.info("kb_corpus_resolved", documents=[path.name for path in documents])
 
+        weaviate_vecstore = WeaviateVecStore("BookChunks_voyage")
+        indexing_svc = KnowledgeBaseIndexingService(weaviate_vecstore)
 
-        # # Chunk book content semantically and add to the vectorstore
-        chunks = segmentation_svc.segment_text(
-            text=clean_book,
-            opt=SegmentationOpts.SDPM
-        )
+        # # Stream each document window by window: clean it and chunk it semantically in worker processes
+        # # (source files are never modified). Segmentation runs ahead of insertion through a bounded queue.
+        corpus_segmenter = CorpusSegmenter(opt=SegmentationOpts.SDPM, workers=options["workers"])
+        chunks = prefetch(corpus_segmenter.iter_chunks(documents), maxsize=options["prefetch"])
         
-        # # add the book chunks to the vectorstore
-        weaviate_vecstore.add_items(chunks)
+        # # insert only chunks the collection does not have yet, and drop the ones that disappeared
+        batch_config = BatchWriterConfig(
+            batch_size=options["batch_size"],
+            concurrency=options["concurrency"],
+            max_retries=options["max_retries"],
+        )
+        result = indexing_svc.sync(
+            chunks,
+            prune=not options["no_prune"],
+            config=batch_config,
+        )
+        if result.write_result and result.write_result.has_failures:
+            log.error("kb_indexing_incomplete", failed=len(result.write_result.failed))
 
         # test the hybrid similarity search
         log.info(weaviate_vecstore.hybrid_similarity_search("How do I test if my ankle is broken?"))
+        weaviate_vecstore.close()
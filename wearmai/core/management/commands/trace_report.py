@@ -0,0 +1,52 @@
+import os
+from collections import defaultdict
+from infrastructure.tracing import load_spans, summarize_durations
+from django.core.management.base import BaseCommand, CommandError
+import structlog
+
+log = structlog.get_logger(__name__)
+
+TOKEN_ATTRIBUTES = ("gen_ai.usage.input_tokens", "gen_ai.usage.output_tokens", "gen_ai.usage.cached_input_tokens")
+
+
+class Command(BaseCommand):
+    help = "Summarise exported coach spans: p50/p95/p99 latency and token usage per stage"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode"
+        )
+        parser.add_argument(
+            "--path",
+            default=os.getenv("TRACE_EXPORT_PATH"),
+            help="OTLP/JSON lines span file (defaults to TRACE_EXPORT_PATH)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.debug = options.get('debug', False)
+        if(self.debug):
+            log.info("trace_report_debug_mode")
+
+        path = options["path"]
+        if not path or not os.path.exists(path):
+            raise CommandError(f"No span file at {path!r}; set TRACE_EXPORT_PATH or pass --path")
+
+        spans = load_spans(path)
+        durations: dict[str, list[float]] = defaultdict(list)
+        tokens: dict[str, dict[str, int]] = defaultdict(lambda: dict.fromkeys(TOKEN_ATTRIBUTES, 0))
+        for span in spans:
+            durations[span["name"]].append(span["duration"])
+            for key in TOKEN_ATTRIBUTES:
+                tokens[span["name"]][key] += span["attributes"].get(key, 0)
+
+        self.stdout.write(f"{len(spans)} spans in {len({span['trace_id'] for span in spans})} traces\n")
+        self.stdout.write(f"{'span':<32}{'count':>7}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'in tok':>10}{'out tok':>10}{'cached':>9}")
+        for name in sorted(durations):
+            summary = summarize_durations(durations[name])
+            usage = tokens[name]
+            self.stdout.write(
+                f"{name:<32}{summary['count']:>7}{summary['p50']:>9.3f}{summary['p95']:>9.3f}{summary['p99']:>9.3f}"
+                f"{usage[TOKEN_ATTRIBUTES[0]]:>10}{usage[TOKEN_ATTRIBUTES[1]]:>10}{usage[TOKEN_ATTRIBUTES[2]]:>9}"
+            )
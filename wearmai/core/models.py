@@ -1,12 +1,5 @@
 from django.db import models
-from openai import OpenAI
-import os
 from typing import Generator
-from wearmai.settings import OPENAI_API_KEY
-
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-
 
 
 class Conversation(models.Model):
@@ -20,46 +13,11 @@ class Conversation(models.Model):
             *self.to_chat()
         ]
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            functions=functions,
-            function_call="auto",
-            stream=True  # Enable streaming
-        )
-
-        accumulated_arguments = ""
-        func_name = ""
-        function_call = None
-        for chunk in response:
-            if chunk.choices:
-                delta = chunk.choices[0].delta
-                content = delta.content
-                function_call = delta.function_call
-
-                # Check if there's a function call
-                if function_call:
-                    func_arguments = function_call.arguments
-                    if(function_call.name):
-                        func_name = function_call.name
-
-                    # Accumulate function call arguments
-                    if func_arguments:
-                        accumulated_arguments += func_arguments
-
-                if content:
-                    yield {'message': content}
-
-        # If the function name is present, the function call is complete
-        if func_name != "":
-            # Forward the function call details to the frontend
-            full_function_call_definition = {
-                'name': func_name,
-                'arguments': accumulated_arguments
-            }
-            yield {'function_call': full_function_call_definition}
-
-        yield {'completed': True}
+        # Imported here so loading the models doesn't pull in the LLM clients; the OpenAI client
+        # (and SDK) is only built on the first call
+        from infrastructure.llm_clients.factory import LLMClientFactory
+        client = LLMClientFactory.get_provider("openai")
+        yield from client.stream_chat(messages, model=model, functions=functions)
 
     def to_chat(self):
         return [
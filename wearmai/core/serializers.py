@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Run, UserProfile
 from core.models import Run, UserProfile, ExerciseUnit
-from services.exercise_summarisation.exercise_summary_service import ExerciseSummaryService
+from django.db.models import Prefetch
+from services.exercise_summarisation.exercise_summary_service import ExerciseSummaryService, load_side_values
 
 class RunSerializer(serializers.ModelSerializer):
     class Meta:
@@ -17,16 +18,29 @@ class RunDetailSerializer(serializers.ModelSerializer):
         model = Run
         fields = ['id', 'date', 'kilometers', 'averages_across_runs']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.prefetch_related(Prefetch('exercise_units', queryset=ExerciseUnit.objects.order_by('id')))
+
+    def _side_values(self) -> dict:
+        # Loaded once for the exercise units of all the runs being serialized, not per run or kilometer
+        if 'side_values' not in self.context:
+            runs = self.parent.instance if isinstance(self.parent, serializers.ListSerializer) else [self.instance]
+            exercise_units = [e for run in runs for e in run.exercise_units.all()]
+            self.context['side_values'] = load_side_values(exercise_units)
+        return self.context['side_values']
+
     def get_averages_across_runs(self, obj):
-        exercise_units = [e for e in ExerciseUnit.objects.filter(run=obj)]
-        return ExerciseSummaryService(exercise_units).run(aggregate = True)
+        exercise_units = [e for e in obj.exercise_units.all()]
+        return ExerciseSummaryService(exercise_units, self._side_values()).run(aggregate = True)
 
     def get_kilometers(self, obj):
         kilometers = {}
+        side_values = self._side_values()
         for index, exercise_unit in enumerate(obj.exercise_units.all()):
             kilometers[f"kilometer_{index}"] = {
                 'speed': exercise_unit.speed,
-                'summary': ExerciseSummaryService([exercise_unit]).run(aggregate = True)
+                'summary': ExerciseSummaryService([exercise_unit], side_values).run(aggregate = True)
             }
         return kilometers
 
@@ -0,0 +1,285 @@
+import datetime
+import os
+import random
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Optional
+import numpy as np
+from django.db import transaction
+from core.models import (
+    Ankle, AnkleLeftSide, AnkleRightSide, ExerciseUnit, GaitPhase, Hip, HipLeftSide, HipRightSide, Jump,
+    Knee, KneeLeftSide, KneeRightSide, Land, LateralGastrocnemius, LateralGastrocnemiusLeftSide,
+    LateralGastrocnemiusRightSide, Lunge, MedialGastrocnemius, MedialGastrocnemiusLeftSide,
+    MedialGastrocnemiusRightSide, Pelvis, PelvisLeftSide, PelvisRightSide, Run, Soleus, SoleusLeftSide,
+    SoleusRightSide, Squat, TibialisAnterior, TibialisAnteriorLeftSide, TibialisAnteriorRightSide, UserProfile, Walk,
+)
+from services.exercise_summarisation.exercise_summary_service import BODY_PARTS_TO_COLS
+import structlog
+
+log = structlog.get_logger(__name__)
+
+# (left, right) side models per body part
+SIDES = {
+    Hip: (HipLeftSide, HipRightSide),
+    Knee: (KneeLeftSide, KneeRightSide),
+    Ankle: (AnkleLeftSide, AnkleRightSide),
+    Pelvis: (PelvisLeftSide, PelvisRightSide),
+    Soleus: (SoleusLeftSide, SoleusRightSide),
+    TibialisAnterior: (TibialisAnteriorLeftSide, TibialisAnteriorRightSide),
+    MedialGastrocnemius: (MedialGastrocnemiusLeftSide, MedialGastrocnemiusRightSide),
+    LateralGastrocnemius: (LateralGastrocnemiusLeftSide, LateralGastrocnemiusRightSide),
+}
+
+EXERCISE_MODELS = {"run": Run, "walk": Walk, "jump": Jump, "squat": Squat, "land": Land, "lunge": Lunge}
+
+# Side model fields (without _avg/_std) by trial file column; angle files hold both legs, so {side} is l or r
+ANGLE_COLUMNS = {
+    Pelvis: {"tilt_angle": "pelvis_tilt", "list_angle": "pelvis_list", "rotation_angle": "pelvis_rotation"},
+    Hip: {"flexion": "hip_flexion_{side}", "adduction": "hip_adduction_{side}", "rotation": "hip_rotation_{side}"},
+    Knee: {"angle": "knee_angle_{side}"},
+    Ankle: {"angle": "ankle_angle_{side}", "subtalar_angle": "subtalar_angle_{side}"},
+}
+# Muscle force files are one per leg, but label every column _r
+FORCE_COLUMNS = {Soleus: "soleus_r", TibialisAnterior: "tib_ant_r", MedialGastrocnemius: "med_gas_r", LateralGastrocnemius: "lat_gas_r"}
+
+# e.g. Subj04_run_81_ikAngAve_l.txt: running at 8.1 km/h, left leg joint angles, averaged over gait cycles
+TRIAL_FILE = re.compile(r"^[^_]+_(?P<exercise>[a-z]+)(?:_(?P<speed>\d+))?_(?P<kind>ikAng|musFor)(?P<stat>Ave|Std)_(?P<side>[lr])\.txt$")
+
+DEFAULT_REFERENCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "development", "datasets", "User_data", "User1")
+
+
+def create_synthetic_user(name: str = "Synthetic User", runs: int = 3, units_per_run: int = 4, phases_per_unit: int = 3, seed: int = 0) -> UserProfile:
+    """A user with `runs` runs of random (but seeded) joint angles, for tests and load tests."""
+    rng = random.Random(seed)
+    user = UserProfile.objects.create(name=name, height=180, weight=75)
+    for r in range(runs):
+        run = Run.objects.create(user=user, date=datetime.date(2025, 1, 1) + datetime.timedelta(days=r))
+        for _ in range(units_per_run):
+            unit = ExerciseUnit.objects.create(run=run, speed=rng.uniform(63, 99))
+            for p in range(phases_per_unit):
+                phase = GaitPhase.objects.create(exercise_unit=unit, phase=p)
+                for body_part, cols in BODY_PARTS_TO_COLS.items():
+                    part = body_part.objects.create(gait_phase=phase)
+                    fk = body_part._meta.get_field("gait_phase").related_query_name()
+                    for side in SIDES[body_part]:
+                        side.objects.create(**{fk: part}, **{col: rng.uniform(-30, 30) for col in cols})
+    return user
+
+
+@dataclass(frozen=True)
+class ReferenceTrial:
+    exercise: str
+    speed: Optional[float]  # for runs and walks, in the recorded data's units (the trial file name token, e.g. 63)
+    curves: dict[tuple[type, str], np.ndarray]  # (side model, field) -> value per gait phase
+
+
+def _read_table(path: str) -> dict[str, np.ndarray]:
+    with open(path, encoding="utf-8") as f:
+        header = f.readline().split()
+        values = np.array([line.split() for line in f if line.strip()], dtype=float)
+    return {column: values[:, i] for i, column in enumerate(header)}
+
+
+def load_reference_trials(directory: str) -> list[ReferenceTrial]:
+    """The trials of one recorded session (e.g. User1's day_1 folder), mapped onto the side models."""
+    curves: dict[tuple[str, Optional[float]], dict] = defaultdict(dict)
+    for filename in sorted(os.listdir(directory)):
+        match = TRIAL_FILE.match(filename)
+        if not match:
+            continue
+        exercise, side = match["exercise"], match["side"]
+        speed = float(match["speed"]) if match["speed"] else None
+        suffix = "_avg" if match["stat"] == "Ave" else "_std"
+        table = _read_table(os.path.join(directory, filename))
+        trial = curves[(exercise, speed)]
+        side_index = 0 if side == "l" else 1
+
+        if match["kind"] == "ikAng":
+            for body_part, fields in ANGLE_COLUMNS.items():
+                for field, column in fields.items():
+                    trial[(SIDES[body_part][side_index], field + suffix)] = table[column.format(side=side)]
+        else:
+            for body_part, column in FORCE_COLUMNS.items():
+                trial[(SIDES[body_part][side_index], "force" + suffix)] = table[column]
+
+    if not curves:
+        raise FileNotFoundError(f"No trial files in {directory}")
+    return [ReferenceTrial(exercise, speed, trial_curves) for (exercise, speed), trial_curves in curves.items()]
+
+
+def load_drift_schedule(path: str) -> list[float]:
+    """
+    Relative change per session from a groundTruth.txt ("day 2: 1% increase", "day 12: baseline", ...),
+    e.g. [0.0, 0.01, ..., 0.05, -0.05, ...].
+    """
+    schedule = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            match = re.search(r"(\d+(?:\.\d+)?)%\s*(increase|decrease)", line)
+            if match:
+                change = float(match[1]) / 100
+                schedule.append(change if match[2] == "increase" else -change)
+            else:
+                schedule.append(0.0)
+    return schedule
+
+
+def _at_speed(trials: list[ReferenceTrial], speed: float) -> dict[tuple[type, str], np.ndarray]:
+    # Linear in speed between (or just beyond) the two nearest recorded speeds
+    trials = sorted(trials, key=lambda trial: trial.speed)
+    if len(trials) == 1:
+        return trials[0].curves
+    upper = next((i for i, trial in enumerate(trials) if trial.speed >= speed), len(trials) - 1)
+    upper = min(max(upper, 1), len(trials) - 1)
+    low, high = trials[upper - 1], trials[upper]
+    t = float(np.clip((speed - low.speed) / (high.speed - low.speed), -0.5, 1.5))
+    return {key: (1 - t) * low.curves[key] + t * high.curves[key] for key in low.curves}
+
+
+def _resampled(trial: ReferenceTrial, phases: int) -> ReferenceTrial:
+    curves = {}
+    for key, values in trial.curves.items():
+        curves[key] = np.interp(np.linspace(0, len(values) - 1, phases), np.arange(len(values)), values)
+    return ReferenceTrial(trial.exercise, trial.speed, curves)
+
+
+@dataclass(frozen=True)
+class SyntheticDataConfig:
+    years: float = 1.0
+    sessions_per_week: float = 3.0
+    exercises: tuple[str, ...] = tuple(EXERCISE_MODELS)
+    noise: float = 0.1  # per-session noise on each curve, as a fraction of its recorded std
+    individual: float = 0.05  # spread of per-user differences from the reference curves
+    drift: float = 0.05  # peak drift over the groundTruth.txt cycle (User1's goes up to 5%)
+    trend: float = 0.02  # progressive change per year, in a per-user direction
+    end_date: datetime.date = datetime.date(2025, 1, 1)
+    phases: Optional[int] = None  # gait phases per trial, resampled from the recorded 100; None keeps them all
+
+
+class SyntheticDataGenerator:
+    """
+    Users with years of sessions derived from a reference session (User1's recorded trials).
+    Every session repeats the reference trials of the configured exercises, with the curves
+    interpolated to the user's (jittered) speeds, scaled by per-user differences, drifted over
+    the groundTruth.txt schedule plus a yearly trend, and noised by their recorded std.
+    Rows are written with `bulk_create`, `batch_trials` trials per transaction.
+    """
+
+    def __init__(
+        self,
+        reference_dir: str = DEFAULT_REFERENCE_DIR,
+        config: SyntheticDataConfig = SyntheticDataConfig(),
+        seed: int = 0,
+        batch_trials: int = 50,
+    ) -> None:
+        self.config = config
+        self.seed = seed
+        self.batch_trials = batch_trials
+        self.trials: dict[str, list[ReferenceTrial]] = defaultdict(list)
+        for trial in load_reference_trials(os.path.join(reference_dir, "day_1")):
+            if trial.exercise in config.exercises:
+                self.trials[trial.exercise].append(_resampled(trial, config.phases) if config.phases else trial)
+        ground_truth = os.path.join(reference_dir, "groundTruth.txt")
+        self.drift_schedule = load_drift_schedule(ground_truth) if os.path.exists(ground_truth) else [0.0]
+        self.rows_written = 0
+
+    def sessions_per_user(self) -> int:
+        return max(int(self.config.years * 52 * self.config.sessions_per_week), 1)
+
+    def generate(self, users: int, name_prefix: str = "Synthetic User", progress: Optional[Callable[[int, float], None]] = None) -> list[UserProfile]:
+        """Creates `users` users; `progress(users_done, elapsed)` is called after each."""
+        start = time.perf_counter()
+        profiles = []
+        for index in range(users):
+            profiles.append(self.generate_user(f"{name_prefix} {index}", np.random.default_rng([self.seed, index])))
+            if progress:
+                progress(index + 1, time.perf_counter() - start)
+        return profiles
+
+    def generate_user(self, name: str, rng: np.random.Generator) -> UserProfile:
+        config = self.config
+        user = UserProfile.objects.create(name=name, height=round(float(rng.normal(175, 8)), 1), weight=round(float(rng.normal(72, 10)), 1))
+        self.rows_written += 1
+
+        # Per user: differences from the reference, pace, where in the drift cycle it starts, trend direction
+        keys = {key for trials in self.trials.values() for trial in trials for key in trial.curves}
+        individual = {key: float(rng.normal(1, config.individual)) for key in keys}
+        pace = float(rng.normal(1, 0.08))
+        cycle_offset = int(rng.integers(len(self.drift_schedule)))
+        drift_scale = config.drift / max(max(abs(d) for d in self.drift_schedule), 1e-9)
+        trend = config.trend * rng.choice([-1, 1])
+
+        sessions = self.sessions_per_user()
+        first_date = config.end_date - datetime.timedelta(days=round(config.years * 365))
+        pending = []
+        for session in range(sessions):
+            date = first_date + datetime.timedelta(days=round(session * 7 / config.sessions_per_week))
+            years_in = (date - first_date).days / 365
+            scale = 1 + drift_scale * self.drift_schedule[(session + cycle_offset) % len(self.drift_schedule)] + trend * years_in
+            for exercise, trials in self.trials.items():
+                parent = EXERCISE_MODELS[exercise](user=user, date=date)
+                for trial in trials:
+                    speed = round(trial.speed * pace * float(rng.normal(1, 0.03)), 1) if trial.speed else None
+                    curves = _at_speed(trials, speed) if speed else trial.curves
+                    pending.append((exercise, parent, speed, self._session_curves(curves, individual, scale, rng)))
+                    if len(pending) >= self.batch_trials:
+                        self._write(pending)
+                        pending = []
+        if pending:
+            self._write(pending)
+        return user
+
+    def _session_curves(self, curves: dict, individual: dict, scale: float, rng: np.random.Generator) -> dict:
+        session = {}
+        for (side_model, field), values in curves.items():
+            values = values * individual[(side_model, field)] * scale
+            if field.endswith("_avg"):
+                std = curves.get((side_model, field.removesuffix("_avg") + "_std"))
+                if std is not None:
+                    values = values + rng.normal(0, 1, len(values)) * np.abs(std) * self.config.noise
+            else:
+                values = np.abs(values * rng.lognormal(0, self.config.noise, len(values)))
+            session[(side_model, field)] = values
+        return session
+
+    @transaction.atomic
+    def _write(self, trials: list) -> None:
+        parents: dict[type, dict[int, object]] = defaultdict(dict)
+        for exercise, parent, _, _ in trials:
+            parents[type(parent)][id(parent)] = parent
+        rows = 0
+        for model, instances in parents.items():
+            # Parents still without a pk were started in this batch
+            rows += len(model.objects.bulk_create([parent for parent in instances.values() if parent.pk is None]))
+
+        units = ExerciseUnit.objects.bulk_create([
+            ExerciseUnit(**{exercise: parent}, speed=speed) for exercise, parent, speed, _ in trials
+        ])
+        phases, values = [], []
+        for unit, (_, _, _, curves) in zip(units, trials):
+            n_phases = len(next(iter(curves.values())))
+            phases.extend(GaitPhase(exercise_unit=unit, phase=i) for i in range(n_phases))
+            values.append((n_phases, curves))
+        phases = GaitPhase.objects.bulk_create(phases)
+
+        rows += len(units) + len(phases)
+        for body_part, side_models in SIDES.items():
+            fk = body_part._meta.get_field("gait_phase").related_query_name()
+            parts = body_part.objects.bulk_create([body_part(gait_phase=phase) for phase in phases])
+            rows += len(parts)
+            for side_model in side_models:
+                side_rows, offset = [], 0
+                for n_phases, curves in values:
+                    fields = {field: column.tolist() for (model, field), column in curves.items() if model is side_model}
+                    side_rows.extend(
+                        side_model(**{fk: parts[offset + i]}, **{field: column[i] for field, column in fields.items()})
+                        for i in range(n_phases)
+                    )
+                    offset += n_phases
+                side_model.objects.bulk_create(side_rows)
+                rows += len(side_rows)
+        self.rows_written += rows
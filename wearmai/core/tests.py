@@ -1,3 +1,550 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from benchmarks.harness import broken_benchmarks, compare
+from common.utils.db_queries import max_queries, track_queries
+from common.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+from infrastructure.cassette import Cassette, CassetteLLMClient, CassetteMissError, CassetteProxy
+from infrastructure.llm_clients.base import LLModels
+from infrastructure.llm_clients.hedging import HedgedStreamer, HedgePolicy
+from infrastructure.llm_clients.resilience import CircuitOpenError, RateLimit, ResilientLLMClient
+from infrastructure.vectorstore.base import VectorEntry
+from infrastructure.vectorstore.batch_writer import BatchWriter, BatchWriterConfig
+from core.models import ExerciseUnit, GaitPhase, HipLeftSide, Run, SoleusRightSide
+from core.synthetic import SyntheticDataConfig, SyntheticDataGenerator, create_synthetic_user
+from services.exercise_summarisation.exercise_summary_service import BODY_PARTS_TO_COLS
+from services.grounding.cache import GroundingCache
+from services.grounding.compaction import GroundingCompactor
+from services.grounding.composite_retriever import CompositeGroundingRetriever, GroundingSource
+from services.llm_coach.coach_service import CoachService
+from services.llm_coach.loadtest import DEFAULT_SCRIPT, FakeBackendConfig, LatencyDistribution, build_fake_coach
+from services.llm_coach.routing import DEFAULT_ROUTING_POLICY, TurnSignals
+from user_profile.loader import load_profile
 
-# Create your tests here.
+
+class FakeLLMFactory:
+    """Stands in for `LLMClientFactory`: every model answers with a fixed string."""
+
+    def get(self, model):
+        return self
+
+    def generate(self, prompt, model, **kwargs):
+        return "summary"
+
+
+def make_coach(user_profile: dict | None = None) -> CoachService:
+    # Skip __init__: the DB paths don't need the vector store or grounding sources
+    coach = CoachService.__new__(CoachService)
+    coach.user_profile = user_profile or {}
+    coach.routing_policy = DEFAULT_ROUTING_POLICY
+    coach.llm_factory = FakeLLMFactory()
+    return coach
+
+
+class CoachDataPathQueryBudgetTests(TestCase):
+    """Query budgets for the coach's DB paths; they must not grow with the number of runs or exercise units."""
+
+    # 1 (runs) + 1 (exercise units) + 2 per body part (left and right sides)
+    RUN_DATA_BUDGET = 2 + 2 * len(BODY_PARTS_TO_COLS)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_synthetic_user()
+        cls.run_ids = list(cls.user.runs.values_list("id", flat=True))
+
+    def test_get_raw_run_data_within_budget(self):
+        coach = make_coach()
+        with max_queries(self.RUN_DATA_BUDGET, "get_raw_run_data"):
+            run_data = json.loads(coach.get_raw_run_data(self.run_ids))
+        self.assertEqual(len(run_data), len(self.run_ids))
+        self.assertEqual(len(run_data[0]["kilometers"]), 4)
+
+    def test_get_raw_run_data_queries_do_not_grow_with_runs(self):
+        coach = make_coach()
+        with track_queries("one_run") as one_run:
+            coach.get_raw_run_data(self.run_ids[:1])
+        with track_queries("all_runs") as all_runs:
+            coach.get_raw_run_data(self.run_ids)
+        self.assertEqual(one_run.count, all_runs.count)
+
+    def test_get_run_summary_within_budget(self):
+        coach = make_coach()
+        with max_queries(self.RUN_DATA_BUDGET, "get_run_summary"):
+            self.assertEqual(coach.get_run_summary(self.run_ids), "summary")
+
+    def test_load_profile_within_budget(self):
+        # 1 (user) + 1 (exercise units) + 2 per body part + 1 (runs)
+        with max_queries(3 + 2 * len(BODY_PARTS_TO_COLS), "load_profile"):
+            profile = load_profile(name=self.user.name)
+        self.assertEqual(len(profile["llm_user_profile"]["user_summary"]["runs"]["run_data"]), 3)
+
+    def test_max_queries_reports_repeated_statements(self):
+        with self.assertRaisesMessage(AssertionError, "over its budget of 1"):
+            with max_queries(1, "n_plus_one"):
+                for run_id in self.run_ids:
+                    Run.objects.get(id=run_id)
+
+
+class FailingVectorStore:
+    def hybrid_similarity_search(self, query, n_results=5):
+        raise ConnectionError("Weaviate is down")
+
+    def close(self):
+        pass
+
+
+class CoachContextDegradationTests(TransactionTestCase):
+    # Stages query the DB from worker threads, which need committed data
+    def test_failing_optional_stage_is_omitted_instead_of_failing_the_turn(self):
+        user = create_synthetic_user()
+        run_ids = list(user.runs.values_list("id", flat=True))
+        instant = LatencyDistribution("constant", (0.0,))
+        config = FakeBackendConfig(*(instant,) * 4, answer_tokens=1, vector_latency=instant, grounding_latency=instant)
+        coach = build_fake_coach({}, run_ids, config, DEFAULT_SCRIPT, seed=0)
+        coach.vectorstore = FailingVectorStore()
+
+        statuses = []
+        # Raw run data, knowledge base and literature search
+        context = coach.retrieve_necessary_context(DEFAULT_SCRIPT[1].query, status_callback=statuses.append)
+
+        self.assertEqual(context["omitted_context"], ["knowledge base excerpts"])
+        self.assertTrue(context["raw_run_data"])
+        self.assertIn("results", context["fact_checking_data"])
+        self.assertTrue(any(status.startswith("Fact-checking") for status in statuses))
+
+    def test_grounded_turn_asks_for_a_grounded_answer(self):
+        user = create_synthetic_user()
+        run_ids = list(user.runs.values_list("id", flat=True))
+        instant = LatencyDistribution("constant", (0.0,))
+        config = FakeBackendConfig(*(instant,) * 4, answer_tokens=1, vector_latency=instant, grounding_latency=instant)
+        coach = build_fake_coach({}, run_ids, config, DEFAULT_SCRIPT, seed=0)
+
+        prompt, _ = coach.prepare_turn(DEFAULT_SCRIPT[1].query)
+
+        self.assertIn("Ground your advice and analysis", prompt)
+
+
+class FakeStreamingClient:
+    def generate(self, prompt, model, **kwargs):
+        return f"answer to {prompt}"
+
+    def stream(self, prompt, model, **kwargs):
+        yield from ("an", "swer")
+
+    async def agenerate(self, prompt, model, **kwargs):
+        return self.generate(prompt, model)
+
+    async def astream(self, prompt, model, **kwargs):
+        for delta in self.stream(prompt, model):
+            yield delta
+
+
+class FlakyClient:
+    """Fails with a retryable error `failures` times, then answers."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+
+    def generate(self, prompt, model, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("429")
+        return "answer"
+
+
+class ResilientLLMClientTests(SimpleTestCase):
+    def test_every_retry_reserves_rate_limit_capacity(self):
+        client = ResilientLLMClient(FlakyClient(failures=2), "gemini", rate_limits={"gemini": RateLimit(rpm=600)}, backoff_base=0)
+        self.assertEqual(client.generate("prompt", model=LLModels.GEMINI_20_FLASH), "answer")
+        self.assertEqual(len(client.metrics.queue_waits), 3)
+        # One request's worth per attempt
+        self.assertAlmostEqual(client._bucket("gemini", "rpm")._tokens, 597, delta=0.5)
+
+    def test_open_circuit_rejects_without_taking_capacity(self):
+        client = ResilientLLMClient(FlakyClient(failures=0), "gemini", rate_limits={"gemini": RateLimit(rpm=600)})
+        client.breaker.failure_threshold = 1
+        client.breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            client.generate("prompt", model=LLModels.GEMINI_20_FLASH)
+        self.assertEqual(len(client.metrics.queue_waits), 0)
+
+
+class SlowThenChattyClient:
+    """Streams 10 deltas of 40 chars after `first_token_delay` seconds."""
+
+    def __init__(self, first_token_delay: float) -> None:
+        self.first_token_delay = first_token_delay
+
+    def stream(self, prompt, model, **kwargs):
+        time.sleep(self.first_token_delay)
+        for _ in range(10):
+            yield "x" * 40
+
+
+class HedgedStreamerTests(SimpleTestCase):
+    def test_backup_wins_record_primary_lower_bound_and_loser_output(self):
+        clients = {LLModels.GEMINI_25_FLASH: SlowThenChattyClient(0.3), LLModels.GEMINI_20_FLASH: SlowThenChattyClient(0.0)}
+        streamer = HedgedStreamer(HedgePolicy(primary=LLModels.GEMINI_25_FLASH, backup=LLModels.GEMINI_20_FLASH, first_token_timeout=0.05))
+
+        with mock.patch("infrastructure.llm_clients.hedging.LLMClientFactory.get", side_effect=clients.get):
+            self.assertEqual(len("".join(streamer.stream("prompt"))), 400)
+            # The cancelled primary stops at its first delta
+            time.sleep(0.5)
+
+        metrics = streamer.metrics
+        self.assertEqual(metrics.backup_wins, 1)
+        # Censored at the backup's first token, not dropped
+        self.assertEqual(len(metrics.primary_first_token), 1)
+        self.assertGreaterEqual(metrics.primary_first_token[0], 0.05)
+        # The prompt, plus the delta the primary streamed before noticing it lost
+        self.assertEqual(metrics.extra_tokens, estimate_tokens("prompt") + 40 // CHARS_PER_TOKEN)
+
+
+class CassetteRoundTripTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cassettes", "coach.jsonl")
+
+    def test_replays_recorded_calls_without_the_client(self):
+        recorder = CassetteLLMClient(Cassette(self.path, "record"), FakeStreamingClient())
+        recorded = (recorder.generate("q", model="m", temperature=0.5), list(recorder.stream("q", model="m")))
+
+        replayer = CassetteLLMClient(Cassette(self.path, "replay", latency_scale=0))
+        self.assertEqual((replayer.generate("q", model="m", temperature=0.5), list(replayer.stream("q", model="m"))), recorded)
+        self.assertEqual(replayer.cassette.remaining(), 0)
+
+    def test_changed_request_is_a_miss(self):
+        CassetteLLMClient(Cassette(self.path, "record"), FakeStreamingClient()).generate("q", model="m")
+        replayer = CassetteLLMClient(Cassette(self.path, "replay", latency_scale=0))
+        with self.assertRaises(CassetteMissError):
+            replayer.generate("a different prompt", model="m")
+
+    def test_async_calls_replay_too(self):
+        async def turn(client):
+            return await client.agenerate("q", model="m"), [delta async for delta in client.astream("q", model="m")]
+
+        recorded = asyncio.run(turn(CassetteLLMClient(Cassette(self.path, "record"), FakeStreamingClient())))
+        self.assertEqual(asyncio.run(turn(CassetteLLMClient(Cassette(self.path, "replay", latency_scale=0)))), recorded)
+
+    def test_vector_entries_are_stored_as_json(self):
+        entries = [VectorEntry(id="1", content="Knee flexion at initial contact")]
+        vectorstore = SimpleNamespace(hybrid_similarity_search=lambda query, n_results=5: entries)
+        CassetteProxy(Cassette(self.path, "record"), "vectorstore", vectorstore, ("hybrid_similarity_search",)).hybrid_similarity_search("knee")
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["response"], {"list": [{"vector_entry": {"id": "1", "content": "Knee flexion at initial contact"}}]})
+        replayer = CassetteProxy(Cassette(self.path, "replay", latency_scale=0), "vectorstore", methods=("hybrid_similarity_search",))
+        self.assertEqual(replayer.hybrid_similarity_search("knee"), entries)
+
+    def test_refuses_responses_json_cannot_hold(self):
+        recorder = CassetteProxy(Cassette(self.path, "record"), "grounding", SimpleNamespace(search=lambda query: object()), ("search",))
+        with self.assertRaises(TypeError):
+            recorder.search("knee")
+
+
+class FakeCollection:
+    """A Weaviate collection whose server rejects objects for as many attempts as `rejections` says."""
+
+    def __init__(self, rejections: dict[str, int]) -> None:
+        self.rejections = dict(rejections)
+        self.inserted: list[str] = []
+        self.calls = 0
+        self.data = self
+
+    def insert_many(self, objects):
+        self.calls += 1
+        errors = {}
+        for i, obj in enumerate(objects):
+            if self.rejections.get(obj.uuid, 0) > 0:
+                self.rejections[obj.uuid] -= 1
+                errors[i] = SimpleNamespace(message=f"{obj.uuid} rejected")
+            else:
+                self.inserted.append(obj.uuid)
+        return SimpleNamespace(errors=errors)
+
+
+class BatchWriterTests(SimpleTestCase):
+    CONFIG = BatchWriterConfig(batch_size=2, concurrency=2, max_retries=2, backoff_base=0.0)
+
+    def objects(self, count: int) -> list:
+        return [SimpleNamespace(uuid=f"chunk-{i}") for i in range(count)]
+
+    def test_rejected_objects_are_retried(self):
+        collection = FakeCollection({"chunk-1": 1, "chunk-4": 2})
+        progress = []
+        result = BatchWriter(collection, self.CONFIG, progress.append).write(self.objects(5))
+
+        self.assertEqual(sorted(collection.inserted), [f"chunk-{i}" for i in range(5)])
+        self.assertEqual((result.inserted, result.batches, result.failed), (5, 3, []))
+        # 3 batches, then 1 retry for chunk-1's batch and 2 for chunk-4's
+        self.assertEqual(collection.calls, 6)
+        self.assertEqual(len(progress), 3)
+
+    def test_objects_rejected_on_every_attempt_are_reported(self):
+        collection = FakeCollection({"chunk-2": 3})
+        result = BatchWriter(collection, self.CONFIG).write(self.objects(4))
+
+        self.assertTrue(result.has_failures)
+        self.assertEqual(result.failed, [("chunk-2", "chunk-2 rejected")])
+        self.assertEqual(result.inserted, 3)
+        self.assertNotIn("chunk-2", collection.inserted)
+
+    def test_failed_requests_report_the_whole_batch(self):
+        collection = FakeCollection({})
+        collection.insert_many = mock.Mock(side_effect=ConnectionError("Weaviate is down"))
+        result = BatchWriter(collection, self.CONFIG).write(self.objects(2))
+
+        self.assertEqual(result.failed, [("chunk-0", "Weaviate is down"), ("chunk-1", "Weaviate is down")])
+        self.assertEqual(result.inserted, 0)
+        self.assertEqual(collection.insert_many.call_count, 3)
+
+
+class GroundingCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = mock.patch("services.grounding.cache.time", SimpleNamespace(time=lambda: self.now))
+        clock.start()
+        self.addCleanup(clock.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = GroundingCache(os.path.join(directory.name, "cache.sqlite3"), ttl=10, max_stale=100, max_entries=2)
+        self.addCleanup(self.cache.close)
+
+    def wait_for_refresh(self, key):
+        # The refresh thread drops the key once it is done, whatever the outcome
+        for _ in range(200):
+            if key not in self.cache._refreshing:
+                return
+            time.sleep(0.01)
+        self.fail(f"refresh of {key} never finished")
+
+    def test_fresh_entries_are_served_without_fetching(self):
+        self.assertEqual(self.cache.get_or_fetch("q", lambda: {"answer": 1}), {"answer": 1})
+        self.now += 5
+        self.assertEqual(self.cache.get_or_fetch("q", mock.Mock(side_effect=AssertionError("fetched"))), {"answer": 1})
+        self.assertEqual(self.cache.get("q"), ({"answer": 1}, False))
+
+    def test_stale_entries_are_served_while_refreshed_in_the_background(self):
+        self.cache.set("q", {"answer": 1})
+        self.now += 50
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            return {"answer": 2}
+
+        self.assertEqual(self.cache.get_or_fetch("q", fetch), {"answer": 1})
+        # A second hit during the refresh doesn't start another one
+        self.assertEqual(self.cache.get_or_fetch("q", mock.Mock(side_effect=AssertionError("fetched twice"))), {"answer": 1})
+        release.set()
+        self.wait_for_refresh("q")
+        self.assertEqual(self.cache.get("q"), ({"answer": 2}, False))
+
+    def test_entries_past_max_stale_are_misses(self):
+        self.cache.set("q", {"answer": 1})
+        self.now += 101
+        self.assertEqual(self.cache.get("q"), (None, False))
+        self.assertEqual(self.cache.get_or_fetch("q", lambda: {"answer": 2}), {"answer": 2})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", {"answer": "a"})
+        self.now += 1
+        self.cache.set("b", {"answer": "b"})
+        self.now += 1
+        self.cache.get("a")
+        self.now += 1
+        self.cache.set("c", {"answer": "c"})
+
+        self.assertEqual(self.cache.get("b"), (None, False))
+        self.assertEqual(self.cache.get("a")[0], {"answer": "a"})
+        self.assertEqual(self.cache.get("c")[0], {"answer": "c"})
+
+    def test_failed_fetches_are_not_cached(self):
+        with self.assertRaises(ConnectionError):
+            self.cache.get_or_fetch("q", mock.Mock(side_effect=ConnectionError("Linkup is down")))
+        self.assertEqual(self.cache.get("q"), (None, False))
+
+        # A failed refresh keeps the stale entry
+        self.cache.set("q", {"answer": 1})
+        self.now += 50
+        self.cache.get_or_fetch("q", mock.Mock(side_effect=ConnectionError("Linkup is down")))
+        self.wait_for_refresh("q")
+        self.assertEqual(self.cache.get("q"), ({"answer": 1}, True))
+
+
+class FakeGroundingRetriever:
+    def __init__(self, results: list[dict], delay: float = 0.0, release: threading.Event | None = None) -> None:
+        self.results = results
+        self.delay = delay
+        self.release = release
+
+    def retrieve_grounding_data(self, search_query, status_callback=None):
+        if self.release:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        return {"results": self.results}
+
+
+class CompositeGroundingRetrieverTests(SimpleTestCase):
+    def setUp(self):
+        # Holds back the slow source until the test is over
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def test_slow_source_is_dropped_at_its_deadline(self):
+        retriever = CompositeGroundingRetriever([
+            GroundingSource("slow", FakeGroundingRetriever([{"url": "https://slow.org", "content": "slow"}], release=self.release), deadline=0.1),
+            GroundingSource("fast", FakeGroundingRetriever([{"url": "https://fast.org", "content": "fast"}]), deadline=5),
+        ], budget=5)
+
+        start = time.monotonic()
+        data = retriever.retrieve_grounding_data("cadence")
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([result["url"] for result in data["results"]], ["https://fast.org"])
+
+    def test_budget_caps_every_source_deadline(self):
+        retriever = CompositeGroundingRetriever([
+            GroundingSource("slow", FakeGroundingRetriever([{"url": "https://slow.org", "content": "slow"}], release=self.release), deadline=5),
+        ], budget=5)
+
+        start = time.monotonic()
+        data = retriever.retrieve_grounding_data("cadence", budget=0.1)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIn("error", data)
+
+    def test_results_are_merged_in_source_order_without_duplicates(self):
+        retriever = CompositeGroundingRetriever([
+            # Answers last, but is listed first
+            GroundingSource("linkup", FakeGroundingRetriever([
+                {"url": "https://www.example.org/study/", "content": "Cadence and knee load."},
+                {"url": "https://example.org/other", "content": "Stride length."},
+            ], delay=0.05), deadline=5),
+            GroundingSource("abstracts", FakeGroundingRetriever([
+                {"url": "http://example.org/study", "content": "Same study, other mirror."},
+                {"url": "https://journal.org/copy", "content": "stride   LENGTH."},
+                {"url": "https://journal.org/new", "content": "Hip drop."},
+            ]), deadline=5),
+        ], budget=5)
+
+        data = retriever.retrieve_grounding_data("cadence")
+        self.assertEqual(
+            [result["url"] for result in data["results"]],
+            ["https://www.example.org/study/", "https://example.org/other", "https://journal.org/new"],
+        )
+
+
+class GroundingCompactorTests(SimpleTestCase):
+    def test_keeps_single_line_abstracts_mentioning_boilerplate_words(self):
+        abstract = (
+            "Objective: to review risk factors for running injuries. PubMed, Embase and Google Scholar were searched "
+            "up to 2023. Higher weekly mileage and previous injury were associated with knee injury in runners."
+        )
+        data = {"results": [
+            {"type": "text", "name": "Systematic review", "url": "https://example.org/review", "content": abstract},
+            {"type": "text", "name": "Menu", "url": "https://example.org/menu", "content": "Sign in\nSubscribe to our newsletter"},
+        ]}
+        compacted, stats = GroundingCompactor().compact(data, "knee injury risk in runners")
+
+        self.assertEqual([r["name"] for r in compacted["results"]], ["Systematic review"])
+        self.assertIn("Google Scholar", compacted["results"][0]["content"])
+        self.assertGreater(stats.tokens_after, 4)
+
+    def test_drops_short_page_chrome_lines(self):
+        content = "Accept all cookies\nKnee injuries are common in runners who increase their mileage quickly."
+        compactor = GroundingCompactor()
+        self.assertEqual(compactor._split_passages(content), ["Knee injuries are common in runners who increase their mileage quickly."])
+
+
+class RoutingPolicyTests(SimpleTestCase):
+    def route(self, query: str) -> str:
+        return DEFAULT_ROUTING_POLICY.route(TurnSignals(query=query, context_tokens=500, functions=frozenset(), history_turns=0)).name
+
+    def test_keywords_match_whole_words(self):
+        self.assertEqual(self.route("Could you make me a training plan for a marathon?"), "training_plan")
+        self.assertEqual(self.route("Is my heel pain plantar fasciitis?"), "conversational")
+
+
+class LatencyDistributionTests(SimpleTestCase):
+    def test_parse_and_sample(self):
+        rng = random.Random(0)
+        self.assertEqual(LatencyDistribution.parse("constant:0.2").sample(rng), 0.2)
+        self.assertTrue(0.1 <= LatencyDistribution.parse("uniform:0.1,0.5").sample(rng) <= 0.5)
+        self.assertGreater(LatencyDistribution.parse("lognormal:0.8,0.5").sample(rng), 0)
+
+    def test_rejects_unknown_or_malformed_specs(self):
+        for spec in ("gamma:1", "uniform:0.1", "constant"):
+            with self.assertRaises(ValueError):
+                LatencyDistribution.parse(spec)
+
+
+class SyntheticDataGeneratorTests(TestCase):
+    def test_generates_sessions_from_the_reference_user(self):
+        generator = SyntheticDataGenerator(config=SyntheticDataConfig(years=0.05, exercises=("run",), phases=10))
+        user = generator.generate(1, name_prefix="Generated")[0]
+
+        sessions = generator.sessions_per_user()
+        self.assertEqual(user.runs.count(), sessions)
+        # Three recorded running speeds per session, every gait phase with both legs' angles and forces
+        units = ExerciseUnit.objects.filter(run__user=user)
+        self.assertEqual(units.count(), 3 * sessions)
+        # Speeds stay in the recorded data's units (63, 81 and 99 for User1's runs), jittered by the user's pace
+        self.assertTrue(all(40 < speed < 140 for speed in units.values_list("speed", flat=True)))
+        self.assertEqual(GaitPhase.objects.filter(exercise_unit__in=units).count(), 30 * sessions)
+        self.assertEqual(HipLeftSide.objects.filter(hip__gait_phase__exercise_unit__in=units, flexion_avg__isnull=False).count(), 30 * sessions)
+        self.assertEqual(SoleusRightSide.objects.filter(soleus__gait_phase__exercise_unit__in=units, force_std__isnull=False).count(), 30 * sessions)
+        self.assertEqual(len(load_profile(name=user.name)["llm_user_profile"]["user_summary"]["runs"]["run_data"]), sessions)
+
+    def test_drift_follows_ground_truth_schedule(self):
+        generator = SyntheticDataGenerator(config=SyntheticDataConfig(exercises=("squat",)))
+        self.assertEqual(len(generator.drift_schedule), 23)
+        self.assertEqual(max(generator.drift_schedule), 0.05)
+        self.assertEqual(min(generator.drift_schedule), -0.05)
+
+
+class BenchmarkComparisonTests(SimpleTestCase):
+    def test_flags_throughput_drops_and_slowdowns_beyond_tolerance(self):
+        baseline = {"search": {"qps": 1000, "query_ms": 1.0, "records": 5000}, "cleaning": {"mb_per_s": 20.0}}
+        results = {"search": {"qps": 700, "query_ms": 1.1, "records": 9000}, "cleaning": {"mb_per_s": 25.0}, "new": {"qps": 1}}
+
+        rows = {(row["benchmark"], row["metric"]): row for row in compare(results, baseline, tolerance=0.2)}
+        self.assertTrue(rows[("search", "qps")]["regression"])
+        self.assertFalse(rows[("search", "query_ms")]["regression"])
+        self.assertFalse(rows[("cleaning", "mb_per_s")]["regression"])
+        # Informational metrics and benchmarks without a baseline aren't compared
+        self.assertNotIn(("search", "records"), rows)
+        self.assertNotIn(("new", "qps"), rows)
+
+    def test_skips_failed_benchmarks(self):
+        self.assertEqual(compare({"segmentation": {"error": "no model"}}, {"segmentation": {"chunks_per_s": 10}}), [])
+
+    def test_failed_benchmarks_with_a_baseline_are_broken(self):
+        results = {"data_paths": {"error": "no table"}, "segmentation": {"error": "no model"}}
+        baseline = {"data_paths.ingest": {"rows_per_s": 30000}}
+        self.assertEqual(broken_benchmarks(results, baseline), ["data_paths"])
+
+    def test_any_extra_query_is_a_regression_and_warmup_is_informational(self):
+        baseline = {"run_detail": {"queries": 10, "best_s": 1.0}, "segmentation": {"warmup_s": 1.0}}
+        results = {"run_detail": {"queries": 11, "best_s": 1.0}, "segmentation": {"warmup_s": 30.0}}
+
+        rows = {(row["benchmark"], row["metric"]): row for row in compare(results, baseline, tolerance=0.2)}
+        self.assertTrue(rows[("run_detail", "queries")]["regression"])
+        self.assertFalse(rows[("run_detail", "best_s")]["regression"])
+        self.assertNotIn(("segmentation", "warmup_s"), rows)
+
+    def test_timings_are_gated_on_the_best_repeat_not_the_median(self):
+        baseline = {"prompt_building": {"best_ms": 1.0, "median_ms": 1.0}, "run_detail": {"best_s": 1.0, "median_s": 1.0}}
+        results = {"prompt_building": {"best_ms": 1.1, "median_ms": 1.5}, "run_detail": {"best_s": 1.5, "median_s": 1.1}}
+
+        rows = {(row["benchmark"], row["metric"]): row for row in compare(results, baseline, tolerance=0.2)}
+        self.assertFalse(rows[("prompt_building", "best_ms")]["regression"])
+        self.assertTrue(rows[("run_detail", "best_s")]["regression"])
+        self.assertNotIn(("prompt_building", "median_ms"), rows)
+        self.assertNotIn(("run_detail", "median_s"), rows)
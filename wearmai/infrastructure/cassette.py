@@ -0,0 +1,308 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+from pydantic import BaseModel
+from .llm_clients.base import BaseLLMClient
+from .llm_clients.factory import LLMClientFactory
+from .vectorstore.base import VectorEntry
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+class CassetteMissError(LookupError):
+    pass
+
+
+class ReplayedError(RuntimeError):
+    """A recorded call failed; replaying it raises this with the original error's message."""
+    pass
+
+
+# Responses are stored as JSON (or pydantic models as JSON), never pickled: cassettes get shared
+# and committed, and replaying one must not run code from it
+def _encode(value: Any) -> dict:
+    if isinstance(value, VectorEntry):
+        return {"vector_entry": {"id": value.id, "content": value.content}}
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        return {"pydantic": f"{cls.__module__}:{cls.__qualname__}", "data": value.model_dump(mode="json")}
+    if isinstance(value, (list, tuple)) and any(isinstance(v, BaseModel) for v in value):
+        return {"list": [_encode(v) for v in value]}
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        raise TypeError(f"Can't record a {type(value).__qualname__} response; cassettes hold JSON values and pydantic models") from None
+    return {"json": value}
+
+
+def _decode(encoded: dict) -> Any:
+    if "vector_entry" in encoded:
+        return VectorEntry(**encoded["vector_entry"])
+    if "pydantic" in encoded:
+        module, name = encoded["pydantic"].split(":")
+        cls = getattr(importlib.import_module(module), name, None)
+        if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+            raise ValueError(f"{encoded['pydantic']} is not a pydantic model")
+        return cls.model_validate(encoded["data"])
+    if "list" in encoded:
+        return [_decode(v) for v in encoded["list"]]
+    return encoded["json"]
+
+
+def _describe(value: Any) -> str:
+    # Stable stand-ins for request arguments JSON can't hold (classes, schemas, ...)
+    return getattr(value, "__qualname__", None) or type(value).__qualname__
+
+
+class _ChunkTimer:
+    def __init__(self) -> None:
+        self.chunks: list = []  # [seconds since the previous chunk (or the call), delta]
+        self._start = self._last = time.perf_counter()
+
+    def chunk(self, delta: str) -> None:
+        now = time.perf_counter()
+        self.chunks.append([now - self._last, delta])
+        self._last = now
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+
+class Cassette:
+    """
+    Recorded external interactions (LLM calls, vector store queries, grounding searches), stored
+    as JSON lines. In `record` mode calls go to the real backends and are appended with their
+    latency (per chunk for streams); in `replay` mode they are served back by request, in recorded
+    order for identical requests, after the recorded latency times `latency_scale`
+    (1 replays provider time as measured, 0 removes it).
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.stats = {"recorded": 0, "replayed": 0, "provider_time": 0.0}
+        self._interactions: dict[str, deque] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        if self.recording:
+            # Start a fresh recording
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            open(path, "w", encoding="utf-8").close()
+        else:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._interactions[interaction["key"]].append(interaction)
+        log.info("cassette_opened", path=path, mode=mode, interactions=sum(len(q) for q in self._interactions.values()))
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @staticmethod
+    def key(kind: str, request: dict) -> str:
+        canonical = json.dumps([kind, request], sort_keys=True, default=_describe)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def record(self, kind: str, request: dict, latency: float, response: Any = None, chunks: Optional[list] = None, error: Optional[Exception] = None) -> None:
+        interaction = {
+            "key": self.key(kind, request),
+            "kind": kind,
+            "request": json.loads(json.dumps(request, default=_describe)),
+            "latency": latency,
+            "response": _encode(response) if chunks is None and error is None else None,
+            "chunks": chunks,
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+        }
+        line = json.dumps(interaction)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.stats["recorded"] += 1
+
+    def next(self, kind: str, request: dict) -> dict:
+        key = self.key(kind, request)
+        with self._lock:
+            if not self._interactions[key]:
+                raise CassetteMissError(f"No recorded {kind} interaction for request {json.dumps(request, default=_describe)[:300]}")
+            self.stats["replayed"] += 1
+            return self._interactions[key].popleft()
+
+    def delay(self, seconds: float) -> float:
+        """Replay time for `seconds` of recorded provider time."""
+        seconds *= self.latency_scale
+        with self._lock:
+            self.stats["provider_time"] += seconds
+        return seconds
+
+    def remaining(self) -> int:
+        """Recorded interactions not replayed (yet)."""
+        with self._lock:
+            return sum(len(q) for q in self._interactions.values())
+
+    # ----- Record / replay ----- #
+
+    @staticmethod
+    def _replayed(interaction: dict) -> Any:
+        if interaction["error"]:
+            raise ReplayedError(interaction["error"])
+        return _decode(interaction["response"]) if interaction["response"] is not None else None
+
+    def call(self, kind: str, request: dict, fn: Callable[[], Any]) -> Any:
+        """`fn()` when recording (which is then recorded), else its recorded response."""
+        if self.recording:
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                self.record(kind, request, time.perf_counter() - start, error=e)
+                raise
+            self.record(kind, request, time.perf_counter() - start, response=result)
+            return result
+
+        interaction = self.next(kind, request)
+        time.sleep(self.delay(interaction["latency"]))
+        return self._replayed(interaction)
+
+    async def acall(self, kind: str, request: dict, fn: Callable[[], Awaitable]) -> Any:
+        if self.recording:
+            start = time.perf_counter()
+            try:
+                result = await fn()
+            except Exception as e:
+                self.record(kind, request, time.perf_counter() - start, error=e)
+                raise
+            self.record(kind, request, time.perf_counter() - start, response=result)
+            return result
+
+        interaction = self.next(kind, request)
+        await asyncio.sleep(self.delay(interaction["latency"]))
+        return self._replayed(interaction)
+
+    def stream(self, kind: str, request: dict, fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Like `call`, for streams: chunks are recorded, and replayed, with their timing."""
+        if self.recording:
+            timer = _ChunkTimer()
+            try:
+                for delta in fn():
+                    timer.chunk(delta)
+                    yield delta
+            except Exception as e:
+                self.record(kind, request, timer.elapsed(), chunks=timer.chunks, error=e)
+                raise
+            self.record(kind, request, timer.elapsed(), chunks=timer.chunks)
+            return
+
+        interaction = self.next(kind, request)
+        for delay, delta in interaction["chunks"]:
+            time.sleep(self.delay(delay))
+            yield delta
+        self._replayed(interaction)
+
+    async def astream(self, kind: str, request: dict, fn: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        if self.recording:
+            timer = _ChunkTimer()
+            try:
+                async for delta in fn():
+                    timer.chunk(delta)
+                    yield delta
+            except Exception as e:
+                self.record(kind, request, timer.elapsed(), chunks=timer.chunks, error=e)
+                raise
+            self.record(kind, request, timer.elapsed(), chunks=timer.chunks)
+            return
+
+        interaction = self.next(kind, request)
+        for delay, delta in interaction["chunks"]:
+            await asyncio.sleep(self.delay(delay))
+            yield delta
+        self._replayed(interaction)
+
+
+class CassetteProxy:
+    """
+    Records or replays calls to the given `methods` of `target` as `kind` interactions; other
+    attributes are passed through to `target` (which isn't needed for replay).
+    Callable arguments (e.g. status callbacks) are passed through but not part of the request.
+    """
+
+    def __init__(self, cassette: Cassette, kind: str, target: Any = None, methods: tuple[str, ...] = ()) -> None:
+        self._cassette = cassette
+        self._kind = kind
+        self._target = target
+        self._methods = methods
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._methods:
+            return partial(self._call, name)
+        if self._target is None:
+            if name == "close":
+                return lambda: None
+            raise AttributeError(f"{self._kind} has no replayable attribute {name!r}")
+        return getattr(self._target, name)
+
+    def _call(self, method: str, *args, **kwargs):
+        request = {"method": method, "args": list(args), "kwargs": {k: v for k, v in kwargs.items() if not callable(v)}}
+        return self._cassette.call(f"{self._kind}.{method}", request, lambda: getattr(self._target, method)(*args, **kwargs))
+
+
+class CassetteLLMClient(BaseLLMClient):
+    """Records the wrapped client's calls (and stream chunk timings), or replays them without it."""
+
+    def __init__(self, cassette: Cassette, client: Optional[BaseLLMClient] = None) -> None:
+        self.cassette = cassette
+        self.client = client
+
+    @staticmethod
+    def _request(prompt: str, model, kwargs: dict) -> dict:
+        return {"prompt": prompt, "model": str(model), "kwargs": kwargs}
+
+    # ----- Sync ----- #
+
+    def generate(self, prompt: str, model, **kwargs):
+        return self.cassette.call("llm.generate", self._request(prompt, model, kwargs), lambda: self.client.generate(prompt, model=model, **kwargs))
+
+    def stream(self, prompt: str, model, **kwargs) -> Iterator[str]:
+        return self.cassette.stream("llm.stream", self._request(prompt, model, kwargs), lambda: self.client.stream(prompt, model=model, **kwargs))
+
+    # ----- Async ----- #
+
+    async def agenerate(self, prompt: str, model, **kwargs):
+        return await self.cassette.acall("llm.generate", self._request(prompt, model, kwargs), lambda: self.client.agenerate(prompt, model=model, **kwargs))
+
+    def astream(self, prompt: str, model, **kwargs) -> AsyncIterator[str]:
+        return self.cassette.astream("llm.stream", self._request(prompt, model, kwargs), lambda: self.client.astream(prompt, model=model, **kwargs))
+
+
+class CassetteLLMFactory:
+    """Drop-in for `LLMClientFactory` (as used by `CoachService`) that goes through a cassette."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+
+    def get(self, model) -> BaseLLMClient:
+        return CassetteLLMClient(self.cassette, LLMClientFactory.get(model) if self.cassette.recording else None)
+
+
+def open_cassette(path: str, mode: str, latency: str = "recorded") -> Cassette:
+    """`latency` is "recorded", "zero", or a scale factor for the recorded latencies (e.g. "0.5")."""
+    scale = {"recorded": 1.0, "zero": 0.0}.get(latency)
+    if scale is None:
+        scale = float(latency)
+    if mode == "replay" and not os.path.exists(path):
+        raise FileNotFoundError(f"No cassette at {path}; record one first")
+    return Cassette(path, mode=mode, latency_scale=scale)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 from enum import StrEnum
 
 class LLModels(StrEnum):
@@ -18,5 +18,15 @@ class BaseLLMClient(ABC):
 
     @abstractmethod
     def stream(self, prompt: str, **kwargs) -> Iterator[str]:
-        """Stream response chunks."""
-        pass
\ No newline at end of file
+        """Yield response text deltas as they arrive."""
+        pass
+
+    @abstractmethod
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Async counterpart of `generate`."""
+        pass
+
+    @abstractmethod
+    def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Async counterpart of `stream`: an async generator of text deltas."""
+        pass
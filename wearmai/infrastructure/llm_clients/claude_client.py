@@ -1,11 +1,17 @@
 from .base import BaseLLMClient
-from streamlit.delta_generator import DeltaGenerator
 import anthropic
-from time import sleep
+from typing import AsyncIterator, Iterator
+from infrastructure.tracing import record_usage
+
+
+def _record_usage(usage) -> None:
+    record_usage(usage.input_tokens, usage.output_tokens, getattr(usage, "cache_read_input_tokens", 0))
+
 
 class ClaudeClient(BaseLLMClient):
     def __init__(self, api_key: str):
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
 
     def generate(self, prompt: str, model: str, **kwargs) -> str:
         response = self.client.messages.create(
@@ -13,18 +19,33 @@ class ClaudeClient(BaseLLMClient):
             messages=[{"role": "user", "content": prompt}],
             **kwargs
         )
+        _record_usage(response.usage)
+        return response.content
+
+    async def agenerate(self, prompt: str, model: str, **kwargs) -> str:
+        response = await self.async_client.messages.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        )
+        _record_usage(response.usage)
         return response.content
 
-    def stream(self, prompt: str, model: str, stream_box: DeltaGenerator, **kwargs) -> str:
-        final_response = ""
+    def stream(self, prompt: str, model: str, **kwargs) -> Iterator[str]:
         with self.client.messages.stream(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             **kwargs
         ) as stream:
-            for text in stream.text_stream:
-                final_response += text
-                sleep(0.002)
-                stream_box.markdown(final_response + "▌")
-        stream_box.markdown(final_response)
-        return final_response
\ No newline at end of file
+            yield from stream.text_stream
+            _record_usage(stream.get_final_message().usage)
+
+    async def astream(self, prompt: str, model: str, **kwargs) -> AsyncIterator[str]:
+        async with self.async_client.messages.stream(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            _record_usage((await stream.get_final_message()).usage)
@@ -1,23 +1,70 @@
 from .base import BaseLLMClient, LLModels
-from typing import Dict
-from .gemini_client import GeminiClient
-from .claude_client import ClaudeClient
-from .openai_client import OpenAIClient
+from .resilience import ResilientLLMClient
+from typing import Callable, Dict
+import threading
 import os
 
 class LLMClientFactory:
-    _registry: Dict[LLModels, BaseLLMClient] = {}
+    """
+    Maps each model to its provider. Provider clients (and their SDKs) are only imported and
+    built the first time one of their models is requested, and are shared by all of its models.
+    Every client is wrapped with rate limiting, retries and a circuit breaker (see `resilience`).
+    """
+    _providers: Dict[str, Callable[[], BaseLLMClient]] = {}
+    _registry: Dict[LLModels, str] = {}
+    _instances: Dict[str, BaseLLMClient] = {}
+    _lock = threading.Lock()
 
     @classmethod
-    def register(cls, model: LLModels, client: BaseLLMClient):
-        cls._registry[model] = client
+    def register_provider(cls, provider: str, factory: Callable[[], BaseLLMClient]) -> None:
+        """Register a constructor; the client is only built the first time it is requested."""
+        with cls._lock:
+            cls._providers[provider] = factory
+            cls._instances.pop(provider, None)
 
     @classmethod
-    def get(cls, model: LLModels) -> BaseLLMClient:
+    def register(cls, model: LLModels, provider: str) -> None:
+        cls._registry[model] = provider
+
+    @classmethod
+    def provider_for(cls, model: LLModels) -> str:
+        if model not in cls._registry:
+            raise ValueError(f"No LLM provider registered for {model}")
         return cls._registry[model]
-    
-LLMClientFactory.register(LLModels.GEMINI_20_FLASH,GeminiClient(os.getenv("GEMINI_API_KEY")))
-LLMClientFactory.register(LLModels.GEMINI_25_FLASH,GeminiClient(os.getenv("GEMINI_API_KEY")))
-LLMClientFactory.register(LLModels.CLAUDE_37_SONNET, ClaudeClient(os.getenv("ANTHROPIC_API_KEY")))
-LLMClientFactory.register(LLModels.O4_MINI, OpenAIClient())
-LLMClientFactory.register(LLModels.GPT_41, OpenAIClient())
\ No newline at end of file
+
+    @classmethod
+    def get(cls, model: LLModels) -> BaseLLMClient:
+        return cls.get_provider(cls.provider_for(model))
+
+    @classmethod
+    def get_provider(cls, provider: str) -> BaseLLMClient:
+        if provider not in cls._providers:
+            raise ValueError(f"No LLM provider registered under {provider}")
+        with cls._lock:
+            if provider not in cls._instances:
+                cls._instances[provider] = ResilientLLMClient(cls._providers[provider](), provider)
+            return cls._instances[provider]
+
+
+def _gemini_client() -> BaseLLMClient:
+    from .gemini_client import GeminiClient
+    return GeminiClient(os.getenv("GEMINI_API_KEY"))
+
+def _claude_client() -> BaseLLMClient:
+    from .claude_client import ClaudeClient
+    return ClaudeClient(os.getenv("ANTHROPIC_API_KEY"))
+
+def _openai_client() -> BaseLLMClient:
+    from .openai_client import OpenAIClient
+    return OpenAIClient()
+
+
+LLMClientFactory.register_provider("gemini", _gemini_client)
+LLMClientFactory.register_provider("anthropic", _claude_client)
+LLMClientFactory.register_provider("openai", _openai_client)
+
+LLMClientFactory.register(LLModels.GEMINI_20_FLASH, "gemini")
+LLMClientFactory.register(LLModels.GEMINI_25_FLASH, "gemini")
+LLMClientFactory.register(LLModels.CLAUDE_37_SONNET, "anthropic")
+LLMClientFactory.register(LLModels.O4_MINI, "openai")
+LLMClientFactory.register(LLModels.GPT_41, "openai")
@@ -2,31 +2,27 @@
 from google import genai
 from google.genai.types import GenerateContentConfig, ThinkingConfig
 from .base import BaseLLMClient, LLModels
-from time import sleep
+from infrastructure.tracing import record_usage
+from typing import AsyncIterator, Iterator
 import structlog
 
 log = structlog.get_logger(__name__)
 
 class GeminiClient(BaseLLMClient):
     def __init__(self, api_key: str):
+        # `client.aio` exposes the async API on the same client
         self.client = genai.Client(api_key=api_key)
 
-    def generate(
-        self,
-        prompt: str,
-        model: LLModels | str,
+    @staticmethod
+    def _config(
         max_output_tokens: int | None = None,
         temperature: float | None = None,
         top_p: float | None = None,
         thinking_budget: int | None = None,
         response_mime_type: str | None = None,
         response_schema: type | None = None,
-    ) -> str | object:
-        """
-        Non-streaming call to Gemini. Wraps all optional parameters into a single config.
-        Returns response.parsed if response_schema provided, else response.text.
-        """
-        # Build config kwargs
+    ) -> GenerateContentConfig:
+        # Build config kwargs; shared by the generate and stream calls so they can't drift apart
         config_kwargs: dict = {}
         if max_output_tokens is not None:
             config_kwargs['max_output_tokens'] = max_output_tokens
@@ -34,13 +30,42 @@ class GeminiClient(BaseLLMClient):
             config_kwargs['temperature'] = temperature
         if top_p is not None:
             config_kwargs['top_p'] = top_p
+        if thinking_budget is not None:
+            config_kwargs['thinking_config'] = ThinkingConfig(thinking_budget=thinking_budget)
+            log.info("thinking_budget_used", budget=thinking_budget)
         if response_mime_type is not None:
             config_kwargs['response_mime_type'] = response_mime_type
         if response_schema is not None:
             config_kwargs['response_schema'] = response_schema
 
         # Instantiate the SDK config
-        config = GenerateContentConfig(**config_kwargs)
+        return GenerateContentConfig(**config_kwargs)
+
+    @staticmethod
+    def _record_usage(usage_metadata) -> None:
+        if usage_metadata is not None:
+            record_usage(
+                usage_metadata.prompt_token_count,
+                usage_metadata.candidates_token_count,
+                usage_metadata.cached_content_token_count,
+            )
+
+    def generate(
+        self,
+        prompt: str,
+        model: LLModels | str,
+        max_output_tokens: int | None = None,
+        temperature: float | None = None,
+        top_p: float | None = None,
+        thinking_budget: int | None = None,
+        response_mime_type: str | None = None,
+        response_schema: type | None = None,
+    ) -> str | object:
+        """
+        Non-streaming call to Gemini. Wraps all optional parameters into a single config.
+        Returns response.parsed if response_schema provided, else response.text.
+        """
+        config = self._config(max_output_tokens, temperature, top_p, thinking_budget, response_mime_type, response_schema)
 
         # Perform the call
         response = self.client.models.generate_content(
@@ -48,53 +73,91 @@ class GeminiClient(BaseLLMClient):
             contents=prompt,
             config=config,
         )
+        self._record_usage(response.usage_metadata)
 
         # Return parsed vs raw text
         if response_schema is not None:
             return response.parsed
         return response.text
 
+    async def agenerate(
+        self,
+        prompt: str,
+        model: LLModels | str,
+        max_output_tokens: int | None = None,
+        temperature: float | None = None,
+        top_p: float | None = None,
+        thinking_budget: int | None = None,
+        response_mime_type: str | None = None,
+        response_schema: type | None = None,
+    ) -> str | object:
+        """
+        Async counterpart of `generate`.
+        """
+        config = self._config(max_output_tokens, temperature, top_p, thinking_budget, response_mime_type, response_schema)
+
+        response = await self.client.aio.models.generate_content(
+            model=(model.value if isinstance(model, LLModels) else model),
+            contents=prompt,
+            config=config,
+        )
+        self._record_usage(response.usage_metadata)
+
+        if response_schema is not None:
+            return response.parsed
+        return response.text
+
     def stream(
         self,
         prompt: str,
         model: LLModels | str,
-        stream_box,
         max_output_tokens: int | None = None,
         temperature: float | None = None,
         top_p: float | None = None,
         thinking_budget: int | None = None
-    ) -> str:
+    ) -> Iterator[str]:
         """
-        Streaming call to Gemini. Writes chunks to stream_box.markdown.
-        Returns the full assembled response string.
+        Streaming call to Gemini. Yields text deltas as they arrive.
         """
-        # Build config kwargs
-        config_kwargs: dict = {}
-        if max_output_tokens is not None:
-            config_kwargs['max_output_tokens'] = max_output_tokens
-        if temperature is not None:
-            config_kwargs['temperature'] = temperature
-        if top_p is not None:
-            config_kwargs['top_p'] = top_p
-        if thinking_budget is not None:
-            config_kwargs['thinking_config'] = ThinkingConfig(thinking_budget=thinking_budget)
-            log.info("thinking_budget_used", budget=thinking_budget)
-
-        config = GenerateContentConfig(**config_kwargs)
+        config = self._config(max_output_tokens, temperature, top_p, thinking_budget)
 
-        final_response = ''
         stream = self.client.models.generate_content_stream(
             model=(model.value if isinstance(model, LLModels) else model),
             contents=prompt,
             config=config,
         )
 
+        # Usage is cumulative; the last chunk carries the totals
+        usage_metadata = None
         for chunk in stream:
+            usage_metadata = chunk.usage_metadata or usage_metadata
+            if chunk.text:
+                yield chunk.text
+        self._record_usage(usage_metadata)
+
+    async def astream(
+        self,
+        prompt: str,
+        model: LLModels | str,
+        max_output_tokens: int | None = None,
+        temperature: float | None = None,
+        top_p: float | None = None,
+        thinking_budget: int | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Async counterpart of `stream`.
+        """
+        config = self._config(max_output_tokens, temperature, top_p, thinking_budget)
+
+        stream = await self.client.aio.models.generate_content_stream(
+            model=(model.value if isinstance(model, LLModels) else model),
+            contents=prompt,
+            config=config,
+        )
+
+        usage_metadata = None
+        async for chunk in stream:
+            usage_metadata = chunk.usage_metadata or usage_metadata
             if chunk.text:
-                final_response += chunk.text
-                # small sleep for smoother cursor effect
-                sleep(0.002)
-                stream_box.markdown(final_response + '▌')
-        # final render without cursor
-        stream_box.markdown(final_response)
-        return final_response
+                yield chunk.text
+        self._record_usage(usage_metadata)
@@ -0,0 +1,333 @@
+import asyncio
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, Optional
+import numpy as np
+from common.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+from .base import LLModels
+from .factory import LLMClientFactory
+import structlog
+
+log = structlog.get_logger(__name__)
+
+PRIMARY, BACKUP = "primary", "backup"
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Fire a request to `backup` if `primary` hasn't streamed its first token after
+    `first_token_timeout` seconds (or right away if the primary fails first). With `adaptive`,
+    the timeout follows the p95 of recently observed primary first-token latencies (a lower
+    bound for primaries the backup beat) once
+    `min_samples` have been seen, never going below `min_timeout`.
+    """
+    primary: LLModels
+    backup: LLModels
+    first_token_timeout: float = 4.0
+    backup_kwargs: Optional[dict] = None
+    adaptive: bool = False
+    min_timeout: float = 1.0
+    min_samples: int = 20
+
+
+@dataclass
+class HedgeMetrics:
+    requests: int = 0
+    hedges_fired: int = 0
+    backup_wins: int = 0
+    failovers: int = 0
+    extra_tokens: int = 0  # estimated prompt + output tokens spent on losing requests
+    primary_first_token: deque = field(default_factory=lambda: deque(maxlen=500))
+
+    def snapshot(self) -> dict:
+        samples = np.array(self.primary_first_token) if self.primary_first_token else np.zeros(1)
+        return {
+            "requests": self.requests,
+            "hedges_fired": self.hedges_fired,
+            "backup_wins": self.backup_wins,
+            "failovers": self.failovers,
+            "extra_tokens": self.extra_tokens,
+            "primary_first_token_p95": float(np.percentile(samples, 95)),
+            "primary_first_token_p99": float(np.percentile(samples, 99)),
+        }
+
+
+class _Race:
+    """Which request won, and what the loser streamed; the loser is accounted for once it has stopped."""
+
+    def __init__(self, streamer: "HedgedStreamer") -> None:
+        self.streamer = streamer
+        self.winner: Optional[str] = None
+        self.streamed_chars = {PRIMARY: 0, BACKUP: 0}
+        self._stopped: set[str] = set()
+        self._settled = False
+        self._lock = threading.Lock()
+
+    def won(self, role: str) -> None:
+        with self._lock:
+            self.winner = role
+            self._settle()
+
+    def stopped(self, role: str) -> None:
+        with self._lock:
+            self._stopped.add(role)
+            self._settle()
+
+    def _settle(self) -> None:
+        loser = BACKUP if self.winner == PRIMARY else PRIMARY
+        if self.winner is not None and loser in self._stopped and not self._settled:
+            self._settled = True
+            self.streamer._record_loser_output(self.streamed_chars[loser])
+
+
+class HedgedStreamer:
+    """
+    Streams from the policy's primary model, hedging with its backup model when the first
+    token is late. Whichever request streams a delta first wins; the other is cancelled and
+    only the winner's deltas are yielded.
+    """
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self.metrics = HedgeMetrics()
+        self._lock = threading.Lock()
+
+    def first_token_timeout(self) -> float:
+        samples = self.metrics.primary_first_token
+        if not self.policy.adaptive or len(samples) < self.policy.min_samples:
+            return self.policy.first_token_timeout
+        return max(self.policy.min_timeout, float(np.percentile(samples, 95)))
+
+    def _request(self, role: str, kwargs: dict) -> tuple[LLModels, dict]:
+        if role == PRIMARY:
+            return self.policy.primary, kwargs
+        # Provider-specific options (e.g. thinking_budget) don't carry over to another model
+        backup_kwargs = self.policy.backup_kwargs
+        if backup_kwargs is None:
+            backup_kwargs = {k: v for k, v in kwargs.items() if k == "temperature"}
+        return self.policy.backup, backup_kwargs
+
+    def _record(self, winner: str, start: float, first_token_at: float, hedged: bool, failover: bool, primary_ended: bool, prompt: str) -> None:
+        with self._lock:
+            self.metrics.requests += 1
+            if hedged:
+                self.metrics.hedges_fired += 1
+                # Both requests paid for the prompt; what the loser streams is added when it ends
+                self.metrics.extra_tokens += estimate_tokens(prompt)
+            if failover:
+                self.metrics.failovers += 1
+            if winner == BACKUP:
+                self.metrics.backup_wins += 1
+            if not primary_ended:
+                # A primary beaten by the backup hadn't streamed yet: its first-token latency is at
+                # least this long. Leaving it out would bias the adaptive p95 low.
+                self.metrics.primary_first_token.append(first_token_at - start)
+        log.info(
+            "llm_hedge_resolved",
+            winner=winner,
+            hedged=hedged,
+            failover=failover,
+            first_token_s=round(first_token_at - start, 3),
+        )
+
+    def _record_loser_output(self, chars: int) -> None:
+        with self._lock:
+            self.metrics.extra_tokens += chars // CHARS_PER_TOKEN
+
+    # ----- Sync ----- #
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        events: queue.Queue = queue.Queue()
+        cancelled = {PRIMARY: threading.Event(), BACKUP: threading.Event()}
+        race = _Race(self)
+
+        def pump(role: str) -> None:
+            model, role_kwargs = self._request(role, kwargs)
+            stream = None
+            try:
+                stream = LLMClientFactory.get(model).stream(prompt, model=model, **role_kwargs)
+                for delta in stream:
+                    race.streamed_chars[role] += len(delta)
+                    if cancelled[role].is_set():
+                        return
+                    events.put((role, "delta", delta))
+                events.put((role, "done", None))
+            except Exception as e:
+                events.put((role, "error", e))
+            finally:
+                if stream is not None and hasattr(stream, "close"):
+                    stream.close()
+                race.stopped(role)
+
+        def start(role: str) -> None:
+            # Carry the caller's context (trace) into the thread
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(pump, role), name=f"llm-hedge-{role}", daemon=True).start()
+
+        start_time = time.monotonic()
+        start(PRIMARY)
+        running = {PRIMARY}
+        hedged = failover = False
+        winner: Optional[str] = None
+        errors: dict[str, Exception] = {}
+        ended: set[str] = set()  # requests that failed or finished without output
+
+        try:
+            # Race until one side streams its first delta
+            while winner is None:
+                timeout = None if hedged else max(0.0, start_time + self.first_token_timeout() - time.monotonic())
+                try:
+                    role, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    hedged = True
+                    start(BACKUP)
+                    running.add(BACKUP)
+                    log.info("llm_hedge_fired", primary=str(self.policy.primary), backup=str(self.policy.backup))
+                    continue
+
+                if kind == "delta":
+                    winner = role
+                    race.won(role)
+                    first_token_at = time.monotonic()
+                    first_delta = payload
+                elif kind == "error" or kind == "done":
+                    # A request that ends without any output can't win; fail over to the other one
+                    running.discard(role)
+                    ended.add(role)
+                    if kind == "error":
+                        errors[role] = payload
+                        log.warning("llm_hedge_request_failed", role=role, error=str(payload))
+                    if not hedged:
+                        hedged = failover = True
+                        start(BACKUP)
+                        running.add(BACKUP)
+                    elif not running:
+                        if errors:
+                            raise errors.get(PRIMARY) or errors[BACKUP]
+                        return
+
+            loser = BACKUP if winner == PRIMARY else PRIMARY
+            cancelled[loser].set()
+            self._record(winner, start_time, first_token_at, hedged, failover, PRIMARY in ended, prompt)
+
+            yield first_delta
+            while True:
+                role, kind, payload = events.get()
+                if role != winner:
+                    continue
+                if kind == "delta":
+                    yield payload
+                elif kind == "error":
+                    raise payload
+                else:
+                    return
+        finally:
+            cancelled[PRIMARY].set()
+            cancelled[BACKUP].set()
+
+    # ----- Async ----- #
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        events: asyncio.Queue = asyncio.Queue()
+        tasks: dict[str, asyncio.Task] = {}
+        race = _Race(self)
+
+        async def pump(role: str) -> None:
+            model, role_kwargs = self._request(role, kwargs)
+            try:
+                async for delta in LLMClientFactory.get(model).astream(prompt, model=model, **role_kwargs):
+                    race.streamed_chars[role] += len(delta)
+                    await events.put((role, "delta", delta))
+                await events.put((role, "done", None))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await events.put((role, "error", e))
+            finally:
+                race.stopped(role)
+
+        def start(role: str) -> None:
+            tasks[role] = asyncio.create_task(pump(role))
+
+        start_time = time.monotonic()
+        start(PRIMARY)
+        hedged = failover = False
+        winner: Optional[str] = None
+        errors: dict[str, Exception] = {}
+        ended: set[str] = set()  # requests that failed or finished without output
+
+        try:
+            while winner is None:
+                timeout = None if hedged else max(0.0, start_time + self.first_token_timeout() - time.monotonic())
+                try:
+                    role, kind, payload = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    hedged = True
+                    start(BACKUP)
+                    log.info("llm_hedge_fired", primary=str(self.policy.primary), backup=str(self.policy.backup))
+                    continue
+
+                if kind == "delta":
+                    winner = role
+                    race.won(role)
+                    first_token_at = time.monotonic()
+                    first_delta = payload
+                else:
+                    ended.add(role)
+                    if kind == "error":
+                        errors[role] = payload
+                        log.warning("llm_hedge_request_failed", role=role, error=str(payload))
+                    if not hedged:
+                        hedged = failover = True
+                        start(BACKUP)
+                    elif all(task.done() for task in tasks.values()) and events.empty():
+                        if errors:
+                            raise errors.get(PRIMARY) or errors[BACKUP]
+                        return
+
+            loser = BACKUP if winner == PRIMARY else PRIMARY
+            if loser in tasks:
+                tasks[loser].cancel()
+            self._record(winner, start_time, first_token_at, hedged, failover, PRIMARY in ended, prompt)
+
+            yield first_delta
+            while True:
+                role, kind, payload = await events.get()
+                if role != winner:
+                    continue
+                if kind == "delta":
+                    yield payload
+                elif kind == "error":
+                    raise payload
+                else:
+                    return
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+
+def load_hedge_policies() -> dict[LLModels, HedgePolicy]:
+    """
+    Policies from the LLM_HEDGING env var, keyed by primary model, e.g.
+    '{"gemini-2.5-flash-preview-04-17": {"backup": "gemini-2.0-flash", "first_token_timeout": 4, "adaptive": true}}'.
+    """
+    policies = {}
+    for primary, value in json.loads(os.getenv("LLM_HEDGING", "{}")).items():
+        value = dict(value)
+        backup = LLModels(value.pop("backup"))
+        policies[LLModels(primary)] = HedgePolicy(primary=LLModels(primary), backup=backup, **value)
+    return policies
+
+
+@lru_cache(maxsize=None)
+def hedged_streamers() -> dict[LLModels, HedgedStreamer]:
+    # Shared across sessions so the adaptive thresholds and metrics see all traffic
+    return {model: HedgedStreamer(policy) for model, policy in load_hedge_policies().items()}
@@ -1,11 +1,19 @@
 from .base import BaseLLMClient
-from streamlit.delta_generator import DeltaGenerator
-from openai import OpenAI
-from time import sleep
+from openai import AsyncOpenAI, OpenAI
+from typing import AsyncIterator, Iterator
+from infrastructure.tracing import record_usage
+
+
+def _record_usage(usage) -> None:
+    if usage is not None:
+        details = getattr(usage, "input_tokens_details", None)
+        record_usage(usage.input_tokens, usage.output_tokens, getattr(details, "cached_tokens", 0))
+
 
 class OpenAIClient(BaseLLMClient):
     def __init__(self):
         self.client = OpenAI()
+        self.async_client = AsyncOpenAI()
 
     def generate(self, prompt: str, model: str, **kwargs) -> str:
         response = self.client.responses.create(
@@ -18,10 +26,24 @@ class OpenAIClient(BaseLLMClient):
                 ]}],
             **kwargs
         )
+        _record_usage(response.usage)
         return response.output_text
 
-    def stream(self, prompt: str, model: str, stream_box: DeltaGenerator, **kwargs) -> str:
-        final_response = ""
+    async def agenerate(self, prompt: str, model: str, **kwargs) -> str:
+        response = await self.async_client.responses.create(
+            model=model,
+            input=[{"role": "developer", "content": [
+                    {
+                    "type": "input_text",
+                    "text": prompt
+                    }
+                ]}],
+            **kwargs
+        )
+        _record_usage(response.usage)
+        return response.output_text
+
+    def stream(self, prompt: str, model: str, **kwargs) -> Iterator[str]:
         stream = self.client.responses.create(
             model=model,
             input=[{"role": "developer", "content": prompt}],
@@ -30,8 +52,65 @@ class OpenAIClient(BaseLLMClient):
         )
         for event in stream:
             if event.type == "response.output_text.delta" and event.delta:
-                final_response += event.delta
-                sleep(0.002)
-                stream_box.markdown(final_response + "▌")
-        stream_box.markdown(final_response)
-        return final_response
\ No newline at end of file
+                yield event.delta
+            elif event.type == "response.completed":
+                _record_usage(event.response.usage)
+
+    async def astream(self, prompt: str, model: str, **kwargs) -> AsyncIterator[str]:
+        stream = await self.async_client.responses.create(
+            model=model,
+            input=[{"role": "developer", "content": prompt}],
+            stream=True,
+            **kwargs
+        )
+        async for event in stream:
+            if event.type == "response.output_text.delta" and event.delta:
+                yield event.delta
+            elif event.type == "response.completed":
+                _record_usage(event.response.usage)
+
+    def stream_chat(self, messages: list[dict], model: str, functions: list | None = None) -> Iterator[dict]:
+        """
+        Streams a chat completion as events: {'message': delta} for each text delta, then
+        {'function_call': {'name', 'arguments'}} if the model called a function, then {'completed': True}.
+        """
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            functions=functions or [],
+            function_call="auto",
+            stream=True  # Enable streaming
+        )
+
+        accumulated_arguments = ""
+        func_name = ""
+        function_call = None
+        for chunk in response:
+            if chunk.choices:
+                delta = chunk.choices[0].delta
+                content = delta.content
+                function_call = delta.function_call
+
+                # Check if there's a function call
+                if function_call:
+                    func_arguments = function_call.arguments
+                    if(function_call.name):
+                        func_name = function_call.name
+
+                    # Accumulate function call arguments
+                    if func_arguments:
+                        accumulated_arguments += func_arguments
+
+                if content:
+                    yield {'message': content}
+
+        # If the function name is present, the function call is complete
+        if func_name != "":
+            # Forward the function call details to the frontend
+            full_function_call_definition = {
+                'name': func_name,
+                'arguments': accumulated_arguments
+            }
+            yield {'function_call': full_function_call_definition}
+
+        yield {'completed': True}
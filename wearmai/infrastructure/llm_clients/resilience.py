@@ -0,0 +1,369 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional
+import numpy as np
+from common.utils.tokens import estimate_tokens
+from infrastructure.tracing import current_span, tracer
+from .base import BaseLLMClient
+import structlog
+
+log = structlog.get_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rpm: Optional[int] = None  # requests per minute
+    tpm: Optional[int] = None  # tokens (prompt + requested output) per minute
+
+
+# Defaults per provider and per model (model limits apply on top of the provider's).
+# Override with the LLM_RATE_LIMITS env var, e.g. '{"gemini-2.0-flash": {"rpm": 15, "tpm": 1000000}}'.
+DEFAULT_RATE_LIMITS: dict[str, RateLimit] = {
+    "gemini-2.5-flash-preview-04-17": RateLimit(rpm=1000, tpm=1_000_000),
+    "gemini-2.0-flash": RateLimit(rpm=2000, tpm=4_000_000),
+    "gpt-4.1": RateLimit(rpm=500, tpm=30_000),
+    "o4-mini": RateLimit(rpm=500, tpm=200_000),
+    "claude-3-7-sonnet-20250219": RateLimit(rpm=50, tpm=20_000),
+}
+
+
+def load_rate_limits() -> dict[str, RateLimit]:
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for key, value in json.loads(os.getenv("LLM_RATE_LIMITS", "{}")).items():
+        limits[key] = RateLimit(**value)
+    return limits
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`, holding at most one minute's worth.
+    Callers reserve tokens up front and are told how long to wait for them, so waiters are
+    served in arrival order at exactly the refill rate instead of polling (or failing).
+    """
+
+    def __init__(self, rate_per_minute: float) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for `reset_timeout`
+    seconds; then lets a single trial call through (half-open) and closes again if it succeeds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError(f"Circuit for {self.name} is open; not calling the provider")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                log.info("llm_circuit_closed", circuit=self.name)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Forget an in-flight trial call that ended without a verdict (closed or cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                log.warning("llm_circuit_opened", circuit=self.name, failures=self._failures)
+
+
+class ResilienceMetrics:
+    """Rolling queue-wait samples (seconds spent waiting on rate limits) and counters."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self.queue_waits: deque[float] = deque(maxlen=window)
+        self.counters: dict[str, int] = {"calls": 0, "retries": 0, "failures": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.queue_waits.append(seconds)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = np.array(self.queue_waits) if self.queue_waits else np.zeros(1)
+            return {
+                **self.counters,
+                "queue_wait_p50": float(np.percentile(waits, 50)),
+                "queue_wait_p95": float(np.percentile(waits, 95)),
+                "queue_wait_max": float(waits.max()),
+            }
+
+
+def is_retryable(error: Exception) -> bool:
+    # SDK-agnostic: openai/anthropic errors carry `status_code`, google-genai errors carry `code`
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    name = type(error).__name__
+    return "Connection" in name or "Timeout" in name
+
+
+class ResilientLLMClient(BaseLLMClient):
+    """
+    Wraps a provider client with per-provider and per-model token-bucket rate limits (requests
+    and tokens per minute), a circuit breaker per provider, and jittered exponential retries of
+    retryable errors. Streams are only retried before their first delta has been yielded.
+    Attributes not defined here (e.g. `stream_chat`) are delegated to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        provider: str,
+        rate_limits: Optional[dict[str, RateLimit]] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        default_output_tokens: int = 1024,
+    ) -> None:
+        self.client = client
+        self.provider = provider
+        self.rate_limits = rate_limits if rate_limits is not None else load_rate_limits()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.default_output_tokens = default_output_tokens
+        self.breaker = CircuitBreaker(provider)
+        self.metrics = ResilienceMetrics()
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    # ----- Rate limiting ----- #
+
+    def _bucket(self, key: str, kind: str) -> Optional[TokenBucket]:
+        limit = self.rate_limits.get(key)
+        rate = getattr(limit, kind, None) if limit else None
+        if not rate:
+            return None
+        with self._buckets_lock:
+            if (key, kind) not in self._buckets:
+                self._buckets[(key, kind)] = TokenBucket(rate)
+            return self._buckets[(key, kind)]
+
+    def _reserve(self, prompt: str, model, kwargs: dict) -> float:
+        output_tokens = kwargs.get("max_output_tokens") or kwargs.get("max_tokens") or self.default_output_tokens
+        tokens = estimate_tokens(prompt) + output_tokens
+        wait = 0.0
+        for key in (self.provider, str(model)):
+            for kind, amount in (("rpm", 1), ("tpm", tokens)):
+                bucket = self._bucket(key, kind)
+                if bucket:
+                    wait = max(wait, bucket.reserve(amount))
+        self.metrics.record_wait(wait)
+        span = current_span()
+        if span:
+            span.add("llm.queue_wait_s", round(wait, 3))
+        if wait > 0:
+            log.info("llm_rate_limit_wait", provider=self.provider, model=str(model), wait_s=round(wait, 3))
+        return wait
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _should_retry(self, error: Exception, attempt: int, model) -> bool:
+        self.metrics.incr("failures")
+        if not is_retryable(error):
+            # Bad requests and the like say nothing about the provider's health
+            self.breaker.release()
+            return False
+        self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return False
+        self.metrics.incr("retries")
+        span = current_span()
+        if span:
+            span.add("llm.retries", 1)
+        log.warning("llm_call_retry", provider=self.provider, model=str(model), attempt=attempt + 1, error=str(error))
+        return True
+
+    def _before_call(self) -> None:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.metrics.incr("rejected")
+            raise
+        self.metrics.incr("calls")
+
+    def _acquire(self, prompt: str, model, kwargs: dict) -> None:
+        # An open circuit rejects the attempt before it takes (and waits for) rate-limit capacity;
+        # every attempt that does go out is a full request, so each one takes its share
+        self._before_call()
+        time.sleep(self._reserve(prompt, model, kwargs))
+
+    async def _aacquire(self, prompt: str, model, kwargs: dict) -> None:
+        self._before_call()
+        try:
+            await asyncio.sleep(self._reserve(prompt, model, kwargs))
+        except asyncio.CancelledError:
+            # Cancelled while queued: a half-open trial call never went out
+            self.breaker.release()
+            raise
+
+    def _span(self, operation: str, model):
+        # One span per logical call (rate-limit waits and retries included); provider clients add token usage to it
+        return tracer.span(f"llm.{operation}", **{"gen_ai.system": self.provider, "gen_ai.request.model": str(model)})
+
+    # ----- Sync ----- #
+
+    def generate(self, prompt: str, model, **kwargs):
+        with self._span("generate", model):
+            return self._generate(prompt, model, **kwargs)
+
+    def stream(self, prompt: str, model, **kwargs) -> Iterator[str]:
+        with self._span("stream", model):
+            yield from self._stream(prompt, model, **kwargs)
+
+    def _generate(self, prompt: str, model, **kwargs):
+        attempt = 0
+        while True:
+            self._acquire(prompt, model, kwargs)
+            try:
+                result = self.client.generate(prompt, model=model, **kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt, model):
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _stream(self, prompt: str, model, **kwargs) -> Iterator[str]:
+        attempt = 0
+        while True:
+            self._acquire(prompt, model, kwargs)
+            started = False
+            try:
+                for delta in self.client.stream(prompt, model=model, **kwargs):
+                    started = True
+                    yield delta
+            except Exception as e:
+                if started or not self._should_retry(e, attempt, model):
+                    if started:
+                        self.breaker.record_failure()
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # Consumer closed the stream early, or the task was cancelled
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return
+
+    # ----- Async ----- #
+
+    async def agenerate(self, prompt: str, model, **kwargs):
+        with self._span("generate", model):
+            return await self._agenerate(prompt, model, **kwargs)
+
+    async def astream(self, prompt: str, model, **kwargs) -> AsyncIterator[str]:
+        with self._span("stream", model):
+            async for delta in self._astream(prompt, model, **kwargs):
+                yield delta
+
+    async def _agenerate(self, prompt: str, model, **kwargs):
+        attempt = 0
+        while True:
+            await self._aacquire(prompt, model, kwargs)
+            try:
+                result = await self.client.agenerate(prompt, model=model, **kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt, model):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def _astream(self, prompt: str, model, **kwargs) -> AsyncIterator[str]:
+        attempt = 0
+        while True:
+            await self._aacquire(prompt, model, kwargs)
+            started = False
+            try:
+                async for delta in self.client.astream(prompt, model=model, **kwargs):
+                    started = True
+                    yield delta
+            except Exception as e:
+                if started or not self._should_retry(e, attempt, model):
+                    if started:
+                        self.breaker.record_failure()
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # Consumer closed the stream early, or the task was cancelled
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return
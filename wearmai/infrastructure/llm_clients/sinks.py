@@ -0,0 +1,116 @@
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, Callable, Iterable, TextIO
+
+
+class StreamSink(ABC):
+    """
+    Renders a stream of text deltas. Deltas are buffered and handed to `_render` in batches:
+    the first delta immediately (time to first token), then whenever `max_interval` seconds
+    have passed or `max_chars` characters are pending, and once more on `close`. Nothing sleeps.
+    """
+
+    def __init__(self, max_interval: float = 0.05, max_chars: int = 512) -> None:
+        self.max_interval = max_interval
+        self.max_chars = max_chars
+        self._parts: list[str] = []
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._last_flush: float | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def write(self, delta: str) -> None:
+        if not delta:
+            return
+        self._parts.append(delta)
+        self._pending.append(delta)
+        self._pending_chars += len(delta)
+
+        now = time.monotonic()
+        if (
+            self._last_flush is None
+            or now - self._last_flush >= self.max_interval
+            or self._pending_chars >= self.max_chars
+        ):
+            self.flush(now)
+
+    def flush(self, now: float | None = None) -> None:
+        if self._pending:
+            self._render("".join(self._pending), final=False)
+            self._pending.clear()
+            self._pending_chars = 0
+        self._last_flush = now if now is not None else time.monotonic()
+
+    def close(self) -> str:
+        """Render whatever is still pending as the final output and return the full text."""
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        self._render(text, final=True)
+        return self.text
+
+    @abstractmethod
+    def _render(self, batch: str, final: bool) -> None:
+        """Render a batch of new text; `final` is set on the last call."""
+        pass
+
+
+class StreamlitSink(StreamSink):
+    """
+    Renders into a Streamlit placeholder (e.g. `st.empty()`). `markdown` replaces the whole
+    element, so the full text is re-sent on each render; batching bounds how often that happens.
+    """
+
+    def __init__(self, container, cursor: str = "▌", max_interval: float = 0.1, max_chars: int = 2048) -> None:
+        super().__init__(max_interval=max_interval, max_chars=max_chars)
+        self.container = container
+        self.cursor = cursor
+
+    def _render(self, batch: str, final: bool) -> None:
+        self.container.markdown(self.text if final else self.text + self.cursor)
+
+
+class SSESink(StreamSink):
+    """
+    Emits Server-Sent Events through `send` (e.g. a queue feeding a `StreamingHttpResponse`):
+    one `data:` event per batch, then a `done` event.
+    """
+
+    def __init__(self, send: Callable[[str], None], max_interval: float = 0.05, max_chars: int = 512) -> None:
+        super().__init__(max_interval=max_interval, max_chars=max_chars)
+        self.send = send
+
+    def _render(self, batch: str, final: bool) -> None:
+        if batch:
+            self.send(f"data: {json.dumps({'delta': batch})}\n\n")
+        if final:
+            self.send("event: done\ndata: {}\n\n")
+
+
+class StdoutSink(StreamSink):
+    def __init__(self, stream: TextIO = sys.stdout, max_interval: float = 0.05, max_chars: int = 512) -> None:
+        super().__init__(max_interval=max_interval, max_chars=max_chars)
+        self.stream = stream
+
+    def _render(self, batch: str, final: bool) -> None:
+        self.stream.write(batch + ("\n" if final else ""))
+        self.stream.flush()
+
+
+def consume(deltas: Iterable[str], sink: StreamSink) -> str:
+    """Drain a delta stream into a sink and return the full text."""
+    for delta in deltas:
+        sink.write(delta)
+    return sink.close()
+
+
+async def aconsume(deltas: AsyncIterable[str], sink: StreamSink) -> str:
+    """Async counterpart of `consume`."""
+    async for delta in deltas:
+        sink.write(delta)
+    return sink.close()
@@ -29,6 +29,7 @@ def configure_logging():
     # =========================================================================
     structlog.configure(
         processors=[
+            structlog.contextvars.merge_contextvars,       # request context, e.g. the coach turn's trace_id
             structlog.stdlib.filter_by_level,              # respect stdlib levels
             structlog.stdlib.add_logger_name,              # logger name
             structlog.stdlib.add_log_level,                # level
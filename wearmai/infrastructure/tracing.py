@@ -0,0 +1,227 @@
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional
+import numpy as np
+import structlog
+
+log = structlog.get_logger(__name__)
+
+SERVICE_NAME = "wearmai-coach"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds, or so far if the span is still open."""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: int | float) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_otlp(self) -> dict:
+        """The span in OTLP/JSON form (as in an `ExportTraceServiceRequest`)."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _from_otlp_value(value: dict) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "arrayValue" in value:
+        return [_from_otlp_value(v) for v in value["arrayValue"].get("values", [])]
+    return next(iter(value.values()), None)
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        pass
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """
+    Appends one OTLP/JSON `ExportTraceServiceRequest` per line, which the OpenTelemetry
+    Collector's `otlpjsonfile` receiver (and `load_spans`) can read back.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }
+        line = json.dumps(request, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class SpanStats:
+    """Rolling span durations per span name, for percentiles without an external backend."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self._durations: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self._durations[span.name].append(span.duration)
+
+    def percentiles(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: summarize_durations(list(durations)) for name, durations in sorted(self._durations.items())}
+
+
+def summarize_durations(durations: list[float]) -> dict:
+    values = np.array(durations)
+    return {
+        "count": len(durations),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+class Tracer:
+    """
+    Minimal in-process tracer. Spans nest through a context variable, so they follow the
+    current thread / asyncio task (use `in_current_context` to carry them into worker threads).
+    A span without a parent starts a new trace, whose id is bound into structlog's context
+    for every log line emitted inside it. Finished spans go to the exporters and `stats`.
+    """
+
+    def __init__(self, exporters: Optional[Iterable[SpanExporter]] = None, window: int = 1000) -> None:
+        self.exporters = list(exporters or [])
+        self.stats = SpanStats(window)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        log_tokens = structlog.contextvars.bind_contextvars(trace_id=span.trace_id) if parent is None else None
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            try:
+                _current_span.reset(token)
+                if log_tokens:
+                    structlog.contextvars.reset_contextvars(**log_tokens)
+            except ValueError:
+                # A generator finished in another context than it started in; nothing to restore
+                pass
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        self.stats.record(span)
+        for exporter in self.exporters:
+            try:
+                exporter.export([span])
+            except Exception as e:
+                log.warning("span_export_failed", exporter=type(exporter).__name__, error=str(e))
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def record_usage(input_tokens: Optional[int], output_tokens: Optional[int], cached_tokens: Optional[int] = None) -> None:
+    """Add a provider response's token usage to the current span (if any)."""
+    span = _current_span.get()
+    if span is None:
+        return
+    span.add("gen_ai.usage.input_tokens", input_tokens or 0)
+    span.add("gen_ai.usage.output_tokens", output_tokens or 0)
+    span.add("gen_ai.usage.cached_input_tokens", cached_tokens or 0)
+
+
+def in_current_context(fn: Callable) -> Callable:
+    """Wrap `fn` to run in a copy of the caller's context, e.g. before submitting it to a thread pool."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+def load_spans(path: str) -> list[dict]:
+    """Spans from an OTLP/JSON lines file as dicts with `name`, `duration` (s), `trace_id` and `attributes`."""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        spans.append({
+                            "name": span["name"],
+                            "trace_id": span["traceId"],
+                            "duration": (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e9,
+                            "attributes": {a["key"]: _from_otlp_value(a["value"]) for a in span.get("attributes", [])},
+                        })
+    return spans
+
+
+# Set TRACE_EXPORT_PATH to also append finished spans to a local OTLP/JSON lines file
+tracer = Tracer([JsonLinesSpanExporter(os.environ["TRACE_EXPORT_PATH"])] if os.getenv("TRACE_EXPORT_PATH") else [])
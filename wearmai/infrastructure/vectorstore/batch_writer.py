@@ -0,0 +1,121 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchWriterConfig:
+    batch_size: int = 100
+    concurrency: int = 2
+    max_retries: int = 5
+    backoff_base: float = 1.0
+    backoff_max: float = 30.0
+
+
+@dataclass
+class BatchWriteResult:
+    inserted: int = 0
+    batches: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def has_failures(self) -> bool:
+        return bool(self.failed)
+
+
+class BatchWriter:
+    """
+    Writes data objects to a Weaviate collection in fixed-size batches, with a
+    bounded number of batches in flight. Objects rejected by the server (or whole
+    batches that fail in transport) are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        collection,
+        config: BatchWriterConfig = BatchWriterConfig(),
+        progress_callback: Optional[Callable[[BatchWriteResult], None]] = None,
+    ) -> None:
+        self.collection = collection
+        self.config = config
+        self.progress_callback = progress_callback
+        self._result = BatchWriteResult()
+        self._result_lock = threading.Lock()
+
+    def write(self, objects: Iterable) -> BatchWriteResult:
+        max_in_flight = self.config.concurrency * 2
+        pending: set[Future] = set()
+
+        with ThreadPoolExecutor(max_workers=self.config.concurrency) as executor:
+            for index, batch in enumerate(self._iter_batches(objects)):
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(self._write_batch, index, batch))
+
+            for future in pending:
+                future.result()
+
+        log.info(
+            "batch_write_finished",
+            inserted=self._result.inserted,
+            failed=len(self._result.failed),
+            batches=self._result.batches,
+        )
+        return self._result
+
+    def _iter_batches(self, objects: Iterable) -> Iterator[list]:
+        iterator = iter(objects)
+        while batch := list(islice(iterator, self.config.batch_size)):
+            yield batch
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt)
+        return random.uniform(0, delay)
+
+    def _write_batch(self, index: int, batch: list) -> None:
+        remaining = batch
+        errors: dict[str, str] = {}
+        for attempt in range(self.config.max_retries + 1):
+            if attempt:
+                time.sleep(self._backoff(attempt - 1))
+            try:
+                response = self.collection.data.insert_many(remaining)
+            except Exception as e:
+                log.warning("batch_insert_failed", batch=index, attempt=attempt, error=str(e))
+                errors = {str(obj.uuid): str(e) for obj in remaining}
+                continue
+
+            errors = {str(remaining[i].uuid): err.message for i, err in response.errors.items()}
+            remaining = [remaining[i] for i in response.errors]
+            if not remaining:
+                break
+            log.warning("batch_objects_rejected", batch=index, attempt=attempt, rejected=len(remaining))
+
+        failed = [(uuid, errors[uuid]) for uuid in (str(obj.uuid) for obj in remaining)]
+        self._record(index, inserted=len(batch) - len(failed), failed=failed)
+
+    def _record(self, index: int, inserted: int = 0, failed: list | None = None) -> None:
+        with self._result_lock:
+            self._result.inserted += inserted
+            self._result.batches += 1
+            if failed:
+                self._result.failed.extend(failed)
+            log.info(
+                "vectorstore_batch_committed",
+                batch=index,
+                inserted=inserted,
+                failed=len(failed or []),
+                total_inserted=self._result.inserted,
+            )
+            if self.progress_callback:
+                self.progress_callback(self._result)
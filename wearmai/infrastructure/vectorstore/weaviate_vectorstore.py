@@ -1,9 +1,10 @@
 from .base import VecStore, VectorEntry
+from .batch_writer import BatchWriter, BatchWriterConfig, BatchWriteResult
 import weaviate
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 import weaviate.classes as wvc
 from weaviate.util import generate_uuid5
-from weaviate.classes.query import HybridFusion
+from weaviate.classes.query import HybridFusion, Filter
 from wearmai.settings import WEAVIATE_URL, WEAVIATE_API_KEY, VOYAGEAI_API_KEY
 import structlog
 
@@ -75,26 +76,43 @@ class WeaviateVecStore(VecStore):
         log.info("vectorstore_collection_created", vs_name=self.vs_name)
         return new_vec_store
 
-    def format_chunks(self, chunks: list) -> list[dict]: 
-        
-        chunk_objects = list()
+    @staticmethod
+    def chunk_id(text: str) -> str:
+        """
+        Deterministic object id for a chunk, derived from a hash of its content.
+        """
+        return generate_uuid5({"content": text})
 
-        for i in range(len(chunks)):
-            properties = {"content": chunks[i].text}
-            data_object = wvc.data.DataObject(
-                properties=properties,
-                uuid=generate_uuid5(properties)
+    def iter_chunk_objects(self, chunks: Iterable) -> Iterator[wvc.data.DataObject]:
+        for chunk in chunks:
+            yield wvc.data.DataObject(
+                properties={"content": chunk.text},
+                uuid=self.chunk_id(chunk.text)
             )
-            chunk_objects.append(data_object)
-        
-        return chunk_objects
+
+    def format_chunks(self, chunks: list) -> list[dict]: 
+        return list(self.iter_chunk_objects(chunks))
     
-    def add_items(self, chunks: List):
+    def add_items(
+        self,
+        chunks: Iterable,
+        config: BatchWriterConfig = BatchWriterConfig(),
+        progress_callback: Optional[Callable[[BatchWriteResult], None]] = None,
+    ) -> BatchWriteResult:
+        """
+        Insert chunks in batches of `config.batch_size`, with up to `config.concurrency`
+        batches in flight. Chunks can be any iterable, so callers can stream them in.
 
-        chunk_objects = self.format_chunks(chunks)
-        insertion_response = self.vectorstore.data.insert_many(chunk_objects)
+        Args:
+            chunks (Iterable): Chunks exposing a `text` attribute.
+            config (BatchWriterConfig): Batch size, concurrency and retry settings.
+            progress_callback (Callable): Called with the running result after every batch.
+        """
+        writer = BatchWriter(self.vectorstore, config, progress_callback)
+        result = writer.write(self.iter_chunk_objects(chunks))
 
-        log.info("added_items_to_vectorstore", chunk_count=len(chunk_objects), insertion_response=insertion_response)
+        log.info("added_items_to_vectorstore", inserted=result.inserted, failed=len(result.failed))
+        return result
 
     def get(
         self,
@@ -121,16 +139,32 @@ class WeaviateVecStore(VecStore):
 
         return self._format_search_results(rs)
 
-    def delete_items(self, ids: list = None) -> None:
+    def get_ids(self) -> set[str]:
+        """
+        Get the ids of every object in the collection, without fetching their properties or vectors.
+        """
+        return {
+            str(obj.uuid)
+            for obj in self.vectorstore.iterator(return_properties=[], cache_size=1000)
+        }
+
+    def delete_items(self, ids: list = None, batch_size: int = 1000) -> None:
         """
-        Delete items from a vector store given ids
+        Delete items from a vector store given ids, using one filter-based delete per batch of ids
 
         Args:
             ids (list): Alist of item IDs corresponding to each item that is desired to be deleted.
+            batch_size (int): Maximum number of ids matched by a single delete request.
         """
-        if ids:
-            for uuid in ids:
-                self.vectorstore.data.delete_by_id(uuid)
+        if not ids:
+            return
+
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            result = self.vectorstore.data.delete_many(
+                where=Filter.by_id().contains_any(batch)
+            )
+            log.info("deleted_items_from_vectorstore", matches=result.matches, successful=result.successful, failed=result.failed)
 
     
     ## ----- Semantic Search & Hybrid Search ----- ##
@@ -1,4 +1,5 @@
-from typing import List
+from collections import defaultdict
+from typing import List, Optional
 from core.models import ExerciseUnit, Soleus, Pelvis, PelvisRightSide, PelvisLeftSide, TibialisAnteriorLeftSide, TibialisAnteriorRightSide, MedialGastrocnemiusLeftSide, MedialGastrocnemiusRightSide, LateralGastrocnemiusLeftSide, LateralGastrocnemiusRightSide
 from core.models import SoleusLeftSide, SoleusRightSide, TibialisAnterior, MedialGastrocnemius, LateralGastrocnemius, Hip, Knee, Ankle, HipRightSide, HipLeftSide, KneeRightSide, KneeLeftSide, AnkleRightSide, AnkleLeftSide
 from common.utils.stats import get_summary
@@ -46,44 +47,64 @@ def aggregate_summaries(summaries):
                     aggregated_summary[body_part][side][col][key] = round(value, percision)
     return aggregated_summary
 
+def snake_case(name: str) -> str:
+    # Title case to snake case
+    return ''.join(['_' + i.lower() if i.isupper() else i for i in name]).lstrip('_')
+
+
+def load_side_values(exercise_units: List[ExerciseUnit]) -> dict:
+    """
+    Left/right side rows of every body part for all `exercise_units` at once, grouped by unit:
+    {unit_id: {side_class_name: [(col values...), ...]}}. Two queries per body part, however many units.
+    """
+    unit_ids = [exercise_unit.id for exercise_unit in exercise_units]
+    side_values = defaultdict(lambda: defaultdict(list))
+    for body_part, cols in BODY_PARTS_TO_COLS.items():
+        body_part_name = snake_case(body_part.__name__)
+        for side in ("LeftSide", "RightSide"):
+            # get the actual class from the class name string
+            side_class = globals()[f"{body_part.__name__}{side}"]
+            rows = (
+                side_class.objects
+                .filter(**{f"{body_part_name}__gait_phase__exercise_unit_id__in": unit_ids})
+                .order_by("pk")
+                .values_list(f"{body_part_name}__gait_phase__exercise_unit_id", *cols)
+            )
+            for unit_id, *values in rows:
+                side_values[unit_id][side_class.__name__].append(values)
+    return side_values
+
+
 class ExerciseSummaryService():
-    def __init__(self, exercise_units: List[ExerciseUnit]):
+    def __init__(self, exercise_units: List[ExerciseUnit], side_values: Optional[dict] = None):
+        """`side_values` from `load_side_values` can be shared between services over the same units."""
         self.exercise_units = exercise_units
+        self.side_values = side_values
 
     def run(self, aggregate = False):
+        side_values = self.side_values if self.side_values is not None else load_side_values(self.exercise_units)
         summaries = []
         for exercise_unit in self.exercise_units:
-            gait_phases = exercise_unit.gait_phases.all()
+            unit_values = side_values.get(exercise_unit.id, {})
             for body_part, cols in BODY_PARTS_TO_COLS.items():
-                main_body_parts = body_part.objects.filter(gait_phase__in=gait_phases)
-                body_part_name = body_part.__name__
                 left_side_class_name = f"{body_part.__name__}LeftSide"
                 right_side_class_name = f"{body_part.__name__}RightSide"
-                # get the actual class from teh class name string
-                left_side_class = globals()[left_side_class_name]
-                right_side_class = globals()[right_side_class_name]
-
-                # use the bodypart class name as the query parameter
-                # Title case to snake case
-                body_part_name = ''.join(['_' + i.lower() if i.isupper() else i for i in body_part_name]).lstrip('_')
-        
-
-                left_side = left_side_class.objects.filter(**{f"{body_part_name}__in": main_body_parts})
-                right_side = right_side_class.objects.filter(**{f"{body_part_name}__in": main_body_parts})
+                left_side = unit_values.get(left_side_class_name, [])
+                right_side = unit_values.get(right_side_class_name, [])
 
                 summary = {
                     body_part.__name__: {
                         left_side_class_name: {
-                            col: get_summary([getattr(left, col) for left in left_side])
-                            for col in cols
+                            col: get_summary([left[i] for left in left_side])
+                            for i, col in enumerate(cols)
                         },
                         right_side_class_name: {
-                            col: get_summary([getattr(right, col) for right in right_side])
-                            for col in cols
+                            col: get_summary([right[i] for right in right_side])
+                            for i, col in enumerate(cols)
                         }
                 }}
                 summaries.append(summary)
 
         if aggregate:
             return aggregate_summaries(summaries)
-        return summaries
\ No newline at end of file
+        return summaries
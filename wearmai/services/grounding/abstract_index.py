@@ -0,0 +1,204 @@
+import gzip
+import json
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+import numpy as np
+import structlog
+
+log = structlog.get_logger(__name__)
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# A small stop-word list keeps BM25 postings short; scientific terms are never in it
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were with "
+    "we our can may not than these those which who what how does do did".split()
+)
+
+Embedder = Callable[[list[str]], np.ndarray]
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class HashingEmbedder:
+    """
+    Offline embedder: hashes word unigrams and character trigrams into a fixed-size, L2-normalised
+    vector. It needs no model download, and complements BM25 by matching inflections and partial
+    terms ("tendinopathy" / "tendon"). Any callable mapping texts to an (n, dim) array can be used instead.
+    """
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                vectors[row, zlib.crc32(token.encode()) % self.dim] += 1.0
+                padded = f"#{token}#"
+                for i in range(len(padded) - 2):
+                    vectors[row, zlib.crc32(padded[i:i + 3].encode()) % self.dim] += 0.5
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def domain_allowed(url: str, domains: Iterable[str]) -> bool:
+    host = urlparse(url).hostname or ""
+    host = host.removeprefix("www.")
+    return any(host == d.removeprefix("www.") or host.endswith("." + d.removeprefix("www.")) for d in domains)
+
+
+class AbstractIndex:
+    """
+    In-memory hybrid (BM25 + vector) index over paper abstracts and their metadata.
+
+    Records are dicts with at least `title`, `abstract` and `url` (optionally `doi`, `authors`,
+    `journal`, `year`). Build one from JSONL (plain or gzipped) with `from_jsonl`, and persist it
+    as a single compressed `.npz` file with `save`; `load` accepts either format.
+    """
+
+    def __init__(
+        self,
+        records: list[dict],
+        vectors: Optional[np.ndarray] = None,
+        embedder: Optional[Embedder] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.records = records
+        self.embedder = embedder or HashingEmbedder()
+        self.k1 = k1
+        self.b = b
+
+        texts = [self._document_text(r) for r in records]
+        self.vectors = vectors if vectors is not None else self._embed(texts)
+        self._build_postings(texts)
+
+    @classmethod
+    def from_jsonl(
+        cls,
+        path: str | Path,
+        allowed_domains: Optional[Iterable[str]] = None,
+        embedder: Optional[Embedder] = None,
+    ) -> "AbstractIndex":
+        records, skipped = [], 0
+        for record in _read_jsonl(path):
+            if not record.get("abstract") or not record.get("url"):
+                skipped += 1
+                continue
+            if allowed_domains is not None and not domain_allowed(record["url"], allowed_domains):
+                skipped += 1
+                continue
+            records.append(record)
+
+        log.info("abstract_index_built", path=str(path), records=len(records), skipped=skipped)
+        return cls(records, embedder=embedder)
+
+    @classmethod
+    def load(cls, path: str | Path, embedder: Optional[Embedder] = None) -> "AbstractIndex":
+        path = Path(path)
+        if path.suffix != ".npz":
+            return cls.from_jsonl(path, embedder=embedder)
+
+        with np.load(path) as data:
+            records = json.loads(gzip.decompress(data["records"].tobytes()))
+            vectors = data["vectors"].astype(np.float32)
+        log.info("abstract_index_loaded", path=str(path), records=len(records))
+        return cls(records, vectors=vectors, embedder=embedder)
+
+    def save(self, path: str | Path) -> None:
+        records = gzip.compress(json.dumps(self.records).encode())
+        np.savez_compressed(
+            path,
+            records=np.frombuffer(records, dtype=np.uint8),
+            vectors=self.vectors.astype(np.float16),
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def search(self, query: str, n_results: int = 5, alpha: float = 0.5) -> list[tuple[dict, float]]:
+        """
+        Hybrid search: BM25 and cosine scores are each min-max normalised and mixed with weight
+        `alpha` on the vector side (the same relative-score fusion the Weaviate hybrid search uses).
+        """
+        if not self.records:
+            return []
+
+        scores = (1 - alpha) * self._normalise(self._bm25_scores(query))
+        if alpha > 0:
+            scores += alpha * self._normalise(self.vectors @ self._embed([query])[0])
+
+        n_results = min(n_results, len(self.records))
+        top = np.argpartition(-scores, n_results - 1)[:n_results]
+        top = top[np.argsort(-scores[top])]
+        return [(self.records[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def _bm25_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.records), dtype=np.float32)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            doc_ids, tfs = postings
+            idf = math.log(1 + (len(self.records) - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_ids] / self._avg_length)
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+    def _build_postings(self, texts: list[str]) -> None:
+        postings: dict[str, tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings[term][0].append(doc_id)
+                postings[term][1].append(tf)
+
+        self._postings = {
+            term: (np.array(ids, dtype=np.int32), np.array(tfs, dtype=np.float32))
+            for term, (ids, tfs) in postings.items()
+        }
+        self._doc_lengths = lengths
+        self._avg_length = float(lengths.mean()) if len(texts) else 0.0
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, getattr(self.embedder, "dim", 0)), dtype=np.float32)
+        return np.asarray(self.embedder(texts), dtype=np.float32)
+
+    @staticmethod
+    def _normalise(scores: np.ndarray) -> np.ndarray:
+        low, high = scores.min(), scores.max()
+        if high <= low:
+            return np.zeros_like(scores)
+        return (scores - low) / (high - low)
+
+    @staticmethod
+    def _document_text(record: dict) -> str:
+        return f"{record.get('title', '')}\n{record['abstract']}"
+
+
+def _read_jsonl(path: str | Path) -> Iterator[dict]:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@lru_cache(maxsize=None)
+def get_abstract_index(path: str) -> AbstractIndex:
+    """
+    Load an index once per process and share it between retrievers.
+    """
+    return AbstractIndex.load(path)
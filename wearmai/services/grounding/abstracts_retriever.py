@@ -0,0 +1,66 @@
+from typing import Optional, Callable
+from services.prompts.llm_prompts import FACT_CHECKING_DOMAINS
+from .abstract_index import AbstractIndex, domain_allowed
+from .base import BaseGroundingRetriever
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+class LocalAbstractsGroundingRetriever(BaseGroundingRetriever):
+    """
+    Offline grounding from a local index of paper abstracts, returning results in the Linkup
+    `searchResults` shape and restricted to the same sources as the Linkup fact-checking query.
+    """
+
+    def __init__(
+        self,
+        index: AbstractIndex,
+        n_results: int = 5,
+        allowed_domains: Optional[list[str]] = FACT_CHECKING_DOMAINS,
+    ):
+        self.index = index
+        self.n_results = n_results
+        self.allowed_domains = allowed_domains
+
+    def retrieve_grounding_data(
+        self,
+        search_query: str,
+        status_callback: Optional[Callable[[str], None]] = None
+    ) -> dict:
+        if status_callback: status_callback(f"Searching local academic abstracts for: '{search_query[:50]}...'")
+
+        # Over-fetch so the domain filter still leaves enough results for indexes built without it
+        hits = self.index.search(search_query, n_results=self.n_results * 3)
+        results = []
+        for record, score in hits:
+            if self.allowed_domains is not None and not domain_allowed(record["url"], self.allowed_domains):
+                continue
+            results.append(self._format_result(record))
+            if len(results) == self.n_results:
+                break
+
+        log.info("local_abstracts_search", query=search_query[:80], results=len(results))
+        return {"results": results}
+
+    @staticmethod
+    def _format_result(record: dict) -> dict:
+        authors = record.get("authors") or []
+        if isinstance(authors, list):
+            authors = ", ".join(authors[:3]) + (" et al." if len(authors) > 3 else "")
+
+        citation = " ".join(
+            part for part in (
+                f"{authors}." if authors else "",
+                f"({record['year']})" if record.get("year") else "",
+                f"{record['journal']}." if record.get("journal") else "",
+                f"doi:{record['doi']}" if record.get("doi") else "",
+            ) if part
+        )
+        return {
+            "type": "text",
+            "name": record.get("title", ""),
+            "url": record["url"],
+            "content": f"{citation}\n{record['abstract']}" if citation else record["abstract"],
+            "favicon": "",
+        }
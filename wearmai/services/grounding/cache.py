@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+import structlog
+
+log = structlog.get_logger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class GroundingCache:
+    """
+    Disk-backed (SQLite) cache for grounding search results.
+
+    Entries younger than `ttl` seconds are served as-is. Entries older than that but younger
+    than `max_stale` are served immediately while a background refresh replaces them; older
+    entries are treated as misses. The cache holds at most `max_entries` results and evicts the
+    least recently used ones beyond that.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 24 * 3600,
+        max_stale: float = 7 * 24 * 3600,
+        max_entries: int = 1000,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS grounding_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed_at ON grounding_cache (accessed_at)")
+
+    @staticmethod
+    def make_key(query: str, depth: str, output_type: str) -> str:
+        normalized_query = _WHITESPACE.sub(' ', query).strip().lower()
+        payload = json.dumps([normalized_query, depth, output_type])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[Optional[dict], bool]:
+        """
+        Return `(value, is_stale)`, or `(None, False)` if there is no usable entry.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM grounding_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+
+            value, created_at = row
+            age = now - created_at
+            if age > self.max_stale:
+                self._conn.execute("DELETE FROM grounding_cache WHERE key = ?", (key,))
+                return None, False
+
+            self._conn.execute("UPDATE grounding_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value), age > self.ttl
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO grounding_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            evicted = self._conn.execute(
+                """
+                DELETE FROM grounding_cache WHERE key IN (
+                    SELECT key FROM grounding_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+        if evicted:
+            log.info("grounding_cache_evicted", evicted=evicted)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], dict]) -> dict:
+        """
+        Serve `key` from the cache, calling `fetch` on a miss. Stale entries are returned right
+        away and refreshed in a background thread (at most one refresh per key at a time).
+        Exceptions raised by `fetch` on a miss propagate to the caller.
+        """
+        value, is_stale = self.get(key)
+        if value is None:
+            log.info("grounding_cache_miss", key=key)
+            value = fetch()
+            self.set(key, value)
+            return value
+
+        log.info("grounding_cache_hit", key=key, stale=is_stale)
+        if is_stale:
+            self._refresh_in_background(key, fetch)
+        return value
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], dict]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self.set(key, fetch())
+                log.info("grounding_cache_refreshed", key=key)
+            except Exception as e:
+                # Keep serving the stale entry; the next hit will try again
+                log.warning("grounding_cache_refresh_failed", key=key, error=str(e))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="grounding-cache-refresh", daemon=True).start()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,165 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from common.utils.tokens import estimate_tokens
+from .abstract_index import tokenize
+import structlog
+
+log = structlog.get_logger(__name__)
+
+DOI_PATTERN = re.compile(r'\b10\.\d{4,9}/[^\s"\'<>]+', flags=re.IGNORECASE)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+# Navigation, cookie banners and similar page chrome scraped along with the content; only applied to
+# short lines, as abstracts mention e.g. "Google Scholar" too
+BOILERPLATE_PATTERN = re.compile(
+    r'cookie|javascript|sign in|log in|subscribe|skip to|privacy policy|terms of (use|service)|'
+    r'all rights reserved|download pdf|share this|cite this|view article|google scholar|crossref',
+    flags=re.IGNORECASE,
+)
+BOILERPLATE_MAX_CHARS = 120
+
+
+@dataclass
+class CompactionStats:
+    tokens_before: int = 0
+    tokens_after: int = 0
+    sources_before: int = 0
+    sources_after: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class GroundingCompactor:
+    """
+    Shrinks grounding results (Linkup `searchResults` shape) before they are injected in a prompt:
+    sources are deduplicated by URL and DOI, page boilerplate is dropped, and only the passages
+    most relevant to the query (BM25) are kept, best first, until `token_budget` is spent.
+    """
+
+    def __init__(self, token_budget: int = 2000, passage_chars: int = 400, max_passages_per_source: int = 3, k1: float = 1.5, b: float = 0.75):
+        self.token_budget = token_budget
+        self.passage_chars = passage_chars
+        self.max_passages_per_source = max_passages_per_source
+        self.k1 = k1
+        self.b = b
+
+    def compact(self, grounding_data: dict, query: str) -> tuple[dict, CompactionStats]:
+        stats = CompactionStats(tokens_before=estimate_tokens(str(grounding_data)))
+        results = grounding_data.get("results") if isinstance(grounding_data, dict) else None
+        if not results:
+            # Errors and other shapes are passed through untouched
+            stats.tokens_after = stats.tokens_before
+            return grounding_data, stats
+
+        sources = self._deduplicate(results)
+        stats.sources_before = len(results)
+
+        passages = [
+            (source_idx, passage)
+            for source_idx, source in enumerate(sources)
+            for passage in self._split_passages(source.get("content", ""))
+        ]
+        scores = self._bm25(query, [passage for _, passage in passages])
+
+        # Passages sharing no term with the query are only used when nothing matched at all
+        any_match = any(score > 0 for score in scores)
+
+        selected: dict[int, list[tuple[int, str]]] = {}
+        budget = self.token_budget
+        for passage_idx in sorted(range(len(passages)), key=lambda i: -scores[i]):
+            if any_match and scores[passage_idx] <= 0:
+                break
+            source_idx, passage = passages[passage_idx]
+            chosen = selected.setdefault(source_idx, [])
+            if len(chosen) >= self.max_passages_per_source:
+                continue
+            # Source name and url are paid for once, with the first passage
+            cost = estimate_tokens(passage) + (0 if chosen else estimate_tokens(sources[source_idx].get("name", "") + sources[source_idx].get("url", "")))
+            if cost > budget:
+                continue
+            chosen.append((passage_idx, passage))
+            budget -= cost
+
+        compacted = []
+        for source_idx, source in enumerate(sources):
+            chosen = sorted(selected.get(source_idx) or [])
+            if not chosen:
+                continue
+            # Passages are kept in reading order within a source
+            compacted.append({
+                "name": source.get("name", ""),
+                "url": source.get("url", ""),
+                "content": " [...] ".join(passage for _, passage in chosen),
+            })
+
+        compacted_data = {"results": compacted}
+        stats.sources_after = len(compacted)
+        stats.tokens_after = estimate_tokens(str(compacted_data))
+        log.info(
+            "grounding_compacted",
+            tokens_before=stats.tokens_before,
+            tokens_after=stats.tokens_after,
+            tokens_saved=stats.tokens_saved,
+            sources_before=stats.sources_before,
+            sources_after=stats.sources_after,
+        )
+        return compacted_data, stats
+
+    @staticmethod
+    def _deduplicate(results: list[dict]) -> list[dict]:
+        unique, seen = [], set()
+        for result in results:
+            if result.get("type", "text") != "text":
+                continue
+            url = result.get("url", "").strip().lower().rstrip("/")
+            for prefix in ("https://", "http://", "www."):
+                url = url.removeprefix(prefix)
+            keys = {f"url:{url}"} if url else set()
+            keys |= {f"doi:{doi.lower().rstrip('.')}" for doi in DOI_PATTERN.findall(result.get("url", "") + " " + result.get("content", ""))}
+            if keys & seen:
+                continue
+            seen |= keys
+            unique.append(result)
+        return unique
+
+    def _split_passages(self, content: str) -> list[str]:
+        lines = [line.strip() for line in content.splitlines() if line.strip()]
+        # Short lines without sentence punctuation are menus, headers and link lists
+        kept = [
+            line for line in lines
+            if not (len(line) <= BOILERPLATE_MAX_CHARS and BOILERPLATE_PATTERN.search(line))
+            and not (len(line) < 40 and not line.endswith((".", "?", "!")))
+        ]
+        # A source that is all "boilerplate" is kept as is rather than dropped
+        sentences = [sentence for line in (kept or lines) for sentence in SENTENCE_BOUNDARY.split(line)]
+
+        passages, current = [], ""
+        for sentence in sentences:
+            if current and len(current) + len(sentence) + 1 > self.passage_chars:
+                passages.append(current)
+                current = ""
+            current = f"{current} {sentence}" if current else sentence[:self.passage_chars * 2]
+        if current:
+            passages.append(current)
+        return passages
+
+    def _bm25(self, query: str, passages: list[str]) -> list[float]:
+        docs = [Counter(tokenize(p)) for p in passages]
+        lengths = [sum(doc.values()) for doc in docs]
+        avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        doc_freq = Counter(term for doc in docs for term in doc)
+
+        scores = []
+        for doc, length in zip(docs, lengths):
+            score = 0.0
+            for term in set(tokenize(query)):
+                tf = doc.get(term, 0)
+                if not tf:
+                    continue
+                idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                score += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+            scores.append(score)
+        return scores
@@ -0,0 +1,123 @@
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Optional, Callable
+from .base import BaseGroundingRetriever
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class GroundingSource:
+    name: str
+    retriever: BaseGroundingRetriever
+    deadline: float  # seconds from the start of the fan-out
+
+
+class CompositeGroundingRetriever(BaseGroundingRetriever):
+    """
+    Queries several grounding sources concurrently and merges what arrives in time.
+
+    Every source gets its own deadline, capped by the overall `budget`. Results from sources
+    that answer in time are merged in source order and deduplicated by URL and content; sources
+    that miss their deadline are abandoned (queued calls are cancelled, running ones are left to
+    finish in the background and their results dropped), so the call never takes longer than
+    the budget.
+    """
+
+    def __init__(self, sources: list[GroundingSource], budget: float = 8.0, max_results: Optional[int] = None):
+        self.sources = sources
+        self.budget = budget
+        self.max_results = max_results
+
+    def retrieve_grounding_data(
+        self,
+        search_query: str,
+        status_callback: Optional[Callable[[str], None]] = None,
+        budget: Optional[float] = None,
+    ) -> dict:
+        """`budget` caps the fan-out below the configured budget, e.g. to fit a request's deadline."""
+        budget = self.budget if budget is None else min(budget, self.budget)
+        if not self.sources:
+            return {"error": "No grounding sources configured", "answer": "Could not fact-check output with academic sources."}
+
+        if status_callback: status_callback(f"Fact-checking output with {len(self.sources)} evidence sources using the search term: '{search_query[:50]}...'")
+
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="grounding")
+        # Sources run off the caller's thread, so they don't get the (UI) status callback
+        futures: dict[Future, GroundingSource] = {
+            executor.submit(source.retriever.retrieve_grounding_data, search_query): source
+            for source in self.sources
+        }
+        deadlines = {future: start + min(source.deadline, budget) for future, source in futures.items()}
+
+        responses: dict[str, dict] = {}
+        statuses: dict[str, str] = {}
+        pending = set(futures)
+        try:
+            while pending:
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[f] <= now]:
+                    pending.discard(future)
+                    future.cancel()
+                    statuses[futures[future].name] = "timeout"
+                if not pending:
+                    break
+
+                done, pending = wait(
+                    pending,
+                    timeout=min(deadlines[f] for f in pending) - now,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    source = futures[future]
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        response = {"error": str(e)}
+                    if "error" in response:
+                        statuses[source.name] = "error"
+                        log.warning("grounding_source_failed", source=source.name, error=response["error"])
+                    else:
+                        statuses[source.name] = f"ok ({time.monotonic() - start:.2f}s)"
+                        responses[source.name] = response
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        log.info("grounding_sources_merged", statuses=statuses, elapsed=round(time.monotonic() - start, 3))
+
+        if not responses:
+            if status_callback: status_callback("Fact-checking output with academic sources failed.")
+            return {"error": f"No grounding source answered in time: {statuses}", "answer": "Could not fact-check output with academic sources."}
+
+        # Merge in source order (not arrival order), so results are stable between runs
+        ordered = [responses[source.name] for source in self.sources if source.name in responses]
+        return {"results": self._merge(ordered)}
+
+    def _merge(self, responses: list[dict]) -> list[dict]:
+        merged, seen = [], set()
+        for response in responses:
+            for result in response.get("results", []):
+                keys = {self._url_key(result.get("url", "")), self._content_key(result.get("content", ""))} - {""}
+                if keys & seen:
+                    continue
+                seen |= keys
+                merged.append(result)
+                if self.max_results and len(merged) >= self.max_results:
+                    return merged
+        return merged
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        url = url.strip().lower().rstrip("/")
+        for prefix in ("https://", "http://", "www."):
+            url = url.removeprefix(prefix)
+        return f"url:{url}" if url else ""
+
+    @staticmethod
+    def _content_key(content: str) -> str:
+        normalized = " ".join(content.lower().split())
+        return f"content:{hashlib.sha1(normalized.encode()).hexdigest()}" if normalized else ""
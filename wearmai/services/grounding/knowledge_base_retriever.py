@@ -0,0 +1,41 @@
+from typing import Optional, Callable
+from infrastructure.vectorstore.weaviate_vectorstore import WeaviateVecStore
+from .base import BaseGroundingRetriever
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+class KnowledgeBaseGroundingRetriever(BaseGroundingRetriever):
+    """
+    Grounds answers in the local knowledge base, returning hits in the Linkup `searchResults` shape.
+    """
+
+    def __init__(self, vectorstore: WeaviateVecStore, n_results: int = 5):
+        self.vectorstore = vectorstore
+        self.n_results = n_results
+
+    def retrieve_grounding_data(
+        self,
+        search_query: str,
+        status_callback: Optional[Callable[[str], None]] = None
+    ) -> dict:
+        if status_callback: status_callback(f"Searching knowledge base for evidence on: '{search_query[:50]}...'")
+
+        try:
+            entries = self.vectorstore.hybrid_similarity_search(search_query, n_results=self.n_results)
+        except Exception as e:
+            log.exception("Error during knowledge base grounding search", error=e)
+            return {"error": str(e), "answer": "Could not search the knowledge base."}
+
+        return {
+            "results": [
+                {
+                    "type": "text",
+                    "name": f"Knowledge base ({self.vectorstore.vs_name})",
+                    "url": f"kb://{self.vectorstore.vs_name}/{entry.id}",
+                    "content": entry.content,
+                }
+                for entry in entries
+            ]
+        }
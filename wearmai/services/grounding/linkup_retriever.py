@@ -1,5 +1,6 @@
 from linkup import LinkupClient
 from .base import BaseGroundingRetriever
+from .cache import GroundingCache
 import os
 from typing import Optional, Callable
 from services.prompts.llm_prompts import LLMPrompts, PromptType
@@ -12,12 +13,23 @@ class LinkupGroundingRetriever(BaseGroundingRetriever):
     def __init__(
         self,
         depth: str = "standard",
-        output_type: str = "searchResults"
+        output_type: str = "searchResults",
+        cache: Optional[GroundingCache] = None,
+        timeout: Optional[float] = None
     ):
-        self.linkup_client = LinkupClient(api_key=os.getenv("LINKUP_API_KEY"))
+        self._linkup_client: Optional[LinkupClient] = None
         self.depth = depth
         self.output_type = output_type
+        self.cache = cache
+        self.timeout = timeout
     
+    @property
+    def linkup_client(self) -> LinkupClient:
+        # Built on first search, so cached or replayed sessions work without an API key
+        if self._linkup_client is None:
+            self._linkup_client = LinkupClient(api_key=os.getenv("LINKUP_API_KEY"))
+        return self._linkup_client
+
     def retrieve_grounding_data(
         self, 
         search_query: str, 
@@ -28,17 +40,25 @@ class LinkupGroundingRetriever(BaseGroundingRetriever):
         final_search_query = LLMPrompts.get_prompt(PromptType.FACT_CHECKING_SEARCH_QUERY_PROMPT, {"search_query":search_query})
 
         try:
-            search_response = self.linkup_client.search(
-                query=final_search_query,
-                depth=self.depth,
-                output_type=self.output_type # can be sourcedAnswer (llm-generated answer based on sources) or searchResults, which is faster as it's just the raw search results
-            )
-            log.info("linkup_search_response", search_response=search_response)
-            return search_response
+            if self.cache is None:
+                return self._search(final_search_query)
+
+            key = GroundingCache.make_key(final_search_query, self.depth, self.output_type)
+            return self.cache.get_or_fetch(key, lambda: self._search(final_search_query))
         
         except Exception as e:
             log.exception(f"Error during Linkup Search", error=e)
             
             if status_callback: status_callback(f"Fact-checking output with online academic sources failed.")
             return {"error": str(e), "answer": "Could not fact-check output with online academic sources."}
-        
\ No newline at end of file
+
+    def _search(self, final_search_query: str) -> dict:
+        search_response = self.linkup_client.search(
+            query=final_search_query,
+            depth=self.depth,
+            output_type=self.output_type, # can be sourcedAnswer (llm-generated answer based on sources) or searchResults, which is faster as it's just the raw search results
+            timeout=self.timeout
+        )
+        log.info("linkup_search_response", search_response=search_response)
+        # Plain dicts, so fresh and cached responses look the same downstream
+        return search_response.model_dump() if hasattr(search_response, "model_dump") else search_response
@@ -0,0 +1,145 @@
+import glob
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from services.segmentation.base import SegmentationOpts
+from common.utils.text_cleaning import clean_knowledge_base
+import structlog
+
+log = structlog.get_logger(__name__)
+
+SECTION_HEADING_PATTERN = re.compile(r'^#{1,6} ', flags=re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class CorpusChunk:
+    text: str
+    source: str
+
+
+def resolve_corpus(corpus: str) -> list[Path]:
+    """
+    Resolve a corpus directory (every markdown file inside it) or a glob pattern to a sorted list of files.
+    """
+    if os.path.isdir(corpus):
+        corpus = os.path.join(corpus, "*.md")
+    paths = sorted(Path(p) for p in glob.glob(corpus))
+    if not paths:
+        raise FileNotFoundError(f"No documents found for corpus: {corpus}")
+    return paths
+
+
+def iter_sections(lines: Iterable[str], target_chars: int = 32_000) -> Iterator[str]:
+    """
+    Group the lines of a markdown document into windows of roughly `target_chars`, only ever
+    starting a new window at a section heading. Lines are consumed lazily, so only one window
+    is held in memory at a time.
+    """
+    window: list[str] = []
+    size = 0
+    for line in lines:
+        if size >= target_chars and SECTION_HEADING_PATTERN.match(line):
+            yield "".join(window)
+            window, size = [], 0
+        window.append(line)
+        size += len(line)
+    if window:
+        yield "".join(window)
+
+
+# ----- Worker process state ----- #
+
+_worker_segmentation_svc = None
+_worker_segmentation_opt: SegmentationOpts | None = None
+_worker_segmentation_kwargs: dict = {}
+
+
+def _init_worker(opt: SegmentationOpts, segmentation_kwargs: dict) -> None:
+    # Each worker builds its segmenter (and loads the embedding model) exactly once
+    from services.segmentation.segmentation_service import SegmentationService
+
+    global _worker_segmentation_svc, _worker_segmentation_opt, _worker_segmentation_kwargs
+    _worker_segmentation_svc = SegmentationService()
+    _worker_segmentation_opt = opt
+    _worker_segmentation_kwargs = segmentation_kwargs
+
+
+def _segment_window(window: str) -> list[str]:
+    chunks = _worker_segmentation_svc.segment_text(
+        text=window,
+        opt=_worker_segmentation_opt,
+        **_worker_segmentation_kwargs,
+    )
+    return [chunk.text for chunk in chunks]
+
+
+class CorpusSegmenter:
+    """
+    Streams a multi-document corpus through read -> clean -> segment. Documents are read one
+    section window at a time, and windows are fanned out to a pool of worker processes with at
+    most `max_pending_windows` in flight, so memory stays flat regardless of corpus size.
+    Chunks are yielded in document order.
+    """
+
+    def __init__(
+        self,
+        opt: SegmentationOpts = SegmentationOpts.SDPM,
+        workers: int | None = None,
+        window_chars: int = 32_000,
+        max_pending_windows: int | None = None,
+        **segmentation_kwargs: Any,
+    ) -> None:
+        self.opt = opt
+        self.workers = workers or os.cpu_count() or 1
+        self.window_chars = window_chars
+        self.max_pending_windows = max_pending_windows or self.workers * 2
+        self.segmentation_kwargs = segmentation_kwargs
+
+    def iter_windows(self, paths: Iterable[Path]) -> Iterator[tuple[str, str]]:
+        for path in paths:
+            window_count = 0
+            with open(path) as f:
+                for window in iter_sections(f, self.window_chars):
+                    clean_window = clean_knowledge_base(window)
+                    if clean_window:
+                        window_count += 1
+                        yield path.name, clean_window
+            log.info("corpus_document_read", source=path.name, windows=window_count)
+
+    def iter_chunks(self, paths: Iterable[Path]) -> Iterator[CorpusChunk]:
+        windows = self.iter_windows(paths)
+
+        if self.workers <= 1:
+            _init_worker(self.opt, self.segmentation_kwargs)
+            for source, window in windows:
+                yield from self._emit(source, _segment_window(window))
+            return
+
+        # Spawn, not fork: callers run this in a producer thread next to gRPC (Weaviate) and
+        # batch-writer threads, and forking a multi-threaded process can deadlock the workers
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.opt, self.segmentation_kwargs),
+        ) as executor:
+            pending = deque()
+            for source, window in windows:
+                pending.append((source, executor.submit(_segment_window, window)))
+                if len(pending) >= self.max_pending_windows:
+                    source, future = pending.popleft()
+                    yield from self._emit(source, future.result())
+
+            while pending:
+                source, future = pending.popleft()
+                yield from self._emit(source, future.result())
+
+    @staticmethod
+    def _emit(source: str, chunk_texts: list[str]) -> Iterator[CorpusChunk]:
+        for text in chunk_texts:
+            yield CorpusChunk(text=text, source=source)
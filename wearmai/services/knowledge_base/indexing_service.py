@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+from infrastructure.vectorstore.weaviate_vectorstore import WeaviateVecStore
+from infrastructure.vectorstore.batch_writer import BatchWriterConfig, BatchWriteResult
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+@dataclass
+class IndexResult:
+    new: int = 0
+    unchanged: int = 0
+    stale_ids: list[str] = field(default_factory=list)
+    write_result: Optional[BatchWriteResult] = None
+
+
+class KnowledgeBaseIndexingService:
+    """
+    Keeps a vector store collection in sync with a stream of chunks.
+
+    Objects are keyed by a hash of their content (see `WeaviateVecStore.chunk_id`), so
+    chunks whose id is already in the collection are left alone, only new chunks are
+    sent (and embedded), and ids no longer produced by the corpus are deleted. This also
+    resumes an interrupted run: what it committed is already in the collection.
+    """
+
+    def __init__(self, vectorstore: WeaviateVecStore) -> None:
+        self.vectorstore = vectorstore
+
+    def sync(
+        self,
+        chunks: Iterable,
+        prune: bool = True,
+        config: BatchWriterConfig = BatchWriterConfig(),
+    ) -> IndexResult:
+        existing_ids = self.vectorstore.get_ids()
+        seen_ids: set[str] = set()
+        result = IndexResult()
+
+        def new_chunks() -> Iterator:
+            for chunk in chunks:
+                chunk_id = WeaviateVecStore.chunk_id(chunk.text)
+                if chunk_id in seen_ids:
+                    continue
+                seen_ids.add(chunk_id)
+
+                if chunk_id in existing_ids:
+                    result.unchanged += 1
+                else:
+                    result.new += 1
+                    yield chunk
+
+        # New chunks are inserted while the rest of the corpus is still being segmented
+        result.write_result = self.vectorstore.add_items(new_chunks(), config=config)
+
+        # Only prune once the whole corpus has been seen
+        if prune:
+            result.stale_ids = sorted(existing_ids - seen_ids)
+            self.vectorstore.delete_items(result.stale_ids)
+
+        log.info(
+            "kb_index_synced",
+            new=result.new,
+            unchanged=result.unchanged,
+            stale=len(result.stale_ids),
+        )
+        return result
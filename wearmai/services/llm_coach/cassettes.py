@@ -0,0 +1,29 @@
+from dataclasses import replace
+from infrastructure.cassette import Cassette, CassetteLLMFactory, CassetteProxy
+from infrastructure.vectorstore.weaviate_vectorstore import WeaviateVecStore
+from services.llm_coach.coach_service import CoachService
+
+# Grounding sources that call out to external services (the knowledge-base source goes through the vector store)
+EXTERNAL_GROUNDING_SOURCES = {"linkup"}
+
+
+def build_cassette_coach(cassette: Cassette, vs_name: str, user_profile: dict) -> CoachService:
+    """
+    A CoachService whose LLM calls, vector store queries and external grounding searches are
+    recorded to, or replayed from, `cassette`. The DB and local indexes are used as usual.
+    Hedging is off: it races live providers, which a replay can't reproduce.
+    """
+    vectorstore = CassetteProxy(
+        cassette,
+        "vectorstore",
+        target=WeaviateVecStore(vs_name) if cassette.recording else None,
+        methods=("similarity_search", "hybrid_similarity_search"),
+    )
+    coach = CoachService(vs_name, user_profile, vectorstore=vectorstore, llm_factory=CassetteLLMFactory(cassette))
+    coach.grounding_retriever.sources = [
+        replace(source, retriever=CassetteProxy(cassette, f"grounding.{source.name}", source.retriever, ("retrieve_grounding_data",)))
+        if source.name in EXTERNAL_GROUNDING_SOURCES else source
+        for source in coach.grounding_retriever.sources
+    ]
+    coach.hedged_streamers = {}
+    return coach
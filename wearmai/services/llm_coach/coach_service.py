@@ -1,28 +1,107 @@
 from infrastructure.vectorstore.weaviate_vectorstore import WeaviateVecStore
+from infrastructure.vectorstore.base import VecStore
 from infrastructure.llm_clients.factory import LLMClientFactory, LLModels
+from infrastructure.llm_clients.sinks import StreamSink, aconsume, consume
+from infrastructure.llm_clients.hedging import hedged_streamers
+from infrastructure.tracing import in_current_context, tracer
 from box import Box
 from core.serializers import RunDetailSerializer
 from core.models import Run
 from services.prompts.structured_outputs import ConversationSummaryOutput, function_determinant_json_format
 from services.prompts.llm_prompts import LLMPrompts, PromptType
 import json
-from typing import Callable, Optional
+from typing import AsyncIterator, Callable, Iterator, Optional
+from asgiref.sync import sync_to_async
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import lru_cache, wraps
+from django.db import connection
+from common.utils.deadline import Deadline
+from common.utils.db_queries import track_queries
 from services.grounding.linkup_retriever import LinkupGroundingRetriever
+from services.grounding.cache import GroundingCache
+from services.grounding.composite_retriever import CompositeGroundingRetriever, GroundingSource
+from services.grounding.knowledge_base_retriever import KnowledgeBaseGroundingRetriever
+from services.grounding.abstracts_retriever import LocalAbstractsGroundingRetriever
+from services.grounding.abstract_index import get_abstract_index
+from services.grounding.compaction import GroundingCompactor
+from services.llm_coach.routing import ModelRoute, TurnSignals, load_routing_policy
+import os
+from django.conf import settings
 import structlog
 
 log = structlog.get_logger(__name__)
 
+
+@lru_cache(maxsize=None)
+def _context_executor() -> ThreadPoolExecutor:
+    # Context retrieval is I/O bound, so async sessions get more threads than the default executor
+    return ThreadPoolExecutor(max_workers=settings.COACH_CONTEXT_THREADS, thread_name_prefix="coach-context")
+
+
+@lru_cache(maxsize=None)
+def _stage_executor() -> ThreadPoolExecutor:
+    # Shared by all sessions, so the threads running context stages stay bounded under load
+    return ThreadPoolExecutor(max_workers=settings.COACH_STAGE_THREADS, thread_name_prefix="coach-stage")
+
+
+# Minimum time (seconds) that must be left for an optional context stage to be started
+OPTIONAL_STAGE_MIN_BUDGET = {
+    "knowledge_base": 0.5,
+    "fact_checking_data": 1.0,
+}
+
+# Stages the coach can answer without: if one fails, its context is left out instead of failing the turn
+OPTIONAL_STAGES = frozenset({"knowledge_base", "run_summary_data", "fact_checking_data"})
+
+# How each context stage is described to the coach when it had to be left out
+OMITTED_CONTEXT_LABELS = {
+    "router": "query analysis (no run data, knowledge base or literature lookups were made)",
+    "knowledge_base": "knowledge base excerpts",
+    "raw_run_data": "the user's raw run data",
+    "run_summary_data": "the summary of the user's runs",
+    "fact_checking_data": "scientific literature search results",
+}
+
+
+def _with_db_cleanup(fn: Callable) -> Callable:
+    # Stage threads are pooled and outlive the turn; close their DB connection instead of leaking it
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connection.close()
+    return wrapper
+
+
+def _traced_stage(stage: str, fn: Callable) -> Callable:
+    # Runs `fn` in a span of the caller's trace, whichever thread it's submitted to
+    def run(*args, **kwargs):
+        with tracer.span(f"coach.{stage}"):
+            return fn(*args, **kwargs)
+    return in_current_context(run)
+
 class CoachService():
-    def __init__(self, vs_name: str, user_profile: dict) -> None:
+    def __init__(
+        self,
+        vs_name: str,
+        user_profile: dict,
+        vectorstore: Optional[VecStore] = None,
+        llm_factory: Optional[LLMClientFactory] = None,
+    ) -> None:
+        """`vectorstore` and `llm_factory` replace the live Weaviate store and provider clients, e.g. with cassettes."""
         # Core state
         self.chat_history: list[tuple[str, str]] = []
         self.session_history: list[tuple[str, str]] = []
         self.session_history_summary: Optional[str] = None
 
         # External resources
-        self.vectorstore = WeaviateVecStore(vs_name)
-        self.grounding_retriever = LinkupGroundingRetriever()
-        self.llm_factory = LLMClientFactory()
+        self.vectorstore = vectorstore if vectorstore is not None else WeaviateVecStore(vs_name)
+        self.grounding_retriever = self._build_grounding_retriever()
+        self.grounding_compactor = GroundingCompactor(token_budget=settings.GROUNDING_TOKEN_BUDGET)
+        self.llm_factory = llm_factory if llm_factory is not None else LLMClientFactory()
+        self.hedged_streamers = hedged_streamers()
+        self.routing_policy = load_routing_policy(settings.COACH_ROUTING_POLICY)
 
         # User info
         self.user_profile = user_profile
@@ -30,22 +109,61 @@ class CoachService():
         # Config thresholds
         self.history_summarisation_threshold = 5
 
+    def _build_grounding_retriever(self) -> CompositeGroundingRetriever:
+        sources = []
+        if "linkup" in settings.GROUNDING_SOURCES:
+            sources.append(GroundingSource(
+                name="linkup",
+                retriever=LinkupGroundingRetriever(
+                    cache=GroundingCache(
+                        settings.GROUNDING_CACHE_PATH,
+                        ttl=settings.GROUNDING_CACHE_TTL,
+                        max_stale=settings.GROUNDING_CACHE_MAX_STALE,
+                        max_entries=settings.GROUNDING_CACHE_MAX_ENTRIES,
+                    ),
+                    timeout=settings.GROUNDING_LINKUP_DEADLINE,
+                ),
+                deadline=settings.GROUNDING_LINKUP_DEADLINE,
+            ))
+        if "knowledge_base" in settings.GROUNDING_SOURCES:
+            sources.append(GroundingSource(
+                name="knowledge_base",
+                retriever=KnowledgeBaseGroundingRetriever(self.vectorstore),
+                deadline=settings.GROUNDING_KNOWLEDGE_BASE_DEADLINE,
+            ))
+        if "abstracts" in settings.GROUNDING_SOURCES:
+            if os.path.exists(settings.GROUNDING_ABSTRACTS_INDEX):
+                sources.append(GroundingSource(
+                    name="abstracts",
+                    retriever=LocalAbstractsGroundingRetriever(get_abstract_index(settings.GROUNDING_ABSTRACTS_INDEX)),
+                    deadline=settings.GROUNDING_ABSTRACTS_DEADLINE,
+                ))
+            else:
+                log.warning("abstracts_index_missing", path=settings.GROUNDING_ABSTRACTS_INDEX)
+
+        log.info("grounding_sources_configured", sources=[source.name for source in sources])
+        return CompositeGroundingRetriever(sources, budget=settings.GROUNDING_BUDGET)
+
+    @track_queries("get_raw_run_data")
     def get_raw_run_data(self,run_ids: list[int]) -> dict:
-        runs = Run.objects.filter(id__in=run_ids)
+        runs = RunDetailSerializer.setup_eager_loading(Run.objects.filter(id__in=run_ids))
         run_data = RunDetailSerializer(runs, many=True).data
 
         return json.dumps(run_data, indent=4)
 
+    @track_queries("get_run_summary")
     def get_run_summary(self, run_ids: list[int]) -> str:
-        runs = Run.objects.filter(id__in=run_ids)
-        run_data = RunDetailSerializer(runs, many=True).data
+        with tracer.span("coach.serialize_runs", run_count=len(run_ids)):
+            runs = RunDetailSerializer.setup_eager_loading(Run.objects.filter(id__in=run_ids))
+            run_data = RunDetailSerializer(runs, many=True).data
 
         system_prompt = LLMPrompts.get_prompt(PromptType.RUN_SUMMARY_GENERATOR_PROMPT, {"run_data": run_data,"user_profile": self.user_profile})
-        client = self.llm_factory.get(LLModels.GEMINI_20_FLASH)
+        model = self.routing_policy.run_summary_model
+        client = self.llm_factory.get(model)
 
         return client.generate(
             system_prompt,
-            model=LLModels.GEMINI_20_FLASH
+            model=model
         )
 
     def determine_required_functions(self, query: str) -> Box:
@@ -56,10 +174,11 @@ class CoachService():
              "user_profile": self.user_profile, 
              "chat_history": chat_history})
         
-        client = self.llm_factory.get(LLModels.O4_MINI)
+        model = self.routing_policy.router_model
+        client = self.llm_factory.get(model)
         output = client.generate(
             system_prompt,
-            model=LLModels.O4_MINI,
+            model=model,
             text={
             "format": function_determinant_json_format
             },
@@ -75,41 +194,127 @@ class CoachService():
         return required_funcs
 
 
-    def retrieve_necessary_context(self, query: str, status_callback: Optional[Callable[[str], None]] = None) -> dict:
-        if status_callback: status_callback("Analyzing your query to determine next steps...")
-        required_functions = self.determine_required_functions(query)
-
+    def retrieve_necessary_context(
+        self,
+        query: str,
+        status_callback: Optional[Callable[[str], None]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> dict:
+        """
+        Runs the router, then the stages it asks for concurrently, all bounded by `deadline`
+        (less the time reserved for generating the answer). Optional stages are skipped when
+        too little time is left, and left out when they fail; any stage that doesn't finish in
+        time is left out too. Left out context is listed in `omitted_context`.
+        """
+        deadline = deadline or Deadline(settings.COACH_TURN_BUDGET)
+        reserve = settings.COACH_ANSWER_RESERVE
         context = {
             "relevant_chunks": [],
             "raw_run_data": {},
             "run_summary_data": "",
             "fact_checking_data": {},
-            "query_kb_needed": required_functions.QueryKnowledgeBase_needed,
-            "get_fact_check_needed": required_functions.GetGroundingAndFactCheckingData_needed
+            "query_kb_needed": False,
+            "get_fact_check_needed": False,
+            "required_functions": [],
+            "omitted_context": [],
         }
 
-        if required_functions.QueryKnowledgeBase_needed:
-            if status_callback: status_callback(f"Searching knowledge base for: '{required_functions.query[:50]}...'")
-            context["relevant_chunks"] = self.vectorstore.hybrid_similarity_search(required_functions.query)
-
-        if required_functions.GetRawRunData_needed:
-            if status_callback: status_callback(f"Fetching performance records for run(s): {required_functions.run_ids}...")
-            context["raw_run_data"] = self.get_raw_run_data(required_functions.run_ids)
-
-        if required_functions.GenerateRunSummary_needed:
-            if status_callback: status_callback(f"Generating summary for run(s): {required_functions.run_ids}...")
-            context["run_summary_data"] = self.get_run_summary(required_functions.run_ids)
-
-        if required_functions.GetGroundingAndFactCheckingData_needed:
-            # Pass the callback down
-            context["fact_checking_data"] = self.grounding_retriever.retrieve_grounding_data(
-                required_functions.fact_checking_query,
-                status_callback=status_callback
-            )
-
+        # Stages that miss the deadline are abandoned: they finish in the background and are ignored
+        executor = _stage_executor()
+        submitted: list[Future] = []
+
+        def submit(fn, *args) -> Future:
+            future = executor.submit(fn, *args)
+            submitted.append(future)
+            return future
+
+        try:
+            if status_callback: status_callback("Analyzing your query to determine next steps...")
+            try:
+                required_functions = submit(_traced_stage("router", _with_db_cleanup(self.determine_required_functions)), query).result(timeout=deadline.remaining(reserve))
+            except FuturesTimeoutError:
+                log.warning("coach_stage_timeout", stage="router", elapsed=round(deadline.elapsed(), 3))
+                context["omitted_context"].append(OMITTED_CONTEXT_LABELS["router"])
+                return context
+
+            context["query_kb_needed"] = required_functions.QueryKnowledgeBase_needed
+            context["get_fact_check_needed"] = required_functions.GetGroundingAndFactCheckingData_needed
+            context["required_functions"] = [
+                name.removesuffix("_needed") for name, needed in required_functions.items()
+                if name.endswith("_needed") and needed
+            ]
+
+            stages: dict[str, Future] = {}
+
+            def start_optional(stage: str, fn, *args) -> None:
+                if deadline.allows(OPTIONAL_STAGE_MIN_BUDGET[stage], reserve):
+                    stages[stage] = submit(_traced_stage(stage, fn), *args)
+                else:
+                    log.warning("coach_stage_skipped", stage=stage, remaining=round(deadline.remaining(reserve), 3))
+                    context["omitted_context"].append(OMITTED_CONTEXT_LABELS[stage])
+
+            if required_functions.QueryKnowledgeBase_needed:
+                if status_callback: status_callback(f"Searching knowledge base for: '{required_functions.query[:50]}...'")
+                start_optional("knowledge_base", self.vectorstore.hybrid_similarity_search, required_functions.query)
+
+            if required_functions.GetRawRunData_needed:
+                if status_callback: status_callback(f"Fetching performance records for run(s): {required_functions.run_ids}...")
+                stages["raw_run_data"] = submit(_traced_stage("raw_run_data", _with_db_cleanup(self.get_raw_run_data)), required_functions.run_ids)
+
+            if required_functions.GenerateRunSummary_needed:
+                if status_callback: status_callback(f"Generating summary for run(s): {required_functions.run_ids}...")
+                stages["run_summary_data"] = submit(_traced_stage("run_summary_data", _with_db_cleanup(self.get_run_summary)), required_functions.run_ids)
+
+            if required_functions.GetGroundingAndFactCheckingData_needed:
+                # The stage runs off the caller's thread, so it doesn't get the (UI) status callback;
+                # the grounding fan-out gets whatever budget is left
+                if status_callback: status_callback(f"Fact-checking output with academic sources using the search term: '{required_functions.fact_checking_query[:50]}...'")
+                start_optional(
+                    "fact_checking_data",
+                    self._retrieve_grounding,
+                    query,
+                    required_functions.fact_checking_query,
+                    deadline.remaining(reserve),
+                )
+
+            for stage, future in stages.items():
+                try:
+                    result = future.result(timeout=deadline.remaining(reserve))
+                except FuturesTimeoutError:
+                    log.warning("coach_stage_timeout", stage=stage, elapsed=round(deadline.elapsed(), 3))
+                    context["omitted_context"].append(OMITTED_CONTEXT_LABELS[stage])
+                    continue
+                except Exception as e:
+                    if stage not in OPTIONAL_STAGES:
+                        raise
+                    log.warning("coach_stage_failed", stage=stage, error=str(e))
+                    context["omitted_context"].append(OMITTED_CONTEXT_LABELS[stage])
+                    continue
+                if stage == "fact_checking_data" and "error" in result:
+                    context["omitted_context"].append(OMITTED_CONTEXT_LABELS[stage])
+                context["relevant_chunks" if stage == "knowledge_base" else stage] = result
+        finally:
+            # Stages of this turn still queued behind other sessions' are dropped
+            for future in submitted:
+                future.cancel()
+
+        log.info("coach_context_retrieved", elapsed=round(deadline.elapsed(), 3), omitted=context["omitted_context"])
         if status_callback: status_callback("Consolidating information...")
         return context
 
+    def _retrieve_grounding(
+        self,
+        query: str,
+        fact_checking_query: str,
+        budget: float,
+    ) -> dict:
+        grounding_data = self.grounding_retriever.retrieve_grounding_data(fact_checking_query, budget=budget)
+        # Keep only the passages relevant to the query, within the prompt's token budget
+        with tracer.span("coach.grounding_compaction") as span:
+            grounding_data, stats = self.grounding_compactor.compact(grounding_data, f"{fact_checking_query} {query}")
+            span.set(tokens_before=stats.tokens_before, tokens_after=stats.tokens_after)
+        return grounding_data
+
     def close(self) -> None:
         self.vectorstore.close()
         log.info("chat_client_closed")
@@ -121,10 +326,11 @@ class CoachService():
         conversation_messages = self.session_history[-1] if self.session_history_summary else self.session_history
         system_prompt = LLMPrompts.get_prompt(PromptType.SESSION_HISTORY_SUMMARIZATION_PROMPT, {"conversation_messages":conversation_messages})
 
-        client = self.llm_factory.get(LLModels.GEMINI_20_FLASH)
+        model = self.routing_policy.history_summary_model
+        client = self.llm_factory.get(model)
         response = client.generate(
             system_prompt,
-            model=LLModels.GEMINI_20_FLASH,
+            model=model,
             response_mime_type="application/json",
             response_schema=ConversationSummaryOutput
         )
@@ -149,63 +355,179 @@ class CoachService():
         self.update_session_history()
 
     
-    def create_system_prompt(self, query: str) -> str:
-        relevant_context = self.retrieve_necessary_context(query) 
+    def create_system_prompt(self, query: str, deadline: Optional[Deadline] = None) -> str:
+        return self.prepare_turn(query, deadline)[0]
+
+    def prepare_turn(self, query: str, deadline: Optional[Deadline] = None) -> tuple[str, ModelRoute]:
+        """
+        Retrieves the turn's context and builds the coach prompt, then picks the answer model
+        from the routing policy based on the prompt size, the functions needed and the history.
+        """
+        with tracer.span("coach.retrieve_context") as span:
+            relevant_context = self.retrieve_necessary_context(query, deadline=deadline)
+            span.set(functions=relevant_context["required_functions"], omitted=len(relevant_context["omitted_context"]))
         combined_history = [self.session_history_summary] + self.session_history if self.session_history_summary else self.session_history
 
-        if relevant_context["fact_checking_data"] == True:
-             query = query + " Ground your advice and analysis using the provided `fact_checking_data` containing scientific literature search results."
-
-
-        system_prompt = LLMPrompts.get_prompt(
-            PromptType.COACH_PROMPT,
-            {
-                "query":query,
-                "user_profile":self.user_profile,
-                "chat_history":combined_history,
-                "run_summary_data":relevant_context['run_summary_data'],
-                "raw_run_data":relevant_context['raw_run_data'],
-                "book_content":relevant_context['relevant_chunks'],
-                "fact_checking_data": relevant_context['fact_checking_data']
-            }
-        )
+        if relevant_context["fact_checking_data"] and "error" not in relevant_context["fact_checking_data"]:
+            query = query + " Ground your advice and analysis using the provided `fact_checking_data` containing scientific literature search results."
+
+        if relevant_context["omitted_context"]:
+            query = query + f" Note: the following context could not be retrieved in time and is missing: {'; '.join(relevant_context['omitted_context'])}. Answer with the information available and briefly tell the user if the missing context limits your answer."
+
+
+        with tracer.span("coach.build_prompt") as span:
+            system_prompt = LLMPrompts.get_prompt(
+                PromptType.COACH_PROMPT,
+                {
+                    "query":query,
+                    "user_profile":self.user_profile,
+                    "chat_history":combined_history,
+                    "run_summary_data":relevant_context['run_summary_data'],
+                    "raw_run_data":relevant_context['raw_run_data'],
+                    "book_content":relevant_context['relevant_chunks'],
+                    "fact_checking_data": relevant_context['fact_checking_data']
+                }
+            )
 
-        return system_prompt
+            signals = TurnSignals.from_turn(query, system_prompt, relevant_context["required_functions"], len(self.chat_history))
+            route = self.routing_policy.route(signals)
+            span.set(prompt_tokens=signals.context_tokens, route=route.name)
+        return system_prompt, route
+
+    @staticmethod
+    def _answer_model(route: ModelRoute, model: Optional[LLModels], kwargs: dict) -> tuple[LLModels, dict]:
+        # An explicitly requested model is used as-is; otherwise the route's model and parameters
+        if model is not None:
+            return model, kwargs
+        return route.model, {**route.generation_kwargs(), **kwargs}
     
     def send_question(
         self,
         query: str,
-        model: LLModels,
+        model: Optional[LLModels] = None,
         temperature: int | float = 1,
+        deadline: Optional[Deadline] = None,
         **kwargs,
     ) -> str:
-        prompt = self.create_system_prompt(query)
-        client = self.llm_factory.get(model)
-        result = client.generate(
-            prompt,
-            model=model,
-            temperature=temperature,
-            **kwargs # max_tokens for claude (or max_output_tokens for openai/gemini)
-        )
-        self.update_history(query, result)
-        return result
+        with tracer.span("coach.turn", streamed=False):
+            prompt, route = self.prepare_turn(query, deadline)
+            model, kwargs = self._answer_model(route, model, kwargs)
+            client = self.llm_factory.get(model)
+            with tracer.span("coach.generate", model=str(model)):
+                result = client.generate(
+                    prompt,
+                    model=model,
+                    temperature=temperature,
+                    **kwargs # max_tokens for claude (or max_output_tokens for openai/gemini)
+                )
+            with tracer.span("coach.update_history"):
+                self.update_history(query, result)
+            return result
     
+    def iter_answer(
+        self,
+        query: str,
+        model: Optional[LLModels] = None,
+        temperature: int | float = 1,
+        deadline: Optional[Deadline] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Yields the answer as text deltas; the history is updated once the stream is exhausted.
+        Without a `model`, the routing policy picks the model and its parameters.
+        """
+        with tracer.span("coach.turn", streamed=True):
+            prompt, route = self.prepare_turn(query, deadline)
+            model, kwargs = self._answer_model(route, model, kwargs)
+            parts = []
+            with tracer.span("coach.generate", model=str(model)) as span:
+                if model in self.hedged_streamers:
+                    deltas = self.hedged_streamers[model].stream(prompt, temperature=temperature, **kwargs)
+                else:
+                    deltas = self.llm_factory.get(model).stream(prompt, model=model, temperature=temperature, **kwargs)
+                for delta in deltas:
+                    if not parts:
+                        span.set(first_token_s=round(span.duration, 3))
+                    parts.append(delta)
+                    yield delta
+            with tracer.span("coach.update_history"):
+                self.update_history(query, "".join(parts))
+
     def stream_answer(
         self,
         query: str,
-        model: LLModels,
-        stream_box,
+        sink: StreamSink,
+        model: Optional[LLModels] = None,
         temperature: int | float = 1,
         **kwargs
     ) -> str:
-        prompt = self.create_system_prompt(query)
-        client = self.llm_factory.get(model)
-        response = client.stream(
-            prompt,
-            model=model,
-            stream_box=stream_box,
-            temperature=temperature,
-            **kwargs
-        )
-        self.update_history(query, response)
-        return response
\ No newline at end of file
+        return consume(self.iter_answer(query, model, temperature=temperature, **kwargs), sink)
+
+    # ----- Async entry points ----- #
+    # Context retrieval (ORM, Weaviate, grounding) and history summarisation stay synchronous and
+    # run in worker threads; the answer itself is generated with the providers' async SDKs, so
+    # many sessions can stream concurrently on one event loop.
+
+    async def acreate_system_prompt(self, query: str, deadline: Optional[Deadline] = None) -> str:
+        return (await self.aprepare_turn(query, deadline))[0]
+
+    async def aprepare_turn(self, query: str, deadline: Optional[Deadline] = None) -> tuple[str, ModelRoute]:
+        return await sync_to_async(self.prepare_turn, thread_sensitive=False, executor=_context_executor())(query, deadline)
+
+    async def asend_question(
+        self,
+        query: str,
+        model: Optional[LLModels] = None,
+        temperature: int | float = 1,
+        deadline: Optional[Deadline] = None,
+        **kwargs,
+    ) -> str:
+        with tracer.span("coach.turn", streamed=False):
+            prompt, route = await self.aprepare_turn(query, deadline)
+            model, kwargs = self._answer_model(route, model, kwargs)
+            client = self.llm_factory.get(model)
+            with tracer.span("coach.generate", model=str(model)):
+                result = await client.agenerate(
+                    prompt,
+                    model=model,
+                    temperature=temperature,
+                    **kwargs
+                )
+            with tracer.span("coach.update_history"):
+                await sync_to_async(self.update_history, thread_sensitive=False, executor=_context_executor())(query, result)
+            return result
+
+    async def aiter_answer(
+        self,
+        query: str,
+        model: Optional[LLModels] = None,
+        temperature: int | float = 1,
+        deadline: Optional[Deadline] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        with tracer.span("coach.turn", streamed=True):
+            prompt, route = await self.aprepare_turn(query, deadline)
+            model, kwargs = self._answer_model(route, model, kwargs)
+            parts = []
+            with tracer.span("coach.generate", model=str(model)) as span:
+                if model in self.hedged_streamers:
+                    deltas = self.hedged_streamers[model].astream(prompt, temperature=temperature, **kwargs)
+                else:
+                    deltas = self.llm_factory.get(model).astream(prompt, model=model, temperature=temperature, **kwargs)
+                async for delta in deltas:
+                    if not parts:
+                        span.set(first_token_s=round(span.duration, 3))
+                    parts.append(delta)
+                    yield delta
+            with tracer.span("coach.update_history"):
+                await sync_to_async(self.update_history, thread_sensitive=False, executor=_context_executor())(query, "".join(parts))
+
+    async def astream_answer(
+        self,
+        query: str,
+        sink: StreamSink,
+        model: Optional[LLModels] = None,
+        temperature: int | float = 1,
+        **kwargs
+    ) -> str:
+        return await aconsume(self.aiter_answer(query, model, temperature=temperature, **kwargs), sink)
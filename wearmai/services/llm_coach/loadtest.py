@@ -0,0 +1,402 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, Iterator, Optional
+from asgiref.sync import sync_to_async
+from django.db import connection
+from infrastructure.llm_clients.base import BaseLLMClient
+from infrastructure.tracing import Span, SpanExporter, SpanStats, summarize_durations, tracer
+from infrastructure.vectorstore.base import VecStore, VectorEntry
+from services.grounding.base import BaseGroundingRetriever
+from services.grounding.composite_retriever import GroundingSource
+from services.llm_coach.coach_service import CoachService
+from services.prompts.structured_outputs import ConversationSummaryOutput
+from core.models import Run
+from user_profile.loader import load_profile
+from django.conf import settings
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+class FakeBackendError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """
+    Seconds drawn per call. Parsed from "constant:S", "uniform:LOW,HIGH", "exponential:MEAN"
+    or "lognormal:MEDIAN,SIGMA" (long-tailed, like provider latencies).
+    """
+    kind: str
+    params: tuple[float, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, params = spec.partition(":")
+        values = tuple(float(v) for v in params.split(",") if v.strip())
+        expected = {"constant": 1, "uniform": 2, "exponential": 1, "lognormal": 2}
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f"Invalid latency distribution {spec!r}; expected e.g. constant:0.2, uniform:0.1,0.5, exponential:0.3 or lognormal:0.8,0.5")
+        return cls(kind, values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.params[0])
+        median, sigma = self.params
+        return median * rng.lognormvariate(0, sigma)
+
+
+@dataclass(frozen=True)
+class FakeBackendConfig:
+    router_latency: LatencyDistribution = LatencyDistribution("lognormal", (1.2, 0.4))
+    summary_latency: LatencyDistribution = LatencyDistribution("lognormal", (2.0, 0.4))
+    first_token_latency: LatencyDistribution = LatencyDistribution("lognormal", (0.8, 0.5))
+    token_interval: LatencyDistribution = LatencyDistribution("constant", (0.02,))
+    answer_tokens: int = 200
+    vector_latency: LatencyDistribution = LatencyDistribution("lognormal", (0.15, 0.3))
+    grounding_latency: LatencyDistribution = LatencyDistribution("lognormal", (1.5, 0.5))
+    error_rate: float = 0.0  # chance that a backend call (a whole answer stream counts as one) fails
+
+
+@dataclass(frozen=True)
+class ScriptedTurn:
+    query: str
+    stages: tuple[str, ...]  # what the (fake) router asks for on this turn
+
+
+# A conversation touching every context stage, ending with a turn that needs none
+DEFAULT_SCRIPT = (
+    ScriptedTurn("How did my last runs look?", ("raw_run_data", "run_summary_data")),
+    ScriptedTurn("Is the difference between my left and right knee flexion something to worry about?", ("raw_run_data", "knowledge_base", "fact_checking_data")),
+    ScriptedTurn("I am planning to join the Amsterdam marathon in 4 months. Could you generate my personal training plan?", ("run_summary_data", "knowledge_base", "fact_checking_data")),
+    ScriptedTurn("Thanks, that's helpful!", ()),
+)
+
+
+class _FakeBackend:
+    def __init__(self, config: FakeBackendConfig, rng: random.Random) -> None:
+        self.config = config
+        self.rng = rng
+        self._lock = threading.Lock()
+
+    def _draw(self, distribution: LatencyDistribution, can_fail: bool) -> tuple[float, bool]:
+        # One RNG per session, shared by the session's stage threads
+        with self._lock:
+            return distribution.sample(self.rng), can_fail and self.rng.random() < self.config.error_rate
+
+    def delay(self, distribution: LatencyDistribution, can_fail: bool = True) -> float:
+        seconds, failed = self._draw(distribution, can_fail)
+        if failed:
+            time.sleep(seconds / 2)
+            raise FakeBackendError("Injected backend failure")
+        return seconds
+
+    async def asleep(self, distribution: LatencyDistribution, can_fail: bool = True) -> None:
+        """Async counterpart of `time.sleep(delay(...))`."""
+        seconds, failed = self._draw(distribution, can_fail)
+        await asyncio.sleep(seconds / 2 if failed else seconds)
+        if failed:
+            raise FakeBackendError("Injected backend failure")
+
+
+class FakeLLMClient(BaseLLMClient):
+    """
+    Answers the router from the session's script, structured summary calls with a summary, and
+    everything else with filler text streamed token by token, after the configured latencies.
+    """
+
+    def __init__(self, backend: _FakeBackend, script: tuple[ScriptedTurn, ...], run_ids: list[int]) -> None:
+        self.backend = backend
+        self.script = script
+        self.run_ids = run_ids
+
+    def _router_output(self, prompt: str) -> str:
+        turn = next((turn for turn in self.script if turn.query in prompt), None)
+        stages = turn.stages if turn else ()
+        return json.dumps({
+            "GenerateRunSummary_needed": "run_summary_data" in stages,
+            "GetRawRunData_needed": "raw_run_data" in stages,
+            "QueryKnowledgeBase_needed": "knowledge_base" in stages,
+            "GetGroundingAndFactCheckingData_needed": "fact_checking_data" in stages,
+            "query": turn.query if turn else "",
+            "fact_checking_query": turn.query if turn else "",
+            "run_ids": self.run_ids[-2:],
+        })
+
+    def _generated(self, prompt: str, kwargs: dict) -> tuple[LatencyDistribution, object]:
+        if "text" in kwargs:
+            # The router asks for the function-determinant JSON format
+            return self.backend.config.router_latency, self._router_output(prompt)
+        if "response_schema" in kwargs:
+            return self.backend.config.summary_latency, SimpleNamespace(parsed=ConversationSummaryOutput(conversation_summary="The runner asked about their runs."))
+        return self.backend.config.summary_latency, "The runs were steady, with a slight asymmetry in knee flexion."
+
+    def generate(self, prompt: str, **kwargs):
+        latency, response = self._generated(prompt, kwargs)
+        time.sleep(self.backend.delay(latency))
+        return response
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        time.sleep(self.backend.delay(self.backend.config.first_token_latency))
+        for i in range(self.backend.config.answer_tokens):
+            if i:
+                # Failures are injected per call (above), not per token
+                time.sleep(self.backend.delay(self.backend.config.token_interval, can_fail=False))
+            yield "word "
+
+    async def agenerate(self, prompt: str, **kwargs):
+        latency, response = self._generated(prompt, kwargs)
+        await self.backend.asleep(latency)
+        return response
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        await self.backend.asleep(self.backend.config.first_token_latency)
+        for i in range(self.backend.config.answer_tokens):
+            if i:
+                await self.backend.asleep(self.backend.config.token_interval, can_fail=False)
+            yield "word "
+
+
+class FakeLLMFactory:
+    def __init__(self, client: FakeLLMClient) -> None:
+        self.client = client
+
+    def get(self, model) -> BaseLLMClient:
+        return self.client
+
+
+class FakeVectorStore(VecStore):
+    def __init__(self, backend: _FakeBackend, vs_name: str = "LoadTest") -> None:
+        self.backend = backend
+        self.vs_name = vs_name
+
+    def similarity_search(self, query: str, n_results: int = 5) -> list[VectorEntry]:
+        time.sleep(self.backend.delay(self.backend.config.vector_latency))
+        return [VectorEntry(id=str(i), content=f"Knowledge base excerpt {i} on {query[:40]}. " * 20) for i in range(n_results)]
+
+    def hybrid_similarity_search(self, query: str, n_results: int = 5) -> list[VectorEntry]:
+        return self.similarity_search(query, n_results)
+
+    def create_vectorstore(self):
+        pass
+
+    def get_vectorstore(self, create=True):
+        pass
+
+    def add_items(self, items: list) -> None:
+        pass
+
+    def delete_items(self, ids: list) -> None:
+        pass
+
+    def delete_collection(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FakeGroundingRetriever(BaseGroundingRetriever):
+    def __init__(self, backend: _FakeBackend) -> None:
+        self.backend = backend
+
+    def retrieve_grounding_data(self, search_query: str, status_callback: Optional[Callable[[str], None]] = None, **kwargs) -> dict:
+        time.sleep(self.backend.delay(self.backend.config.grounding_latency))
+        return {
+            "answer": f"Studies on {search_query[:40]} are mixed.",
+            "results": [
+                {"type": "text", "name": f"Study {i}", "url": f"https://example.org/study/{i}", "content": f"Findings of study {i} on {search_query[:40]}. " * 30}
+                for i in range(5)
+            ],
+        }
+
+
+def build_fake_coach(user_profile: dict, run_ids: list[int], config: FakeBackendConfig, script: tuple[ScriptedTurn, ...], seed: int) -> CoachService:
+    """A CoachService on the real DB, prompts and context pipeline, with fake LLM, vector store and grounding backends."""
+    backend = _FakeBackend(config, random.Random(seed))
+    coach = CoachService(
+        "LoadTest",
+        user_profile,
+        vectorstore=FakeVectorStore(backend),
+        llm_factory=FakeLLMFactory(FakeLLMClient(backend, script, run_ids)),
+    )
+    coach.grounding_retriever.sources = [
+        GroundingSource(name="fake", retriever=FakeGroundingRetriever(backend), deadline=settings.GROUNDING_LINKUP_DEADLINE)
+    ]
+    coach.hedged_streamers = {}
+    return coach
+
+
+class _SpanCollector(SpanExporter):
+    def __init__(self) -> None:
+        self.stats = SpanStats(window=1_000_000)
+
+    def export(self, spans: list[Span]) -> None:
+        for span in spans:
+            self.stats.record(span)
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    sessions: int = 0
+    turns: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    wall_time: float = 0.0
+    turn_latencies: list[float] = field(default_factory=list)
+    first_token_latencies: list[float] = field(default_factory=list)
+    stages: dict[str, dict] = field(default_factory=dict)
+    peak_memory_per_session: Optional[int] = None  # bytes
+
+    @property
+    def failed_turns(self) -> int:
+        return sum(self.errors.values())
+
+    def summary(self) -> dict:
+        ok = self.turns - self.failed_turns
+        return {
+            "concurrency": self.concurrency,
+            "sessions": self.sessions,
+            "turns": self.turns,
+            "error_rate": self.failed_turns / self.turns if self.turns else 0.0,
+            "errors": self.errors,
+            "throughput_turns_per_s": ok / self.wall_time if self.wall_time else 0.0,
+            "turn_latency": summarize_durations(self.turn_latencies) if self.turn_latencies else None,
+            "first_token_latency": summarize_durations(self.first_token_latencies) if self.first_token_latencies else None,
+            "stages": self.stages,
+            "peak_memory_per_session_kb": self.peak_memory_per_session // 1024 if self.peak_memory_per_session is not None else None,
+        }
+
+
+class CoachLoadTest:
+    """
+    Runs `concurrency` simulated users at a time, each holding a scripted conversation (repeated
+    `conversations` times) with its own coach, and collects turn latency, time to first token,
+    per-stage span percentiles, errors and (with `measure_memory`) peak traced memory per session.
+    Sessions run in threads on the sync coach path, or with `async_path` as tasks on one event
+    loop through `CoachService.aiter_answer`.
+    """
+
+    def __init__(
+        self,
+        profile_names: list[str],
+        config: FakeBackendConfig,
+        script: tuple[ScriptedTurn, ...] = DEFAULT_SCRIPT,
+        conversations: int = 1,
+        measure_memory: bool = True,
+        seed: int = 0,
+        async_path: bool = False,
+    ) -> None:
+        self.profile_names = profile_names
+        self.config = config
+        self.script = script
+        self.conversations = conversations
+        self.measure_memory = measure_memory
+        self.seed = seed
+        self.async_path = async_path
+
+    def _open_coach(self, index: int) -> CoachService:
+        name = self.profile_names[index % len(self.profile_names)]
+        profile = load_profile(name=name)
+        run_ids = list(Run.objects.filter(user__name=name).order_by("date").values_list("id", flat=True))
+        return build_fake_coach(profile["llm_user_profile"], run_ids, self.config, self.script, seed=self.seed + index)
+
+    @staticmethod
+    def _record_turn(result: LevelResult, lock: threading.Lock, start: float, first_token: Optional[float], error: Optional[str]) -> None:
+        elapsed = time.perf_counter() - start
+        with lock:
+            result.turns += 1
+            if error:
+                result.errors[error] = result.errors.get(error, 0) + 1
+            else:
+                result.turn_latencies.append(elapsed)
+                result.first_token_latencies.append(first_token if first_token is not None else elapsed)
+
+    def _session(self, index: int, result: LevelResult, lock: threading.Lock) -> None:
+        try:
+            coach = self._open_coach(index)
+            try:
+                for _ in range(self.conversations):
+                    for turn in self.script:
+                        start = time.perf_counter()
+                        first_token = error = None
+                        try:
+                            for _delta in coach.iter_answer(turn.query, temperature=0.7):
+                                if first_token is None:
+                                    first_token = time.perf_counter() - start
+                        except Exception as e:
+                            error = type(e).__name__
+                        self._record_turn(result, lock, start, first_token, error)
+            finally:
+                coach.close()
+        finally:
+            connection.close()
+
+    async def _asession(self, index: int, result: LevelResult, lock: threading.Lock) -> None:
+        coach = await sync_to_async(self._open_coach, thread_sensitive=False)(index)
+        try:
+            for _ in range(self.conversations):
+                for turn in self.script:
+                    start = time.perf_counter()
+                    first_token = error = None
+                    try:
+                        async for _delta in coach.aiter_answer(turn.query, temperature=0.7):
+                            if first_token is None:
+                                first_token = time.perf_counter() - start
+                    except Exception as e:
+                        error = type(e).__name__
+                    self._record_turn(result, lock, start, first_token, error)
+        finally:
+            coach.close()
+
+    async def _asessions(self, concurrency: int, result: LevelResult, lock: threading.Lock) -> None:
+        await asyncio.gather(*(self._asession(i, result, lock) for i in range(concurrency)))
+
+    def run_level(self, concurrency: int) -> LevelResult:
+        result = LevelResult(concurrency=concurrency, sessions=concurrency)
+        lock = threading.Lock()
+        collector = _SpanCollector()
+        tracer.exporters.append(collector)
+        if self.measure_memory:
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            start = time.perf_counter()
+            if self.async_path:
+                asyncio.run(self._asessions(concurrency, result, lock))
+            else:
+                with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest-session") as executor:
+                    for future in [executor.submit(self._session, i, result, lock) for i in range(concurrency)]:
+                        future.result()
+            result.wall_time = time.perf_counter() - start
+        finally:
+            tracer.exporters.remove(collector)
+            if self.measure_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                result.peak_memory_per_session = max(peak - baseline, 0) // concurrency
+
+        result.stages = collector.stats.percentiles()
+        log.info("coach_loadtest_level", **{k: v for k, v in result.summary().items() if k != "stages"})
+        return result
+
+    def ramp(self, levels: list[int], on_level: Optional[Callable[[LevelResult], None]] = None) -> list[LevelResult]:
+        results = []
+        for concurrency in levels:
+            result = self.run_level(concurrency)
+            results.append(result)
+            if on_level:
+                on_level(result)
+        return results
@@ -0,0 +1,137 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Optional
+from common.utils.tokens import estimate_tokens
+from infrastructure.llm_clients.base import LLModels
+from infrastructure.llm_clients.factory import LLMClientFactory
+import structlog
+
+log = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class TurnSignals:
+    """What we know about a turn once its context has been retrieved."""
+    query: str
+    context_tokens: int
+    functions: frozenset[str]
+    history_turns: int
+
+    @classmethod
+    def from_turn(cls, query: str, prompt: str, functions, history_turns: int) -> "TurnSignals":
+        return cls(query=query, context_tokens=estimate_tokens(prompt), functions=frozenset(functions), history_turns=history_turns)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    name: str
+    model: LLModels
+    thinking_budget: Optional[int] = None
+    max_output_tokens: Optional[int] = None
+
+    def generation_kwargs(self) -> dict:
+        """The route's parameters, named the way the model's client expects them."""
+        provider = LLMClientFactory.provider_for(self.model)
+        kwargs = {}
+        if self.max_output_tokens is not None:
+            kwargs["max_tokens" if provider == "anthropic" else "max_output_tokens"] = self.max_output_tokens
+        if self.thinking_budget is not None and provider == "gemini":
+            kwargs["thinking_budget"] = self.thinking_budget
+        return kwargs
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """
+    Matches a turn when every condition it sets holds: the query contains any of `keywords` (as whole words),
+    any of `functions` was needed, and the context/history are at least the given sizes.
+    A rule without conditions matches every turn.
+    """
+    route: ModelRoute
+    keywords: tuple[str, ...] = ()
+    functions: frozenset[str] = frozenset()
+    min_context_tokens: int = 0
+    min_history_turns: int = 0
+
+    def matches(self, signals: TurnSignals) -> bool:
+        query = signals.query.lower()
+        return (
+            (not self.keywords or any(re.search(rf"\b{re.escape(keyword)}\b", query) for keyword in self.keywords))
+            and (not self.functions or bool(self.functions & signals.functions))
+            and signals.context_tokens >= self.min_context_tokens
+            and signals.history_turns >= self.min_history_turns
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoutingRule":
+        return cls(
+            route=ModelRoute(
+                name=data["name"],
+                model=LLModels(data["model"]),
+                thinking_budget=data.get("thinking_budget"),
+                max_output_tokens=data.get("max_output_tokens"),
+            ),
+            keywords=tuple(keyword.lower() for keyword in data.get("keywords", ())),
+            functions=frozenset(data.get("functions", ())),
+            min_context_tokens=data.get("min_context_tokens", 0),
+            min_history_turns=data.get("min_history_turns", 0),
+        )
+
+
+@dataclass(frozen=True)
+class RoutingPolicy:
+    """
+    Which models the coach uses. The answer model comes from the first matching rule in
+    `answer_rules`, so put the most specific rules first and a catch-all last.
+    `router_model` must be an OpenAI reasoning model (it's called with structured-output and
+    reasoning options), and the summary models must be Gemini models (JSON schema output).
+    """
+    answer_rules: tuple[RoutingRule, ...]
+    router_model: LLModels = LLModels.O4_MINI
+    run_summary_model: LLModels = LLModels.GEMINI_20_FLASH
+    history_summary_model: LLModels = LLModels.GEMINI_20_FLASH
+
+    def route(self, signals: TurnSignals) -> ModelRoute:
+        for rule in self.answer_rules:
+            if rule.matches(signals):
+                log.info(
+                    "answer_route_selected",
+                    route=rule.route.name,
+                    model=str(rule.route.model),
+                    context_tokens=signals.context_tokens,
+                    functions=sorted(signals.functions),
+                    history_turns=signals.history_turns,
+                )
+                return rule.route
+        raise ValueError("No routing rule matched; the policy needs a catch-all rule")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoutingPolicy":
+        models = {key: LLModels(data[key]) for key in ("router_model", "run_summary_model", "history_summary_model") if key in data}
+        return cls(answer_rules=tuple(RoutingRule.from_dict(rule) for rule in data["answer_rules"]), **models)
+
+
+DEFAULT_ROUTING_POLICY = RoutingPolicy.from_dict({
+    "answer_rules": [
+        # Multi-week plans are long, structured outputs that benefit from thinking
+        {"name": "training_plan", "model": LLModels.GEMINI_25_FLASH, "thinking_budget": 2048, "max_output_tokens": 8192,
+         "keywords": ["plan", "plans", "schedule", "program", "programme", "periodisation", "periodization", "build up", "build-up"]},
+        {"name": "long_context", "model": LLModels.GEMINI_25_FLASH, "thinking_budget": 1024, "max_output_tokens": 4096,
+         "min_context_tokens": 8000},
+        {"name": "run_analysis", "model": LLModels.GEMINI_25_FLASH, "thinking_budget": 0, "max_output_tokens": 4096,
+         "functions": ["GetRawRunData", "GenerateRunSummary"]},
+        {"name": "grounded_advice", "model": LLModels.GEMINI_25_FLASH, "thinking_budget": 0, "max_output_tokens": 2048,
+         "functions": ["GetGroundingAndFactCheckingData"]},
+        # Conversational turns: fastest model
+        {"name": "conversational", "model": LLModels.GEMINI_20_FLASH, "max_output_tokens": 1024},
+    ],
+})
+
+
+def load_routing_policy(path: Optional[str]) -> RoutingPolicy:
+    """The policy table in the JSON file at `path` (same shape as the default), else the default."""
+    if not path:
+        return DEFAULT_ROUTING_POLICY
+    with open(path, encoding="utf-8") as f:
+        return RoutingPolicy.from_dict(json.load(f))
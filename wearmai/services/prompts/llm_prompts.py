@@ -9,6 +9,20 @@ class PromptType(StrEnum):
     FUNCTION_DETERMINANT_PROMPT = "function_determinant_prompt"
     FACT_CHECKING_SEARCH_QUERY_PROMPT = "fact_checking_search_query_prompt"
 
+# Sources that grounding/fact-checking searches are restricted to
+FACT_CHECKING_DOMAINS = [
+    "pubmed.ncbi.nlm.nih.gov",
+    "link.springer.com",
+    "www.researchgate.net",
+    "www.semanticscholar.org",
+    "www.doaj.org",
+    "journals.humankinetics.com",
+    "bjsm.bmj.com",
+    "www.academia.edu",
+    "arxiv.org",
+    "www.jstage.jst.go.jp",
+]
+
 
 class LLMPrompts:
 
@@ -76,16 +90,7 @@ class LLMPrompts:
         {search_query}
         <guidance>
         <restriction>Use only the sources listed here. Do not rely on any external references.
-        - pubmed.ncbi.nlm.nih.gov
-        - link.springer.com
-        - www.researchgate.net
-        - www.semanticscholar.org
-        - www.doaj.org
-        - journals.humankinetics.com
-        - bjsm.bmj.com
-        - www.academia.edu
-        - arxiv.org
-        - www.jstage.jst.go.jp
+""" + "\n".join(f"        - {domain}" for domain in FACT_CHECKING_DOMAINS) + """
         </restriction>
         </guidance>
         """
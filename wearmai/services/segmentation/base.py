@@ -1,6 +1,8 @@
 from enum import StrEnum
 from abc import ABC, abstractmethod
-from typing import List, Any
+from types import MappingProxyType
+from typing import List, Any, Dict, Mapping, Tuple
+import threading
 
 class SegmentationOpts(StrEnum):
     SDPM = "SDPMChunker"
@@ -9,6 +11,33 @@ class SegmentationOpts(StrEnum):
 
 
 class BaseSegmenter(ABC):
-    @abstractmethod
+    """
+    Segmenters hold their defaults as an immutable config. Options passed to `chunk` apply to that
+    call only: every distinct config gets its own cached chunker, so concurrent calls with different
+    options never share (or mutate) chunker state.
+    """
+
+    def __init__(self, **defaults: Any) -> None:
+        self.defaults: Mapping[str, Any] = MappingProxyType(defaults)
+        self._chunkers: Dict[Tuple[Tuple[str, Any], ...], Any] = {}
+        self._lock = threading.Lock()
+
     def chunk(self, text: str, **kwargs: Any) -> List[str]:
-        """Return list of text chunks"""
\ No newline at end of file
+        """Return list of text chunks"""
+        return self.get_chunker(**kwargs).chunk(text)
+
+    def get_chunker(self, **overrides: Any) -> Any:
+        unknown = overrides.keys() - self.defaults.keys()
+        if unknown:
+            raise ValueError(f"Unknown segmentation options for {type(self).__name__}: {', '.join(sorted(unknown))}")
+
+        config = MappingProxyType({**self.defaults, **overrides})
+        key = tuple(sorted(config.items()))
+        with self._lock:
+            if key not in self._chunkers:
+                self._chunkers[key] = self._build_chunker(config)
+            return self._chunkers[key]
+
+    @abstractmethod
+    def _build_chunker(self, config: Mapping[str, Any]) -> Any:
+        """Build the underlying chunker for one config"""
@@ -0,0 +1,21 @@
+import threading
+from typing import Dict
+from chonkie import AutoEmbeddings
+from chonkie.embeddings import BaseEmbeddings
+import structlog
+
+log = structlog.get_logger(__name__)
+
+_models: Dict[str, BaseEmbeddings] = {}
+_lock = threading.Lock()
+
+
+def get_embedding_model(name: str) -> BaseEmbeddings:
+    """
+    Load an embedding model once per process and share it between every chunker that uses it.
+    """
+    with _lock:
+        if name not in _models:
+            log.info("loading_embedding_model", model=name)
+            _models[name] = AutoEmbeddings.get_embeddings(name)
+        return _models[name]
@@ -1,15 +1,24 @@
 from .base import BaseSegmenter, SegmentationOpts
-from typing import Dict
+from typing import Callable, Dict
+import threading
 
 class SegmenterFactory:
-    _registry: Dict[SegmentationOpts, BaseSegmenter] = {}
+    _registry: Dict[SegmentationOpts, Callable[[], BaseSegmenter]] = {}
+    _instances: Dict[SegmentationOpts, BaseSegmenter] = {}
+    _lock = threading.Lock()
 
     @classmethod
-    def register(cls, opt: SegmentationOpts, segmenter: BaseSegmenter) -> None:
-        cls._registry[opt] = segmenter
+    def register(cls, opt: SegmentationOpts, factory: Callable[[], BaseSegmenter]) -> None:
+        """Register a constructor; the segmenter is only built the first time it is requested."""
+        with cls._lock:
+            cls._registry[opt] = factory
+            cls._instances.pop(opt, None)
 
     @classmethod
     def get(cls, opt: SegmentationOpts) -> BaseSegmenter:
         if opt not in cls._registry:
             raise ValueError(f"No segmenter registered for {opt}")
-        return cls._registry[opt]
\ No newline at end of file
+        with cls._lock:
+            if opt not in cls._instances:
+                cls._instances[opt] = cls._registry[opt]()
+            return cls._instances[opt]
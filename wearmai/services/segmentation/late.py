@@ -1,6 +1,7 @@
-from typing import Any, List
+from typing import Any, Mapping
 from chonkie import LateChunker
 from .base import BaseSegmenter
+from .embeddings import get_embedding_model
 
 class LateSegmenter(BaseSegmenter):
     def __init__(
@@ -9,14 +10,11 @@ class LateSegmenter(BaseSegmenter):
         chunk_size: int = 1024,
         min_characters_per_chunk: int = 24,
     ):
-        self.chunker = LateChunker(
+        super().__init__(
             embedding_model=embedding_model,
             chunk_size=chunk_size,
             min_characters_per_chunk=min_characters_per_chunk,
         )
 
-    def chunk(self, text: str, **kwargs: Any) -> List[str]:
-        if kwargs:
-            for key, val in kwargs.items():
-                setattr(self.chunker, key, val)
-        return self.chunker.chunk(text)
\ No newline at end of file
+    def _build_chunker(self, config: Mapping[str, Any]) -> LateChunker:
+        return LateChunker(**{**config, "embedding_model": get_embedding_model(config["embedding_model"])})
@@ -16,6 +16,7 @@ class SegmentationService:
         return segmenter.chunk(text, **kwargs)
     
 
-SegmenterFactory.register(SegmentationOpts.SDPM, SDPMSegmenter())
-SegmenterFactory.register(SegmentationOpts.SEMANTIC, SemanticSegmenter())
-SegmenterFactory.register(SegmentationOpts.LATE, LateSegmenter())
\ No newline at end of file
+# Segmenters (and their embedding models) are only constructed on first use
+SegmenterFactory.register(SegmentationOpts.SDPM, SDPMSegmenter)
+SegmenterFactory.register(SegmentationOpts.SEMANTIC, SemanticSegmenter)
+SegmenterFactory.register(SegmentationOpts.LATE, LateSegmenter)
\ No newline at end of file
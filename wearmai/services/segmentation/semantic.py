@@ -1,6 +1,7 @@
-from typing import Any, List
+from typing import Any, Mapping
 from chonkie import SemanticChunker
 from .base import BaseSegmenter
+from .embeddings import get_embedding_model
 
 class SemanticSegmenter(BaseSegmenter):
     def __init__(
@@ -10,15 +11,12 @@ class SemanticSegmenter(BaseSegmenter):
         chunk_size: int = 1024,
         min_sentences: int = 1,
     ):
-        self.chunker = SemanticChunker(
+        super().__init__(
             embedding_model=embedding_model,
             threshold=threshold,
             chunk_size=chunk_size,
             min_sentences=min_sentences,
         )
 
-    def chunk(self, text: str, **kwargs: Any) -> List[str]:
-        if kwargs:
-            for key, val in kwargs.items():
-                setattr(self.chunker, key, val)
-        return self.chunker.chunk(text)
\ No newline at end of file
+    def _build_chunker(self, config: Mapping[str, Any]) -> SemanticChunker:
+        return SemanticChunker(**{**config, "embedding_model": get_embedding_model(config["embedding_model"])})
@@ -1,6 +1,7 @@
-from typing import Any, List
+from typing import Any, Mapping
 from chonkie import SDPMChunker
 from .base import BaseSegmenter
+from .embeddings import get_embedding_model
 
 class SDPMSegmenter(BaseSegmenter):
     def __init__(
@@ -11,7 +12,7 @@ class SDPMSegmenter(BaseSegmenter):
         min_sentences: int = 1,
         skip_window: int = 1,
     ):
-        self.chunker = SDPMChunker(
+        super().__init__(
             embedding_model=embedding_model,
             threshold=threshold,
             chunk_size=chunk_size,
@@ -19,9 +20,5 @@ class SDPMSegmenter(BaseSegmenter):
             skip_window=skip_window,
         )
 
-    def chunk(self, text: str, **kwargs: Any) -> List[str]:
-        # kwargs can override defaults
-        if kwargs:
-            for key, val in kwargs.items():
-                setattr(self.chunker, key, val)
-        return self.chunker.chunk(text)
\ No newline at end of file
+    def _build_chunker(self, config: Mapping[str, Any]) -> SDPMChunker:
+        return SDPMChunker(**{**config, "embedding_model": get_embedding_model(config["embedding_model"])})
@@ -1,10 +1,12 @@
 from core.models import UserProfile
 from core.serializers import UserProfileForLLM
+from common.utils.db_queries import track_queries
 import structlog
 
 log = structlog.get_logger(__name__)
 
 
+@track_queries("load_profile")
 def load_profile(name: str = "Test User 2 - Full Data Load") -> UserProfileForLLM:
     user_profile = UserProfile.objects.get(name=name)
     log.info("loaded_user_profile", user_name=user_profile.name)
@@ -135,4 +135,31 @@ WEAVIATE_API_KEY = os.getenv('WEAVIATE_API_KEY')
 VOYAGEAI_API_KEY = os.getenv("VOYAGEAI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 LINKUP_API_KEY = os.getenv("LINKUP_API_KEY")
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
\ No newline at end of file
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+# Knowledge base corpus indexed by `index_knowledge_base` (a directory or a glob pattern)
+KNOWLEDGE_BASE_CORPUS = str(BASE_DIR / 'development' / 'books' / '*_clean.md')
+# Disk cache for grounding (Linkup) search results; TTL / max staleness in seconds
+GROUNDING_CACHE_PATH = os.getenv("GROUNDING_CACHE_PATH", str(BASE_DIR / '.grounding_cache.sqlite3'))
+GROUNDING_CACHE_TTL = float(os.getenv("GROUNDING_CACHE_TTL", 24 * 3600))
+GROUNDING_CACHE_MAX_STALE = float(os.getenv("GROUNDING_CACHE_MAX_STALE", 7 * 24 * 3600))
+GROUNDING_CACHE_MAX_ENTRIES = int(os.getenv("GROUNDING_CACHE_MAX_ENTRIES", 1000))
+# Grounding fan-out: overall budget and per-source deadlines, in seconds
+GROUNDING_BUDGET = float(os.getenv("GROUNDING_BUDGET", 8))
+GROUNDING_LINKUP_DEADLINE = float(os.getenv("GROUNDING_LINKUP_DEADLINE", 8))
+GROUNDING_KNOWLEDGE_BASE_DEADLINE = float(os.getenv("GROUNDING_KNOWLEDGE_BASE_DEADLINE", 3))
+GROUNDING_ABSTRACTS_DEADLINE = float(os.getenv("GROUNDING_ABSTRACTS_DEADLINE", 1))
+# Grounding sources used by the coach (any of: linkup, knowledge_base, abstracts); use "abstracts" alone to run offline
+GROUNDING_SOURCES = [s.strip() for s in os.getenv("GROUNDING_SOURCES", "linkup,knowledge_base,abstracts").split(",") if s.strip()]
+# Compressed abstracts index built by `build_abstract_index`; the abstracts source is skipped if it doesn't exist
+GROUNDING_ABSTRACTS_INDEX = os.getenv("GROUNDING_ABSTRACTS_INDEX", str(BASE_DIR / 'development' / 'abstracts' / 'abstracts_index.npz'))
+# Approximate token budget for grounding results injected in the coach prompt
+GROUNDING_TOKEN_BUDGET = int(os.getenv("GROUNDING_TOKEN_BUDGET", 2000))
+# Threads used by async coach sessions for (blocking) context retrieval and history summarisation
+COACH_CONTEXT_THREADS = int(os.getenv("COACH_CONTEXT_THREADS", 32))
+# Threads shared by all coach sessions for running a turn's context stages (router, run data, knowledge base, grounding)
+COACH_STAGE_THREADS = int(os.getenv("COACH_STAGE_THREADS", 32))
+# JSON policy table choosing the coach's answer/router/summary models (see services/llm_coach/routing.py); built-in default if unset
+COACH_ROUTING_POLICY = os.getenv("COACH_ROUTING_POLICY")
+# Coach turn deadline in seconds; context retrieval must finish COACH_ANSWER_RESERVE seconds before it, leaving time to answer
+COACH_TURN_BUDGET = float(os.getenv("COACH_TURN_BUDGET", 30))
+COACH_ANSWER_RESERVE = float(os.getenv("COACH_ANSWER_RESERVE", 15))